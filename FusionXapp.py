@@ -1,6 +1,40 @@
 # FusionXapp.py
+import datetime
+import os
+import uuid
+
 import streamlit as st
 
+from fusionx import events as ev
+from fusionx.abuse import VoteAbuseDetector
+from fusionx.archive import CompetitionArchive
+from fusionx.blobs import BlobStore
+from fusionx.bundles import BundleExporter
+from fusionx.campus import GLOBAL_CAMPUS, CampusRouter, campus_dir, integration_buses, switch_campus
+from fusionx.cache import SHARED, ByteBudgetCache, content_key
+from fusionx.cdc import CDCExporter
+from fusionx.judging import DEFAULT_CAPACITY, REVIEWS_PER_SUBMISSION, JudgePool
+from fusionx.lifecycle import CompetitionScheduler, award_winner_badge, competition_phase
+from fusionx.membership import Membership
+from fusionx.notifications import NOTIFY_EVENTS, Notifier
+from fusionx.profiles import (badge_label, grant_badges, has_badge, portfolio_pdf, profile_lines, top_portfolios, track_votes,
+                              vote_counts)
+from fusionx.pubsub import ChatBroker
+from fusionx.rollups import ROLLUP_EVENTS, WeeklyRollups, week_key
+from fusionx.scoring import RUBRIC, SCORE_MAX, SCORE_MIN, MentorScoring, submission_id
+from fusionx.similarity import DuplicateDetector
+from fusionx.site import SiteExporter
+from fusionx.trending import TRENDING_EVENTS, Trending
+from fusionx.uploads import UploadInspector
+from fusionx.warmup import Warmup, status_path
+from fusionx.webhooks import WEBHOOK_EVENTS, WEBHOOK_KINDS, WebhookDispatcher
+from fusionx.widgets import account_added, account_picker, accounts_changed, bundle_download, chat_room, comment_summary, portfolio_card, project_id, uploaded_file
+from fusionx.xp import XP_EVENTS, XPLedger
+
+DATA_DIR = os.environ.get("FUSIONX_DATA_DIR", "fusionx_data")  # runtime files (dead letters, exports, ...)
+# Served at app/static/... when server.enableStaticServing is on (.streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
 # -----------------------------
 # Page Setup
 # -----------------------------
@@ -8,17 +42,306 @@ st.set_page_config(page_title="FusionX", layout="wide")
 st.title("FusionX - Fusion Global Competition Platform")
 st.markdown("💡 *Community-driven competitions for every Fusion student!*")
 
+# -----------------------------
+# Shared State (across sessions and server processes)
+# -----------------------------
+# Set FUSIONX_STATE_URL=redis://host:6379/0 to share competitions, votes, chat
+# and notifications between several FusionXapp processes. Defaults to memory.
+# Each campus has its own partition, on the shard FUSIONX_CAMPUSES routes it to
+# (fusionx/campus.py); every service below is per campus.
+@st.cache_resource
+def get_campus_router():
+    return CampusRouter.from_env()
+
+@st.cache_resource
+def get_store(campus):
+    return get_campus_router().store(campus)
+
+# Domain events (submissions, activations, winners) for background services
+@st.cache_resource
+def get_event_bus(campus):
+    return ev.EventBus()
+
+# Outbound Slack / Discord / Teams webhooks, sent from a background asyncio loop.
+# Like the CDC export and the rollups, they also follow the global partition's bus,
+# so global competitions activating and their winners are announced on every campus
+@st.cache_resource
+def get_webhook_dispatcher(campus):
+    dead_letter_path = os.path.join(campus_dir(DATA_DIR, campus), "webhook_dead_letter.jsonl")
+    dispatcher = WebhookDispatcher(get_store(campus).webhooks, dead_letter_path=dead_letter_path)
+    dispatcher.start()
+    for bus in integration_buses(get_event_bus, campus):
+        bus.subscribe(dispatcher.submit, types=WEBHOOK_EVENTS)
+    return dispatcher
+
+# Structured rubric scores from mentors, ranked per competition
+@st.cache_resource
+def get_mentor_scoring(campus):
+    return MentorScoring(get_store(campus))
+
+# Hands every new submission to the least loaded judges who know its field (FUSIONX_REVIEWS_PER_SUBMISSION)
+@st.cache_resource
+def get_judge_pool(campus):
+    pool = JudgePool(get_store(campus), reviews=int(os.environ.get("FUSIONX_REVIEWS_PER_SUBMISSION", REVIEWS_PER_SUBMISSION)))
+    get_event_bus(campus).subscribe(pool.handle, types=[ev.SUBMISSION])
+    return pool
+
+# Opens / closes competitions at their deadlines and announces winners once
+@st.cache_resource
+def get_scheduler(campus):
+    bus = get_event_bus(campus)
+    bus.subscribe(lambda event: award_winner_badge(get_store(campus), event), types=[ev.WINNER])
+    scheduler = CompetitionScheduler(get_store(campus), get_mentor_scoring(campus), bus)
+    scheduler.start()
+    return scheduler
+
+# Per-week vote / submission / join / XP counters, updated as events arrive
+@st.cache_resource
+def get_rollups(campus):
+    rollups = WeeklyRollups(get_store(campus))
+    for bus in integration_buses(get_event_bus, campus):
+        bus.subscribe(rollups.handle, types=ROLLUP_EVENTS)
+    return rollups
+
+# "Your portfolio has N votes" and other notifications, sent once as the events happen
+@st.cache_resource
+def get_notifier(campus):
+    notifier = Notifier(get_store(campus))
+    get_event_bus(campus).subscribe(notifier.handle, types=NOTIFY_EVENTS)
+    return notifier
+
+# XP earned per student per day, recorded once per event
+@st.cache_resource
+def get_xp_ledger(campus):
+    ledger = XPLedger(get_store(campus))
+    get_event_bus(campus).subscribe(ledger.handle, types=XP_EVENTS)
+    return ledger
+
+# Uploaded files live on disk, referenced from submissions by content hash
+@st.cache_resource
+def get_blob_store():
+    return BlobStore(os.path.join(DATA_DIR, "blobs"))
+
+# Streams uploads into the blob store and checks them (type, ZIP listing, size limits) off the rerun thread
+@st.cache_resource
+def get_upload_inspector():
+    return UploadInspector(get_blob_store(), workers=int(os.environ.get("FUSIONX_UPLOAD_WORKERS", "2")))
+
+# "Download all submissions" ZIPs, streamed to the static folder and cached
+@st.cache_resource
+def get_bundle_exporter():
+    return BundleExporter(get_blob_store(), os.path.join(STATIC_DIR, "bundles"), base_url=os.environ.get("FUSIONX_BUNDLE_URL"),
+                          max_age=float(os.environ.get("FUSIONX_BUNDLE_MAX_AGE_HOURS", "24")) * 3600)
+
+# Time-decayed "trending this week" scores for competitions and portfolios
+@st.cache_resource
+def get_trending(campus):
+    trending = Trending(get_store(campus))
+    get_event_bus(campus).subscribe(trending.handle, types=TRENDING_EVENTS)
+    return trending
+
+# MinHash/LSH index of descriptions; likely copies are flagged for mentors
+@st.cache_resource
+def get_duplicate_detector(campus):
+    return DuplicateDetector(get_store(campus))
+
+# Sliding-window sketches of recent votes; bursts, name cycling and vote rings are flagged for mentors
+@st.cache_resource
+def get_vote_guard(campus):
+    detector = VoteAbuseDetector(get_store(campus))
+    get_event_bus(campus).subscribe(detector.handle, types=[ev.VOTE])
+    return detector
+
+# Bitmap indexes of who joined which competition and who is interested in which field
+@st.cache_resource
+def get_membership(campus):
+    return Membership(get_store(campus))
+
+# Every domain event, exported to rotated compressed files under DATA_DIR/cdc for
+# offline reporting. FUSIONX_CDC_FORMAT: "jsonl" (default), "parquet" or "off"
+@st.cache_resource
+def get_cdc_exporter(campus):
+    fmt = os.environ.get("FUSIONX_CDC_FORMAT", "jsonl")
+    if fmt == "off":
+        return None
+    exporter = CDCExporter(
+        os.path.join(campus_dir(DATA_DIR, campus), "cdc"), fmt=fmt,
+        max_bytes=int(os.environ.get("FUSIONX_CDC_ROTATE_MB", "64")) * 1024 * 1024,
+        max_seconds=float(os.environ.get("FUSIONX_CDC_ROTATE_MINUTES", "60")) * 60
+    )
+    exporter.start()
+    for bus in integration_buses(get_event_bus, campus):
+        bus.subscribe(exporter.submit)
+    return exporter
+
+# Pushes new chat messages to the sessions viewing each field room
+@st.cache_resource
+def get_chat_broker(campus):
+    broker = ChatBroker()
+    get_event_bus(campus).subscribe(broker.handle, types=[ev.CHAT])
+    return broker
+
+# Public portfolios, leaderboards and winners pre-rendered to static/site/ (HTML + JSON)
+@st.cache_resource
+def get_site_exporter(campus):
+    exporter = SiteExporter(campus_dir(os.path.join(STATIC_DIR, "site"), campus),
+                            interval=float(os.environ.get("FUSIONX_SITE_INTERVAL", "60")))
+    exporter.start()
+    return exporter
+
+# Byte-budgeted LRU for generated PDFs and avatar images, per session and in total;
+# large values spill to DATA_DIR/cache
+@st.cache_resource
+def get_object_cache():
+    return ByteBudgetCache(
+        budget_bytes=int(os.environ.get("FUSIONX_CACHE_MB", "256")) * 1024 * 1024,
+        session_budget_bytes=int(os.environ.get("FUSIONX_SESSION_CACHE_MB", "16")) * 1024 * 1024,
+        spill_dir=os.path.join(DATA_DIR, "cache")
+    )
+
+# Cold tier: competitions closed for FUSIONX_ARCHIVE_AFTER_DAYS move to DATA_DIR/archive
+@st.cache_resource
+def get_archive(campus):
+    return CompetitionArchive(
+        get_store(campus), os.path.join(campus_dir(DATA_DIR, campus), "archive"),
+        fmt=os.environ.get("FUSIONX_ARCHIVE_FORMAT", "parquet"),
+        after_days=float(os.environ.get("FUSIONX_ARCHIVE_AFTER_DAYS", "7"))
+    )
+
+# Hot reads of one campus partition; the first call of each replays its log from the store
+def warmup_reads(c):
+    store_c, membership_c, scoring_c, trending_c = get_store(c), get_membership(c), get_mentor_scoring(c), get_trending(c)
+    xp_c, duplicates_c, judges_c, rollups_c, archive_c = (get_xp_ledger(c), get_duplicate_detector(c), get_judge_pool(c),
+                                                          get_rollups(c), get_archive(c))
+    get_scheduler(c)  # deadlines of campuses nobody has opened yet still fire
+    if c != GLOBAL_CAMPUS:
+        get_webhook_dispatcher(c)  # and global competitions' winners reach them too
+        get_cdc_exporter(c)
+    return [
+        (f"{c}: competitions", lambda: [membership_c.count(comp['title']) for comp in store_c.list_competitions()]),
+        (f"{c}: rankings", lambda: [scoring_c.rankings(comp['title']) for comp in store_c.list_competitions()]),
+        (f"{c}: top 3 & badges", lambda: (store_c.portfolio_votes(), store_c.competition_results(), store_c.closed_competitions())),
+        (f"{c}: trending", lambda: [trending_c.top(kind, 20) for kind in ("competitions", "portfolios", "projects")]),
+        (f"{c}: xp", lambda: xp_c.leaderboard(k=10)),
+        (f"{c}: duplicates", duplicates_c.sync),
+        (f"{c}: judges", judges_c.loads),
+        (f"{c}: newsletter", lambda: [rollups_c.week(week) for week in rollups_c.weeks()[:2]]),
+        (f"{c}: archive", archive_c.results)
+    ]
+
+# Replays every served campus's read models on a thread pool at boot (FUSIONX_WARMUP_WORKERS) and
+# reports ready once their latency is steady; `python -m fusionx.warmup` serves that as /readyz
+@st.cache_resource
+def get_warmup():
+    router = get_campus_router()
+    tasks = []
+    for c in [c for c in router.campuses() if router.serves(c)] + [GLOBAL_CAMPUS]:
+        tasks += warmup_reads(c)
+    warmup = Warmup(tasks, workers=int(os.environ.get("FUSIONX_WARMUP_WORKERS", "4")),
+                    status_file=status_path(DATA_DIR, st.get_option("server.port")))
+    if os.environ.get("FUSIONX_WARMUP", "on") != "off":
+        warmup.start()
+    return warmup
+
+# The session's campus: ?campus=<name> links land on it, the sidebar switches it
+router = get_campus_router()
+warmup = get_warmup()
+campus_options = router.campuses()
+if st.query_params.get("campus") in campus_options and 'campus' not in st.session_state:
+    st.session_state.campus = st.query_params["campus"]
+campus = st.sidebar.selectbox("🏫 Campus", campus_options, key="campus")
+if not router.serves(campus):
+    # Served by another FusionXapp process
+    if router.app_url(campus):
+        st.link_button(f"Go to the {campus} campus", f"{router.app_url(campus)}?campus={campus}")
+    else:
+        st.error(f"The {campus} campus is not served here.")
+    st.stop()
+st.query_params["campus"] = campus
+switch_campus(st.session_state, campus)  # swaps in this campus's session-only data
+
+store = get_store(campus)
+events = get_event_bus(campus)
+rollups = get_rollups(campus)
+xp_ledger = get_xp_ledger(campus)
+notifier = get_notifier(campus)
+trending = get_trending(campus)
+webhooks = get_webhook_dispatcher(campus)
+judges = get_judge_pool(campus)
+scheduler = get_scheduler(campus)
+blobs = get_blob_store()
+uploads = get_upload_inspector()
+bundles = get_bundle_exporter()
+duplicates = get_duplicate_detector(campus)
+vote_guard = get_vote_guard(campus)
+membership = get_membership(campus)
+object_cache = get_object_cache()
+cdc = get_cdc_exporter(campus)
+chat_broker = get_chat_broker(campus)
+site = get_site_exporter(campus)
+archive = get_archive(campus)
+# Cross-campus competitions live in the global partition, with its own scheduler
+global_store = get_store(GLOBAL_CAMPUS)
+global_archive = get_archive(GLOBAL_CAMPUS)
+get_scheduler(GLOBAL_CAMPUS)
+
 # -----------------------------
 # Initialize Persistent State
 # -----------------------------
-if 'competitions' not in st.session_state:
-    st.session_state.competitions = []  # list of competitions
-if 'participants' not in st.session_state:
-    st.session_state.participants = {}  # track participants per competition
+if 'competition_submissions' not in st.session_state:
+    st.session_state.competition_submissions = {}
+# Archive competitions that have been closed long enough, and hand this session's
+# submissions to archived competitions over to the cold tier
+archive.sweep(st.session_state.competition_submissions)
+global_archive.sweep(st.session_state.competition_submissions)
+# This campus's competitions followed by the global ones every campus shares
+global_competitions = global_store.list_competitions()
+st.session_state.global_titles = {c['title'] for c in global_competitions}
+st.session_state.competitions = store.list_competitions() + global_competitions  # list of competitions
+st.session_state.closed_competitions = store.closed_competitions() | global_store.closed_competitions()  # submissions frozen
+# Winners computed once when a competition closes: {title: [{"rank", "email", "name", "title", "score"}]}
+st.session_state.competition_results = {**store.competition_results(), **global_store.competition_results()}
 if 'my_competitions' not in st.session_state:
     st.session_state.my_competitions = set()  # competitions created by this user
-if 'joined_competitions' not in st.session_state:
-    st.session_state.joined_competitions = set()  # prevent joining twice
+if 'guest_id' not in st.session_state:
+    st.session_state.guest_id = f"guest-{uuid.uuid4().hex[:8]}"  # joins without an account
+
+def grant_badge(email, account, badge):
+    account['badges'].append(badge)
+    events.publish(ev.BADGE, email=email, badge=badge_label(badge))
+
+# Campus partition holding a competition: global competitions live in their own
+def partition_of(title):
+    return GLOBAL_CAMPUS if title in st.session_state.global_titles else campus
+
+def participant_count(title):
+    return get_membership(partition_of(title)).count(title)
+
+def is_closed(title):
+    return title in get_store(partition_of(title)).closed_competitions()
+
+def joined_competitions(email):
+    return membership.joined(email) + get_membership(GLOBAL_CAMPUS).joined(email)
+
+# "pending", "active" or "closed"
+def phase(comp):
+    return competition_phase(comp, participant_count(comp['title']), comp['title'] in st.session_state.closed_competitions)
+
+def competition_field(title):
+    return next((c.get('field') for c in st.session_state.competitions if c['title'] == title), None)
+
+# Optional opening date and submission deadline for a proposed competition
+def schedule_fields(opens_on, deadline_date, deadline_time):
+    fields = {}
+    if opens_on:
+        fields["opens_at"] = datetime.datetime.combine(opens_on, datetime.time()).isoformat()
+    if deadline_date:
+        closes_at = datetime.datetime.combine(deadline_date, deadline_time)
+        opens_at = datetime.datetime.fromisoformat(fields.get("opens_at", datetime.datetime.now().isoformat()))
+        if closes_at <= max(opens_at, datetime.datetime.now()):
+            return None
+        fields["closes_at"] = closes_at.isoformat()
+    return fields
 
 # -----------------------------
 # Sidebar Navigation
@@ -31,20 +354,74 @@ page = st.sidebar.radio("Navigation", ["Home", "Propose Competition", "Pending C
 # -----------------------------
 if page == "Home":
     st.subheader("Active Competitions")
-    active = [
-        c for c in st.session_state.competitions 
-        if len(st.session_state.participants.get(c['title'], [])) >= c['threshold']
-    ]
-    
+    active = [c for c in st.session_state.competitions if phase(c) == "active"]
+    # Most joins and submissions lately first
+    active.sort(key=lambda c: trending.score("competitions", c['title']), reverse=True)
+
     if not active:
         st.info("No active competitions yet.")
+    active_titles = {c['title'] for c in active}
+    hot = [(title, score) for title, score, _ in trending.top("competitions", 20) if title in active_titles][:3]
+    if hot:
+        st.markdown("#### 🔥 Trending this week")
+        for title, score in hot:
+            st.markdown(f"- **{title}** (🔥 {score:.1f})")
+        st.markdown("---")
     for comp in active:
-        participants = st.session_state.participants.get(comp['title'], [])
         st.markdown(f"### {comp['title']}")
         st.markdown(f"**Description:** {comp['description']}")
-        st.markdown(f"**Participants Joined:** {len(participants)}/{comp['threshold']} ✅ ACTIVE")
+        st.markdown(f"**Participants Joined:** {participant_count(comp['title'])}/{comp['threshold']} ✅ ACTIVE")
+        if comp.get('closes_at'):
+            st.markdown(f"**Submission Deadline:** {comp['closes_at'][:16].replace('T', ' ')}")
+        # Creators can close early; the scheduler does it automatically at the deadline
+        if comp['title'] in st.session_state.my_competitions:
+            if st.button(f"Close '{comp['title']}' & Announce Winners", key=f"close_{comp['title']}"):
+                get_scheduler(partition_of(comp['title'])).close(comp)
+                st.success(f"Competition '{comp['title']}' closed.")
         st.markdown("---")
 
+    # Finalized results (computed once by the scheduler)
+    if st.session_state.competition_results:
+        st.subheader("Closed Competitions")
+        for comp_title, results in st.session_state.competition_results.items():
+            st.markdown(f"### {comp_title} 🔒 CLOSED")
+            if not results:
+                st.markdown("No scored submissions.")
+            for winner in results:
+                st.markdown(f"🏆 **{winner['rank']}.** {winner['title']} by {winner['name']} — score {winner['score']:.2f}")
+            st.markdown("---")
+
+    # Archived competitions are read-only and loaded only when opened
+    global_archived = global_archive.titles()
+    archived_titles = archive.titles() + global_archived
+    if archived_titles:
+        st.subheader("Archived Competitions")
+        opened = st.selectbox("Open an archived competition", ["—"] + archived_titles, key="archived_competition")
+        if opened != "—":
+            record = (global_archive if opened in global_archived else archive).load(opened)
+            comp = record['competition']
+            st.markdown(f"### {opened} 🗄️ ARCHIVED")
+            if comp.get('description'):
+                st.markdown(f"**Description:** {comp['description']}")
+            st.markdown(f"**Field:** {comp.get('field') or '—'} · **Participants:** {len(record['participants'])} · "
+                        f"**Closed:** {(record['closed_at'] or '')[:16].replace('T', ' ')}")
+            for winner in record['results']:
+                st.markdown(f"🏆 **{winner['rank']}.** {winner['title']} by {winner['name']} — score {winner['score']:.2f}")
+            if record['submissions']:
+                bundle_path = bundles.cached(opened, record['submissions'])
+                if bundle_path is None and st.button(f"Prepare ZIP of all submissions for {opened}", key=f"bundle_archived_{opened}"):
+                    with st.spinner("Bundling submissions..."):
+                        bundle_path = bundles.bundle(opened, record['submissions'])
+                if bundle_path:
+                    bundle_download(bundles, bundle_path)
+                for i, s in enumerate(record['submissions'], start=1):
+                    st.markdown(f"{i}. **{s['title']}** by {s['submitter']}")
+                    st.markdown(f"{s['description']}")
+                    if s["file"]:
+                        uploaded_file(s)
+            else:
+                st.markdown("No archived submissions.")
+
 # -----------------------------
 # Competition Proposal Page
 # -----------------------------
@@ -57,20 +434,36 @@ elif page == "Propose Competition":
             "Joining Threshold (number of participants required to activate)", 
             min_value=1, value=15, step=1
         )
+        opens_on = st.date_input("Opens On (optional)", value=None)
+        deadline_date = st.date_input("Submission Deadline (optional)", value=None)
+        deadline_time = st.time_input("Deadline Time", value=datetime.time(23, 59))
+        cross_campus = st.checkbox("🌐 Global competition (open to every campus)")
         submitted = st.form_submit_button("Submit Competition")
         
         if submitted:
-            if title and description:
-                if any(c['title'].lower() == title.lower() for c in st.session_state.competitions):
+            schedule = schedule_fields(opens_on, deadline_date, deadline_time)
+            if schedule is None:
+                st.error("The submission deadline must be in the future and after the opening date.")
+            elif title and description:
+                new_comp = {
+                    "title": title,
+                    "description": description,
+                    "threshold": threshold,
+                    **schedule
+                }
+                # Titles are unique within a partition and may not shadow a global competition
+                target = GLOBAL_CAMPUS if cross_campus else campus
+                taken = title in st.session_state.global_titles or any(c['title'] == title for c in st.session_state.competitions)
+                if taken or not get_store(target).add_competition(new_comp):
                     st.error("A competition with this title already exists!")
                 else:
-                    st.session_state.competitions.append({
-                        "title": title,
-                        "description": description,
-                        "threshold": threshold
-                    })
-                    st.session_state.participants[title] = []  # initialize participants list
+                    st.session_state.competitions.append(new_comp)
                     st.session_state.my_competitions.add(title)
+                    if cross_campus:
+                        st.session_state.global_titles.add(title)
+                    events.publish(ev.PROPOSAL, competition=title, threshold=threshold,
+                                   opens_at=new_comp.get('opens_at'), closes_at=new_comp.get('closes_at'))
+                    get_scheduler(target).schedule(new_comp)
                     st.success(f"Competition '{title}' submitted successfully!")
             else:
                 st.error("Please provide both title and description.")
@@ -80,26 +473,30 @@ elif page == "Propose Competition":
 # -----------------------------
 elif page == "Pending Competitions":
     st.subheader("Pending Competitions (Join to Activate)")
-    pending = [
-        c for c in st.session_state.competitions 
-        if len(st.session_state.participants.get(c['title'], [])) < c['threshold']
-    ]
+    pending = [c for c in st.session_state.competitions if phase(c) == "pending"]
     
     if not pending:
         st.info("No pending competitions right now. Be the first to propose one!")
-    
+    else:
+        # Accounts join under their email, everyone else under a per-session guest id
+        join_accounts = st.session_state.get('student_accounts', {})
+        join_as = account_picker("Join as", "join_as", join_accounts, extra={"Guest (this session)": st.session_state.guest_id})
+
     for comp in pending:
-        participants = st.session_state.participants.get(comp['title'], [])
         st.markdown(f"### {comp['title']}")
         st.markdown(f"**Description:** {comp['description']}")
-        st.markdown(f"**Participants Joined:** {len(participants)}/{comp['threshold']} ⏳ PENDING")
+        st.markdown(f"**Participants Joined:** {participant_count(comp['title'])}/{comp['threshold']} ⏳ PENDING")
+        if comp.get('opens_at'):
+            st.markdown(f"**Opens On:** {comp['opens_at'][:10]}")
 
         # Join button
         key_join = f"join_{comp['title']}"
         if st.button("Join Competition", key=key_join):
-            if comp['title'] not in st.session_state.joined_competitions:
-                st.session_state.participants[comp['title']].append("You")  # placeholder for user
-                st.session_state.joined_competitions.add(comp['title'])
+            joined_count = get_membership(partition_of(comp['title'])).join(comp['title'], join_as)
+            if joined_count is not None:
+                events.publish(ev.JOIN, competition=comp['title'], field=comp.get('field'), user=join_as,
+                               email=join_as if join_as in join_accounts else None)
+                get_scheduler(partition_of(comp['title'])).try_activate(comp, joined_count)  # announces activation once
                 st.success(f"You joined '{comp['title']}'!")
             else:
                 st.warning("You have already joined this competition.")
@@ -108,10 +505,11 @@ elif page == "Pending Competitions":
         if comp['title'] in st.session_state.my_competitions:
             key_delete = f"delete_{comp['title']}"
             if st.button(f"Delete Competition '{comp['title']}'", key=key_delete):
+                get_store(partition_of(comp['title'])).delete_competition(comp['title'])
+                get_event_bus(partition_of(comp['title'])).publish(ev.COMPETITION_DELETED, competition=comp['title'])
                 st.session_state.competitions = [
                     c for c in st.session_state.competitions if c['title'] != comp['title']
                 ]
-                st.session_state.participants.pop(comp['title'], None)
                 st.session_state.my_competitions.remove(comp['title'])
                 st.success(f"Competition '{comp['title']}' deleted.")
                 st.experimental_set_query_params(refresh="true")
@@ -147,14 +545,15 @@ if page == "Portfolios":
         
         if add_project:
             if project_title and project_description and field:
-                # Store project as dictionary
-                st.session_state.current_projects.append({
+                # Store project as dictionary; the upload is checked in the background
+                project = {
+                    "id": uuid.uuid4().hex,
                     "title": project_title,
                     "description": project_description,
-                    "field": field,
-                    "file": upload_file.name if upload_file else None,
-                    "file_data": upload_file.read() if upload_file else None
-                })
+                    "field": field
+                }
+                uploads.attach(project, upload_file)  # file name, file_ref, file_size, upload status
+                st.session_state.current_projects.append(project)
                 st.success(f"Project '{project_title}' added to your portfolio!")
             else:
                 st.error("Please fill out all fields to add a project.")
@@ -166,7 +565,7 @@ if page == "Portfolios":
             st.markdown(f"{i}. **{p['title']}** ({p['field']})")
             st.markdown(f"{p['description']}")
             if p["file"]:
-                st.markdown(f"**Uploaded File:** {p['file']}")
+                uploaded_file(p)
             st.markdown("---")
 
         # Step 3: Submit full portfolio
@@ -175,6 +574,9 @@ if page == "Portfolios":
                 if student_name not in st.session_state.portfolios:
                     st.session_state.portfolios[student_name] = []
                 st.session_state.portfolios[student_name].extend(st.session_state.current_projects)
+                for p in st.session_state.current_projects:
+                    duplicates.check(f"project:{project_id(student_name, p)}", p['description'],
+                                     {"kind": "portfolio project", "title": p['title'], "owner": student_name, "where": "Portfolio"})
                 st.session_state.current_projects = []  # clear temp projects
                 st.success(f"Portfolio for '{student_name}' submitted successfully!")
             else:
@@ -189,7 +591,7 @@ if page == "Portfolios":
                 st.markdown(f"{i}. **{p['title']}** ({p['field']})")
                 st.markdown(f"{p['description']}")
                 if p["file"]:
-                    st.markdown(f"**Uploaded File:** {p['file']}")
+                    uploaded_file(p)
                 st.markdown("---")
     else:
         st.info("No portfolios submitted yet.")
@@ -201,29 +603,17 @@ import datetime
 VOTE_LIMIT = 5      # votes per month
 VOTE_RESET_DAYS = 30
 
-# Initialize voting session state
-if 'portfolio_votes' not in st.session_state:
-    st.session_state.portfolio_votes = {}  # {student_name: {"yes": int, "no": int}}
-if 'user_votes' not in st.session_state:
-    st.session_state.user_votes = {}  # {voter_name: {"votes_left": int, "last_reset": date}}
+# Load votes from the shared store
+st.session_state.portfolio_votes = store.portfolio_votes()  # {student_name: {"yes": int, "no": int}}
 
 st.sidebar.subheader("Vote on Student Portfolios")
 voter_name = st.sidebar.text_input("Your Name (to vote)")
 
 if voter_name:
-    today = datetime.date.today()
-
-    # Initialize voter info if first time
-    if voter_name not in st.session_state.user_votes:
-        st.session_state.user_votes[voter_name] = {"votes_left": VOTE_LIMIT, "last_reset": today}
+    # Initializes the voter on first visit and resets votes every 30 days
+    votes_left = store.votes_left(voter_name, VOTE_LIMIT, VOTE_RESET_DAYS)
 
-    # Reset votes every 30 days
-    last_reset = st.session_state.user_votes[voter_name]["last_reset"]
-    if (today - last_reset).days >= VOTE_RESET_DAYS:
-        st.session_state.user_votes[voter_name]["votes_left"] = VOTE_LIMIT
-        st.session_state.user_votes[voter_name]["last_reset"] = today
-
-    st.sidebar.markdown(f"Votes remaining this month: {st.session_state.user_votes[voter_name]['votes_left']}")
+    st.sidebar.markdown(f"Votes remaining this month: {votes_left}")
 
     # Show portfolios to vote on
     if 'portfolios' in st.session_state and st.session_state.portfolios:
@@ -231,28 +621,22 @@ if voter_name:
             if student == voter_name:
                 continue  # skip voting on own portfolio
 
-            votes = st.session_state.portfolio_votes.get(student, {"yes": 0, "no": 0})
+            votes = vote_counts(st.session_state.portfolio_votes.get(student, 0))
             st.sidebar.markdown(f"**{student}'s Portfolio** ✅ {votes['yes']} | ❌ {votes['no']}")
 
             col1, col2 = st.sidebar.columns(2)
             with col1:
                 if st.button(f"YES {student}", key=f"yes_{voter_name}_{student}"):
-                    if st.session_state.user_votes[voter_name]["votes_left"] > 0:
-                        if student not in st.session_state.portfolio_votes:
-                            st.session_state.portfolio_votes[student] = {"yes": 0, "no": 0}
-                        st.session_state.portfolio_votes[student]["yes"] += 1
-                        st.session_state.user_votes[voter_name]["votes_left"] -= 1
+                    if store.cast_portfolio_vote(voter_name, student, "yes", VOTE_LIMIT, VOTE_RESET_DAYS):
+                        events.publish(ev.VOTE, email=student, choice="yes", voter=voter_name, session=st.session_state.guest_id)
                         st.success(f"You voted YES for {student}'s portfolio!")
                     else:
                         st.warning("No votes left this month!")
 
             with col2:
                 if st.button(f"NO {student}", key=f"no_{voter_name}_{student}"):
-                    if st.session_state.user_votes[voter_name]["votes_left"] > 0:
-                        if student not in st.session_state.portfolio_votes:
-                            st.session_state.portfolio_votes[student] = {"yes": 0, "no": 0}
-                        st.session_state.portfolio_votes[student]["no"] += 1
-                        st.session_state.user_votes[voter_name]["votes_left"] -= 1
+                    if store.cast_portfolio_vote(voter_name, student, "no", VOTE_LIMIT, VOTE_RESET_DAYS):
+                        events.publish(ev.VOTE, email=student, choice="no", voter=voter_name, session=st.session_state.guest_id)
                         st.success(f"You voted NO for {student}'s portfolio!")
                     else:
                         st.warning("No votes left this month!")
@@ -262,23 +646,22 @@ if voter_name:
 st.sidebar.markdown("---")
 st.sidebar.subheader("🌟 Special Recognition: Top 3 Portfolios")
 
-# Build a list of (student, yes_votes) from portfolio_votes
-ranking = []
-for student, counts in st.session_state.portfolio_votes.items():
-    yes_votes = counts.get("yes", 0)
-    ranking.append((student, yes_votes))
-
-# Sort the list by yes_votes descending
-ranking.sort(key=lambda x: x[1], reverse=True)
-
-# Get top 3 (or fewer if less than 3 portfolios exist)
-top_3 = ranking[:3]
+# (student, yes_votes) of the top 3 (or fewer if less than 3 portfolios exist)
+top_3 = top_portfolios(st.session_state.portfolio_votes, 3)
 
 if top_3:
     for i, (student, yes_votes) in enumerate(top_3, start=1):
         st.sidebar.markdown(f"**{i}. {student}** — {yes_votes} votes")
 else:
     st.sidebar.markdown("No portfolios have votes yet.")
+
+# Same votes (plus project votes and comments), decayed so recent activity wins
+trending_portfolios = trending.top("portfolios", 3)
+if trending_portfolios:
+    st.sidebar.markdown("**🔥 Trending this week**")
+    for owner, score, _ in trending_portfolios:
+        owner_name = st.session_state.get('student_accounts', {}).get(owner, {}).get('name', owner)
+        st.sidebar.markdown(f"- {owner_name} (🔥 {score:.1f})")
 # -----------------------------
 # Submit Work for Current Active Competitions
 # -----------------------------
@@ -289,19 +672,14 @@ st.markdown(
     "Select a competition, enter your project details, and submit your work."
 )
 
-# Ensure competitions and participants exist
+# Ensure competitions exist
 if 'competitions' not in st.session_state:
     st.session_state.competitions = []
-if 'participants' not in st.session_state:
-    st.session_state.participants = {}
 if 'competition_submissions' not in st.session_state:
     st.session_state.competition_submissions = {}  # {competition_title: [submissions]}
 
 # Filter active competitions: threshold reached
-active_competitions = [
-    c for c in st.session_state.competitions
-    if len(st.session_state.participants.get(c['title'], [])) >= c['threshold']
-]
+active_competitions = [c for c in st.session_state.competitions if phase(c) == "active"]
 
 if active_competitions:
     # Show competitions clearly
@@ -309,7 +687,7 @@ if active_competitions:
     for c in active_competitions:
         st.markdown(f"**{c['title']}**")
         st.markdown(f"Description: {c['description']}")
-        st.markdown(f"Participants Joined: {len(st.session_state.participants.get(c['title'], []))}/{c['threshold']}")
+        st.markdown(f"Participants Joined: {participant_count(c['title'])}/{c['threshold']}")
         st.markdown("---")
 
     # Let student select which competition to submit to
@@ -325,17 +703,23 @@ if active_competitions:
         submit_work = st.form_submit_button("Submit Work")
 
         if submit_work:
-            if submitter_name and submission_title and submission_description:
+            if is_closed(selected_comp):
+                st.error(f"Submissions for '{selected_comp}' are closed.")
+            elif submitter_name and submission_title and submission_description:
                 submission = {
+                    "id": uuid.uuid4().hex,
                     "submitter": submitter_name,
                     "title": submission_title,
-                    "description": submission_description,
-                    "file": submission_file.name if submission_file else None,
-                    "file_data": submission_file.read() if submission_file else None
+                    "description": submission_description
                 }
+                uploads.attach(submission, submission_file)  # file name, file_ref, file_size, upload status
                 if selected_comp not in st.session_state.competition_submissions:
                     st.session_state.competition_submissions[selected_comp] = []
                 st.session_state.competition_submissions[selected_comp].append(submission)
+                duplicates.check(f"submission:{submission['id']}", submission_description,
+                                 {"kind": "submission", "title": submission_title, "owner": submitter_name, "where": selected_comp})
+                events.publish(ev.SUBMISSION, competition=selected_comp, field=competition_field(selected_comp),
+                               title=submission_title, submitter=submitter_name, submission_id=submission['id'])
                 st.success(f"Work '{submission_title}' submitted for '{selected_comp}'!")
             else:
                 st.error("Please fill out all required fields before submitting.")
@@ -347,11 +731,18 @@ else:
 st.markdown("### Submitted Work for Competitions")
 for comp_title, submissions in st.session_state.competition_submissions.items():
     st.markdown(f"#### {comp_title}")
+    # One ZIP of every file plus a CSV/JSON manifest, rebuilt only when submissions change
+    bundle_path = bundles.cached(comp_title, submissions)
+    if bundle_path is None and st.button(f"Prepare ZIP of all submissions for {comp_title}", key=f"bundle_{comp_title}"):
+        with st.spinner("Bundling submissions..."):
+            bundle_path = bundles.bundle(comp_title, submissions)
+    if bundle_path:
+        bundle_download(bundles, bundle_path)
     for i, s in enumerate(submissions, start=1):
         st.markdown(f"{i}. **{s['title']}** by {s['submitter']}")
         st.markdown(f"{s['description']}")
         if s["file"]:
-            st.markdown(f"**Uploaded File:** {s['file']}")
+            uploaded_file(s)
         st.markdown("---")
 # -----------------------------
 # Enhanced Competition Submission Management
@@ -389,12 +780,21 @@ if user_name:
             else:
                 user_subs.sort(key=lambda x: x['title'])
 
+            # Closed competitions are frozen: no more updates or deletions
+            frozen = comp_title in st.session_state.closed_competitions
+            if frozen:
+                st.info(f"🔒 '{comp_title}' is closed; submissions can no longer be changed.")
+
             # Display submissions with Update/Delete buttons
             for i, s in enumerate(user_subs, start=1):
                 st.markdown(f"{i}. **{s['title']}** ({s['timestamp'].strftime('%Y-%m-%d %H:%M')})")
                 st.markdown(f"{s['description']}")
                 if s['file']:
-                    st.markdown(f"**Uploaded File:** {s['file']}")
+                    uploaded_file(s)
+
+                if frozen:
+                    st.markdown("---")
+                    continue
 
                 col1, col2, col3 = st.columns(3)
 
@@ -409,14 +809,19 @@ if user_name:
                             s['title'] = new_title
                             s['description'] = new_desc
                             if new_file:
-                                s['file'] = new_file.name
-                                s['file_data'] = new_file.read()
+                                uploads.attach(s, new_file)
+                            duplicates.check(f"submission:{submission_id(s)}", new_desc,
+                                             {"kind": "submission", "title": new_title, "owner": user_name, "where": comp_title})
+                            events.publish(ev.SUBMISSION_UPDATED, competition=comp_title, submission_id=submission_id(s),
+                                           title=new_title, submitter=user_name, file=s.get('file'))
                             st.success(f"Submission '{s['title']}' updated successfully!")
 
                 # Delete submission
                 with col2:
                     if st.button(f"Delete {s['title']}", key=f"delete_{comp_title}_{i}"):
                         st.session_state.competition_submissions[comp_title].remove(s)
+                        events.publish(ev.SUBMISSION_DELETED, competition=comp_title, submission_id=submission_id(s),
+                                       title=s['title'], submitter=user_name)
                         st.success(f"Submission '{s['title']}' deleted!")
 
                 st.markdown("---")
@@ -463,11 +868,23 @@ if filtered_comps:
         st.markdown(f"**{c['title']}**")
         st.markdown(f"Description: {c['description']}")
         threshold = c.get('threshold', 'N/A')
-        participants = len(st.session_state.participants.get(c['title'], [])) if 'participants' in st.session_state else 0
-        st.markdown(f"Participants Joined: {participants}/{threshold}")
+        st.markdown(f"Participants Joined: {participant_count(c['title'])}/{threshold}")
         st.markdown("---")
 else:
     st.info(f"No competitions found for the field '{chosen_field}'.")
+
+# Students who joined competitions in every selected field (bitmap AND of per-field ORs)
+st.markdown("### Cross-Field Participation")
+cross_fields = st.multiselect("Students competing in all of these fields", fields[1:], key="cross_fields")
+if cross_fields:
+    # Campus competitions only: global ones keep their members in the global partition
+    groups = [[c['title'] for c in st.session_state.competitions
+               if c.get("field") == f and c['title'] not in st.session_state.global_titles] for f in cross_fields]
+    cross_members = membership.in_every_group(groups)
+    cross_accounts = st.session_state.get('student_accounts', {})
+    st.markdown(f"**{len(cross_members)}** students joined competitions in {' and '.join(cross_fields)}.")
+    for member in cross_members[:20]:
+        st.markdown(f"- {cross_accounts.get(member, {}).get('name', member)}")
 # -----------------------------
 # Add-On: Propose Competition with Field
 # -----------------------------
@@ -478,10 +895,6 @@ st.subheader("Propose a New Competition")
 if 'competitions' not in st.session_state:
     st.session_state.competitions = []
 
-# Initialize participants dictionary if needed
-if 'participants' not in st.session_state:
-    st.session_state.participants = {}
-
 with st.form("propose_competition_form_with_field"):
     title = st.text_input("Competition Title")
     description = st.text_area("Description")
@@ -489,20 +902,35 @@ with st.form("propose_competition_form_with_field"):
     
     # Field dropdown
     field = st.selectbox("Field of Competition", ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"])
+
+    # Optional schedule
+    opens_on = st.date_input("Opens On (optional)", value=None, key="field_opens_on")
+    deadline_date = st.date_input("Submission Deadline (optional)", value=None, key="field_deadline_date")
+    deadline_time = st.time_input("Deadline Time", value=datetime.time(23, 59), key="field_deadline_time")
     
     propose = st.form_submit_button("Propose Competition")
     
     if propose:
-        if title and description:
+        schedule = schedule_fields(opens_on, deadline_date, deadline_time)
+        if schedule is None:
+            st.error("The submission deadline must be in the future and after the opening date.")
+        elif title and description:
             # Create competition dictionary with field
             new_comp = {
                 "title": title,
                 "description": description,
                 "threshold": threshold,
-                "field": field
+                "field": field,
+                **schedule
             }
-            st.session_state.competitions.append(new_comp)
-            st.success(f"Competition '{title}' proposed in the '{field}' field!")
+            if new_comp['title'] not in st.session_state.global_titles and store.add_competition(new_comp):
+                st.session_state.competitions.append(new_comp)
+                events.publish(ev.PROPOSAL, competition=title, field=field, threshold=threshold,
+                               opens_at=new_comp.get('opens_at'), closes_at=new_comp.get('closes_at'))
+                scheduler.schedule(new_comp)
+                st.success(f"Competition '{title}' proposed in the '{field}' field!")
+            else:
+                st.error("A competition with this title already exists!")
         else:
             st.error("Please fill out all required fields.")
 # -----------------------------
@@ -525,6 +953,7 @@ with st.form("create_account_form"):
         if student_name and student_email:
             if student_email not in st.session_state.student_accounts:
                 st.session_state.student_accounts[student_email] = {"name": student_name}
+                account_added(st.session_state.student_accounts, student_email)
                 st.success(f"Account created for {student_name} ({student_email})!")
             else:
                 st.warning("An account with this email already exists.")
@@ -536,42 +965,51 @@ st.markdown("### Submit Work Using Your Account")
 
 if st.session_state.student_accounts:
     # Select account
-    student_email_select = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()))
-    student_name = st.session_state.student_accounts[student_email_select]["name"]
-
-    # Show submission form
-    with st.form("submission_with_account"):
-        submission_title = st.text_input("Project/Work Title", key="account_submission_title")
-        submission_description = st.text_area("Description of Your Work", key="account_submission_desc")
-        submission_file = st.file_uploader("Upload File (optional)", type=["png","jpg","pdf","zip"], key="account_submission_file")
-        selected_comp = st.selectbox(
-            "Select Competition to Submit To",
-            [c['title'] for c in st.session_state.competitions] if 'competitions' in st.session_state else []
-        )
-        submit_work_account = st.form_submit_button("Submit Work")
-
-        if submit_work_account:
-            if submission_title and submission_description and selected_comp:
-                submission = {
-                    "submitter_name": student_name,
-                    "submitter_email": student_email_select,
-                    "title": submission_title,
-                    "description": submission_description,
-                    "file": submission_file.name if submission_file else None,
-                    "file_data": submission_file.read() if submission_file else None,
-                    "timestamp": datetime.datetime.now()
-                }
-
-                # Store submission in competition_submissions
-                if 'competition_submissions' not in st.session_state:
-                    st.session_state.competition_submissions = {}
-                if selected_comp not in st.session_state.competition_submissions:
-                    st.session_state.competition_submissions[selected_comp] = []
-
-                st.session_state.competition_submissions[selected_comp].append(submission)
-                st.success(f"Work '{submission_title}' submitted for '{selected_comp}' as {student_name}!")
-            else:
-                st.error("Please fill out all required fields before submitting.")
+    student_email_select = account_picker("Select your account", "submit_account", st.session_state.student_accounts)
+    if student_email_select:
+        student_name = st.session_state.student_accounts[student_email_select]["name"]
+
+        # Show submission form
+        with st.form("submission_with_account"):
+            submission_title = st.text_input("Project/Work Title", key="account_submission_title")
+            submission_description = st.text_area("Description of Your Work", key="account_submission_desc")
+            submission_file = st.file_uploader("Upload File (optional)", type=["png","jpg","pdf","zip"], key="account_submission_file")
+            selected_comp = st.selectbox(
+                "Select Competition to Submit To",
+                [c['title'] for c in st.session_state.competitions if c['title'] not in st.session_state.closed_competitions]
+            )
+            submit_work_account = st.form_submit_button("Submit Work")
+
+            if submit_work_account:
+                if is_closed(selected_comp):
+                    st.error(f"Submissions for '{selected_comp}' are closed.")
+                elif submission_title and submission_description and selected_comp:
+                    submission = {
+                        "id": uuid.uuid4().hex,
+                        "submitter": student_name,
+                        "submitter_name": student_name,
+                        "submitter_email": student_email_select,
+                        "title": submission_title,
+                        "description": submission_description,
+                        "timestamp": datetime.datetime.now()
+                    }
+                    uploads.attach(submission, submission_file)  # file name, file_ref, file_size, upload status
+
+                    # Store submission in competition_submissions
+                    if 'competition_submissions' not in st.session_state:
+                        st.session_state.competition_submissions = {}
+                    if selected_comp not in st.session_state.competition_submissions:
+                        st.session_state.competition_submissions[selected_comp] = []
+
+                    st.session_state.competition_submissions[selected_comp].append(submission)
+                    duplicates.check(f"submission:{submission['id']}", submission_description,
+                                     {"kind": "submission", "title": submission_title, "owner": student_email_select, "where": selected_comp})
+                    events.publish(ev.SUBMISSION, competition=selected_comp, field=competition_field(selected_comp),
+                                   title=submission_title, submitter=student_name, email=student_email_select,
+                                   submission_id=submission['id'])
+                    st.success(f"Work '{submission_title}' submitted for '{selected_comp}' as {student_name}!")
+                else:
+                    st.error("Please fill out all required fields before submitting.")
 
     # Show all submissions with student name/email
     st.markdown("### All Submissions with Account Info")
@@ -579,10 +1017,10 @@ if st.session_state.student_accounts:
         for comp_title, submissions in st.session_state.competition_submissions.items():
             st.markdown(f"#### {comp_title}")
             for i, s in enumerate(submissions, start=1):
-                st.markdown(f"{i}. **{s['title']}** by {s['submitter_name']} ({s['submitter_email']})")
+                st.markdown(f"{i}. **{s['title']}** by {s.get('submitter_name', s['submitter'])} ({s.get('submitter_email') or 'no account'})")
                 st.markdown(f"{s['description']}")
                 if s['file']:
-                    st.markdown(f"**Uploaded File:** {s['file']}")
+                    uploaded_file(s)
                 st.markdown("---")
 # -----------------------------
 # Add-On: Field-Based Chat Rooms
@@ -591,14 +1029,10 @@ st.markdown("---")
 st.subheader("Field-Based Chat Rooms")
 st.markdown("Join a chat room for your field and team up with other students!")
 
-# Initialize chat room storage
-if 'chat_rooms' not in st.session_state:
-    st.session_state.chat_rooms = {}  # {field_name: [{"user": user_name, "message": msg, "timestamp": datetime}]}
-
 # Let student select their name (or account if using previous add-on)
 if 'student_accounts' in st.session_state and st.session_state.student_accounts:
-    chat_user_email = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()), key="chat_user_email")
-    chat_user_name = st.session_state.student_accounts[chat_user_email]["name"]
+    chat_user_email = account_picker("Select your account", "chat_user_email", st.session_state.student_accounts)
+    chat_user_name = st.session_state.student_accounts[chat_user_email]["name"] if chat_user_email else None
 else:
     chat_user_name = st.text_input("Enter your name to join chat")
 
@@ -606,31 +1040,8 @@ else:
 fields = ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"]
 selected_field = st.selectbox("Select a chat room (by field)", fields, key="chat_field_select")
 
-# Initialize chat room if empty
-if selected_field not in st.session_state.chat_rooms:
-    st.session_state.chat_rooms[selected_field] = []
-
-# Display chat messages
-st.markdown(f"### Chat Room: {selected_field}")
-if st.session_state.chat_rooms[selected_field]:
-    for msg in st.session_state.chat_rooms[selected_field]:
-        timestamp = msg['timestamp'].strftime("%Y-%m-%d %H:%M")
-        st.markdown(f"**{msg['user']}** ({timestamp}): {msg['message']}")
-else:
-    st.info("No messages yet. Start the conversation!")
-
-# Input for new message
-new_message = st.text_input("Type your message here", key="new_chat_msg")
-if st.button("Send Message"):
-    if new_message and chat_user_name:
-        st.session_state.chat_rooms[selected_field].append({
-            "user": chat_user_name,
-            "message": new_message,
-            "timestamp": datetime.datetime.now()
-        })
-        st.experimental_rerun()  # refresh chat to show the new message
-    else:
-        st.warning("Please enter your name and a message to send.")
+# Display chat room (a self-refreshing fragment; new messages are pushed by the chat broker)
+chat_room(store, events, chat_broker, selected_field, chat_user_name)
 # -----------------------------
 # Add-On: User Accounts & Profile Pages
 # -----------------------------
@@ -642,7 +1053,12 @@ import base64
 
 # Initialize accounts if not present
 if 'student_accounts' not in st.session_state:
-    st.session_state.student_accounts = {}  # {email: {"name": name, "field": [], "avatar": file, "votes": 0, "badges": []}}
+    st.session_state.student_accounts = {}  # {email: {"name": name, "field": [], "avatar_ref": blob ref, "votes": 0, "badges": []}}
+
+# Pictures go through the upload checks like any other file and become the avatar once they pass
+def set_avatar(account, avatar):
+    if avatar["upload"]["status"] == "ok":
+        account["avatar_ref"] = avatar["file_ref"]
 
 # --- Account Creation / Update ---
 with st.form("account_creation_form"):
@@ -654,63 +1070,57 @@ with st.form("account_creation_form"):
     
     if create_account:
         if account_name and account_email:
-            avatar_data = account_avatar.read() if account_avatar else None
             if account_email not in st.session_state.student_accounts:
                 st.session_state.student_accounts[account_email] = {
                     "name": account_name,
                     "field": account_field,
-                    "avatar": avatar_data,
+                    "avatar_ref": None,
                     "votes": 0,
                     "badges": []
                 }
+                membership.set_fields(account_email, account_field)
+                events.publish(ev.ACCOUNT_CREATED, email=account_email, name=account_name, fields=account_field)
+                account_added(st.session_state.student_accounts, account_email)
                 st.success(f"Account created for {account_name}!")
             else:
                 # Update existing account
                 st.session_state.student_accounts[account_email]["name"] = account_name
                 st.session_state.student_accounts[account_email]["field"] = account_field
-                if avatar_data:
-                    st.session_state.student_accounts[account_email]["avatar"] = avatar_data
+                membership.set_fields(account_email, account_field)
+                events.publish(ev.ACCOUNT_UPDATED, email=account_email, name=account_name, fields=account_field)
+                accounts_changed()  # account pickers find the new name
                 st.success(f"Account updated for {account_name}!")
+            if account_avatar is not None:
+                account = st.session_state.student_accounts[account_email]
+                avatar = account["avatar_upload"] = {}  # its check status is shown on the profile
+                checking = uploads.attach(avatar, account_avatar)  # None when it is too large to copy
+                if checking is not None:
+                    checking.add_done_callback(lambda _, account=account, avatar=avatar: set_avatar(account, avatar))
         else:
             st.error("Please fill in at least your name and email.")
 
 # --- Profile Page Viewer ---
 st.markdown("### View Your Profile")
 if st.session_state.student_accounts:
-    selected_email = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()), key="profile_select")
-    account = st.session_state.student_accounts[selected_email]
-    
-    # Display avatar
-    if account.get("avatar"):
-        avatar_b64 = base64.b64encode(account["avatar"]).decode("utf-8")
-        st.markdown(f'<img src="data:image/png;base64,{avatar_b64}" width="100" style="border-radius:50%">', unsafe_allow_html=True)
-    
-    st.markdown(f"**Name:** {account['name']}")
-    st.markdown(f"**Email:** {selected_email}")
-    st.markdown(f"**Fields of Interest:** {', '.join(account['field']) if account['field'] else 'None'}")
-    st.markdown(f"**Votes Received:** {account.get('votes', 0)}")
+    selected_email = account_picker("Select your account", "profile_select", st.session_state.student_accounts)
+    if selected_email:
+        account = st.session_state.student_accounts[selected_email]
     
-    # Show badges
-    if account.get("badges"):
-        st.markdown("**Achievements / Badges:**")
-        st.markdown(", ".join(account["badges"]))
-    else:
-        st.markdown("**Achievements / Badges:** None yet")
-    
-    # Show portfolio projects
-    if 'portfolios' in st.session_state and selected_email in st.session_state.portfolios:
-        st.markdown("**Portfolio Projects:**")
-        for proj in st.session_state.portfolios[selected_email]:
-            st.markdown(f"- {proj['title']} ({proj.get('field','No field')})")
-    else:
-        st.markdown("**Portfolio Projects:** None yet")
+        # Display avatar
+        if blobs.exists(account.get("avatar_ref")):
+            # Encoded once per image and shared by every session showing it
+            def encode_avatar():
+                with blobs.open(account['avatar_ref']) as f:
+                    return base64.b64encode(f.read())
+            avatar_b64 = object_cache.get_or_create(SHARED, f"avatar:{account['avatar_ref']}", encode_avatar).decode("utf-8")
+            st.markdown(f'<img src="data:image/png;base64,{avatar_b64}" width="100" style="border-radius:50%">', unsafe_allow_html=True)
+        if account.get("avatar_upload", {}).get("upload", {}).get("status") in ("checking", "rejected"):
+            uploaded_file(account["avatar_upload"])
     
-    # Show competitions joined
-    if 'participants' in st.session_state:
-        joined_comps = [comp for comp, users in st.session_state.participants.items() if account['name'] in users]
-        st.markdown(f"**Competitions Joined:** {', '.join(joined_comps) if joined_comps else 'None'}")
-    else:
-        st.markdown("**Competitions Joined:** None yet")
+        # Details, badges, portfolio projects and competitions joined
+        projects = st.session_state.get('portfolios', {}).get(selected_email)
+        for line in profile_lines(selected_email, account, projects, joined_competitions(selected_email)):
+            st.markdown(line)
 # -----------------------------
 # Add-On: Automatic Badges & Vote Tracking
 # -----------------------------
@@ -727,47 +1137,18 @@ if 'portfolios' not in st.session_state:
 if 'portfolio_votes' not in st.session_state:
     st.session_state.portfolio_votes = {}  # {email: total_votes}
 
-# --- Grant Badge for First Portfolio Submission ---
-for email, projects in st.session_state.portfolios.items():
-    if projects:
-        account = st.session_state.student_accounts.get(email)
-        if account:
-            if "First Portfolio Submitted" not in account['badges']:
-                account['badges'].append("🏆 First Portfolio Submitted")
-                st.toast(f"{account['name']} earned the badge: First Portfolio Submitted!")
-
-# --- Grant Badge for Multiple Fields Participation ---
-for email, account in st.session_state.student_accounts.items():
-    if len(account.get('field', [])) >= 2:
-        if "Multi-Field Participant" not in account['badges']:
-            account['badges'].append("🌟 Multi-Field Participant")
-            st.toast(f"{account['name']} earned the badge: Multi-Field Participant!")
-
-# --- Grant Badges for Top 3 in Competitions ---
-if 'competition_votes' in st.session_state:
-    # competition_votes = {competition_title: [{"email": email, "votes": x}, ...]}
-    for comp_title, votes_list in st.session_state.competition_votes.items():
-        # Sort descending
-        sorted_votes = sorted(votes_list, key=lambda x: x['votes'], reverse=True)
-        for i, top in enumerate(sorted_votes[:3]):  # Top 3
-            email = top['email']
-            account = st.session_state.student_accounts.get(email)
-            if account:
-                badge_name = f"🏅 Top {i+1} in {comp_title}"
-                if badge_name not in account['badges']:
-                    account['badges'].append(badge_name)
-                    st.toast(f"{account['name']} earned the badge: {badge_name}!")
+# --- First portfolio submission, multiple fields, and Top 3 in competitions ---
+# Top 3 badges are awarded once by the lifecycle scheduler when a competition closes
+earned = grant_badges(st.session_state.student_accounts, st.session_state.portfolios, membership.multi_field(2),
+                      lambda email: store.badges(email) + global_store.badges(email), grant_badge)
+for account, badge in earned:
+    st.toast(f"{account['name']} earned the badge: {badge_label(badge)}!")
 
 # --- Increment Votes in Account Whenever Portfolio Gets Voted ---
-# portfolio_votes = {email: total_votes}
-for email, vote_count in st.session_state.portfolio_votes.items():
-    account = st.session_state.student_accounts.get(email)
-    if account:
-        account['votes'] = vote_count
+track_votes(st.session_state.student_accounts, st.session_state.portfolio_votes)
 # -----------------------------
 # Add-On: Special Features Tab
 # -----------------------------
-import io
 from fpdf import FPDF
 
 st.markdown("---")
@@ -788,29 +1169,30 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 with tab1:
     st.markdown("### AI Recommendations for You")
     if 'student_accounts' in st.session_state and st.session_state.student_accounts:
-        student_email = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()), key="ai_suggestions")
-        student = st.session_state.student_accounts[student_email]
-        interests = student.get('field', [])
+        student_email = account_picker("Select your account", "ai_suggestions", st.session_state.student_accounts)
+        if student_email:
+            student = st.session_state.student_accounts[student_email]
+            interests = student.get('field', [])
         
-        recommended_comps = []
-        recommended_portfolios = []
-
-        # Recommend competitions matching student fields
-        if 'competitions' in st.session_state:
-            for c in st.session_state.competitions:
-                if c.get("field") in interests:
-                    recommended_comps.append(c['title'])
-        # Recommend portfolios in fields of interest
-        if 'portfolios' in st.session_state:
-            for email, projects in st.session_state.portfolios.items():
-                for proj in projects:
-                    if proj.get("field") in interests:
-                        recommended_portfolios.append(f"{proj['title']} by {st.session_state.student_accounts.get(email,{}).get('name','Unknown')}")
-
-        st.markdown("**Recommended Competitions:**")
-        st.write(recommended_comps if recommended_comps else "No recommendations yet.")
-        st.markdown("**Recommended Portfolios:**")
-        st.write(recommended_portfolios if recommended_portfolios else "No recommendations yet.")
+            recommended_comps = []
+            recommended_portfolios = []
+
+            # Recommend competitions matching student fields
+            if 'competitions' in st.session_state:
+                for c in st.session_state.competitions:
+                    if c.get("field") in interests:
+                        recommended_comps.append(c['title'])
+            # Recommend portfolios in fields of interest
+            if 'portfolios' in st.session_state:
+                for email, projects in st.session_state.portfolios.items():
+                    for proj in projects:
+                        if proj.get("field") in interests:
+                            recommended_portfolios.append(f"{proj['title']} by {st.session_state.student_accounts.get(email,{}).get('name','Unknown')}")
+
+            st.markdown("**Recommended Competitions:**")
+            st.write(recommended_comps if recommended_comps else "No recommendations yet.")
+            st.markdown("**Recommended Portfolios:**")
+            st.write(recommended_portfolios if recommended_portfolios else "No recommendations yet.")
     else:
         st.info("No student accounts found. Create an account first.")
 
@@ -819,49 +1201,132 @@ with tab1:
 # =======================
 with tab2:
     st.markdown("### Mentor Feedback / Competition Scoring")
-    if 'competitions' in st.session_state:
+    if st.session_state.competitions:
         selected_comp = st.selectbox("Select a competition to give feedback", [c['title'] for c in st.session_state.competitions], key="mentor_feedback_comp")
-        feedback_text = st.text_area("Enter your feedback or score")
-        mentor_name = st.text_input("Your name")
-        if st.button("Submit Feedback"):
-            if 'mentor_feedback' not in st.session_state:
-                st.session_state.mentor_feedback = {}
-            if selected_comp not in st.session_state.mentor_feedback:
-                st.session_state.mentor_feedback[selected_comp] = []
-            st.session_state.mentor_feedback[selected_comp].append({
-                "mentor": mentor_name,
-                "feedback": feedback_text
-            })
-            st.success(f"Feedback submitted for {selected_comp}.")
-
-    # Display feedback
-    if 'mentor_feedback' in st.session_state and selected_comp in st.session_state.mentor_feedback:
-        st.markdown(f"#### Feedback for {selected_comp}")
-        for fb in st.session_state.mentor_feedback[selected_comp]:
-            st.markdown(f"- **{fb['mentor']}**: {fb['feedback']}")
+        comp_submissions = st.session_state.competition_submissions.get(selected_comp, [])
+        comp_scoring = get_mentor_scoring(partition_of(selected_comp))
+
+        if comp_submissions:
+            with st.form("mentor_scoring_form"):
+                mentor_name = st.text_input("Your name")
+                scored_submission = st.selectbox(
+                    "Submission",
+                    comp_submissions,
+                    format_func=lambda s: f"{s['title']} by {s.get('submitter_name') or s.get('submitter')}"
+                )
+                rubric_scores = {
+                    criterion: st.slider(criterion, SCORE_MIN, SCORE_MAX, 5, key=f"rubric_{criterion}")
+                    for criterion in RUBRIC
+                }
+                feedback_text = st.text_area("Enter your feedback")
+                submit_score = st.form_submit_button("Submit Score")
+
+                if submit_score:
+                    if mentor_name:
+                        comp_scoring.submit(selected_comp, scored_submission, mentor_name, rubric_scores, feedback_text)
+                        get_event_bus(partition_of(selected_comp)).publish(
+                            ev.SCORE, competition=selected_comp, submission_id=submission_id(scored_submission),
+                            title=scored_submission['title'], judge=mentor_name, scores=rubric_scores, feedback=feedback_text)
+                        st.success(f"Score submitted for '{scored_submission['title']}'.")
+                    else:
+                        st.error("Please enter your name before scoring.")
+        else:
+            st.info("No submissions to score for this competition yet.")
+
+        # Rankings: per-judge z-score normalization + trimmed mean across judges
+        rankings = comp_scoring.rankings(selected_comp)
+        if len(rankings):
+            st.markdown(f"#### Current Rankings for {selected_comp}")
+            st.dataframe(rankings.drop(columns=["submission_id"]), hide_index=True)
+
+        # Display feedback
+        comp_feedback = comp_scoring.board(selected_comp).feedback
+        if comp_feedback:
+            st.markdown(f"#### Feedback for {selected_comp}")
+            titles = dict(zip(rankings['submission_id'], rankings['title']))
+            for fb in comp_feedback:
+                st.markdown(f"- **{fb['judge']}** on *{titles.get(fb['submission'], fb['submission'])}*: {fb['feedback']}")
+    else:
+        st.info("No competitions to score yet.")
+
+    # Balanced review assignments: each submission goes to the least loaded judges
+    # who know its field, have capacity left and no conflict of interest
+    st.markdown("#### ⚖️ Judge Assignments")
+    with st.form("judge_roster_form"):
+        judge_name = st.text_input("Judge name (as used when scoring)", key="judge_name")
+        judge_email = st.text_input("Judge email (optional)", key="judge_email")
+        judge_fields = st.multiselect("Fields of expertise", fields, key="judge_fields")
+        judge_capacity = st.number_input("Most reviews to take on", min_value=1, value=DEFAULT_CAPACITY, key="judge_capacity")
+        judge_conflicts = st.text_input("Conflicts of interest (student names or emails, comma-separated)", key="judge_conflicts")
+        if st.form_submit_button("Save Judge"):
+            if judge_name:
+                judges.set_judge(judge_name, email=judge_email or None, fields=judge_fields, capacity=int(judge_capacity),
+                                 conflicts=[c.strip() for c in judge_conflicts.split(",") if c.strip()])
+                st.success(f"Judge '{judge_name}' saved; assignments rebalanced.")
+            else:
+                st.error("Please enter the judge's name.")
+
+    judge_loads = judges.loads()
+    if judge_loads:
+        st.dataframe(judge_loads, hide_index=True)
+        queue_judge = st.selectbox("Review queue for", [row['judge'] for row in judge_loads], key="queue_judge")
+        queue = judges.assignments(queue_judge)
+        done = 0
+        for comp_title, sid, info in queue:
+            scored = get_mentor_scoring(partition_of(comp_title)).board(comp_title).has_score(sid, queue_judge)
+            done += scored
+            st.markdown(f"- {'✅' if scored else '⏳'} *{info['title']}* by {info['submitter']} ({comp_title})")
+        st.caption(f"{done} of {len(queue)} assigned reviews done.")
+        if st.button(f"Remove {queue_judge} from the roster", key="remove_judge"):
+            judges.remove_judge(queue_judge)
+            st.success(f"{queue_judge}'s reviews were reassigned.")
+        # Submissions made before the roster existed (or in this session only) are not queued yet
+        if st.button("Assign earlier submissions", key="assign_backlog"):
+            for comp_title, comp_subs in st.session_state.competition_submissions.items():
+                for s in comp_subs:
+                    judges.assign(comp_title, submission_id(s), s['title'], s.get('submitter_name') or s.get('submitter'),
+                                  s.get('submitter_email'), competition_field(comp_title))
+            st.success("Earlier submissions assigned.")
+    else:
+        st.info(f"Add judges to share out reviews ({judges.assigner.reviews} per submission).")
+
+    # Near-duplicate descriptions found by MinHash/LSH at submission time
+    duplicate_flags = store.duplicate_flags(last=20)
+    if duplicate_flags:
+        st.markdown("#### 🔍 Possible Duplicates")
+        for flag in reversed(duplicate_flags):
+            doc, other = flag['document'], flag['duplicate_of']
+            st.markdown(
+                f"- *{doc['title']}* ({doc['kind']} by {doc['owner']}, {doc['where']}) looks like "
+                f"*{other['title']}* ({other['kind']} by {other['owner']}, {other['where']}): "
+                f"{flag['similarity']:.0%} similar"
+            )
+
+    # Flagged by the vote sketches (last hour of votes per voter, session and target)
+    vote_flags = store.vote_flags(last=20)
+    if vote_flags:
+        st.markdown("#### 🚩 Suspicious Voting")
+        for flag in reversed(vote_flags):
+            st.markdown(f"- {flag['flagged_at'][:16].replace('T', ' ')} **{flag['reason']}**: {flag['key']} "
+                        f"({flag['value']} in the last hour, limit {flag['limit']}) — votes for {flag['target']}")
 
 # =======================
 # Tab 3: Portfolio Export
 # =======================
 with tab3:
     st.markdown("### Export Your Portfolio as PDF")
-    student_email = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()) if 'student_accounts' in st.session_state else [], key="export_email")
+    student_email = account_picker("Select your account", "export_email", st.session_state.get('student_accounts', {}))
     if student_email in st.session_state.portfolios:
         projects = st.session_state.portfolios[student_email]
 
+        # Built on request and kept in the session's cache slot until the projects change
+        pdf_key = content_key("portfolio_pdf", student_email, [(p['title'], p.get('field'), p['description']) for p in projects])
         if st.button("Download Portfolio PDF"):
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(0, 10, f"{st.session_state.student_accounts[student_email]['name']}'s Portfolio", ln=True, align="C")
-            pdf.set_font("Arial", "", 12)
-            for proj in projects:
-                pdf.ln(5)
-                pdf.multi_cell(0, 10, f"Title: {proj['title']}\nField: {proj.get('field','N/A')}\nDescription: {proj['description']}")
-            pdf_buffer = io.BytesIO()
-            pdf.output(pdf_buffer)
-            pdf_buffer.seek(0)
-            st.download_button("Download PDF", data=pdf_buffer, file_name="portfolio.pdf", mime="application/pdf")
+            pdf_bytes = portfolio_pdf(st.session_state.student_accounts[student_email]['name'], projects)
+            object_cache.put(st.session_state.guest_id, pdf_key, pdf_bytes)
+        pdf_bytes = object_cache.get(st.session_state.guest_id, pdf_key)
+        if pdf_bytes:
+            st.download_button("Download PDF", data=pdf_bytes, file_name="portfolio.pdf", mime="application/pdf")
     else:
         st.info("No projects found for this student.")
 
@@ -870,8 +1335,102 @@ with tab3:
 # =======================
 with tab4:
     st.markdown("### Integration / Notifications")
-    st.info("Integration with Slack, Discord, or Teams can be added via webhooks. This is a placeholder for future implementation.")
-    st.text("Example: Send notification to a Slack channel when a competition receives a new submission.")
+    st.markdown("Send a Slack, Discord or Teams message when a competition receives a new submission, becomes active, or announces a winner.")
+
+    with st.form("webhook_form"):
+        webhook_url = st.text_input("Webhook URL")
+        webhook_kind = st.selectbox("Service", WEBHOOK_KINDS)
+        webhook_events = st.multiselect("Events", WEBHOOK_EVENTS, default=WEBHOOK_EVENTS)
+        add_webhook = st.form_submit_button("Add Webhook")
+
+        if add_webhook:
+            if webhook_url.startswith(("http://", "https://")):
+                store.add_webhook({"url": webhook_url, "kind": webhook_kind, "events": webhook_events})
+                st.success(f"Webhook added for {webhook_kind}.")
+            else:
+                st.error("Please enter a valid http(s) webhook URL.")
+
+    webhook_endpoints = store.webhooks()
+    if webhook_endpoints:
+        st.markdown("#### Configured Webhooks")
+        for endpoint in webhook_endpoints:
+            st.markdown(f"- **{endpoint['kind']}** {endpoint['url']} ({', '.join(endpoint['events']) or 'all events'})")
+            if st.button(f"Remove {endpoint['url']}", key=f"remove_webhook_{endpoint['url']}"):
+                store.remove_webhook(endpoint['url'])
+                st.success("Webhook removed.")
+    else:
+        st.info("No webhooks configured yet.")
+
+    # Delivery stats for this server process
+    webhook_stats = webhooks.stats()
+    cols = st.columns(5)
+    cols[0].metric("Sent", webhook_stats['sent'])
+    cols[1].metric("Pending", webhook_stats['pending'] + webhook_stats['backlog'])
+    cols[2].metric("Retries", webhook_stats['retries'])
+    cols[3].metric("Failed", webhook_stats['failed'])
+    cols[4].metric("Dropped", webhook_stats['dropped'])
+
+    dead_letters = webhooks.dead_letters(last=5)
+    if dead_letters:
+        st.markdown("#### Recent Failed Deliveries")
+        for record in reversed(dead_letters):
+            st.markdown(f"- {record['failed_at']} {record['endpoint'] or 'queue'}: {record['reason']} ({len(record['events'])} events)")
+
+    # Served by a separate process (fusionx/api.py), so polling it never starts a session
+    st.markdown("#### JSON API")
+    st.markdown("Dashboards can poll competitions, leaderboards, public portfolios and weekly winners as JSON from the "
+                "read-only API (`uvicorn --factory fusionx.api:create_app`), e.g. `/api/competitions?status=active`. "
+                "Send `If-None-Match` with the last `ETag` to get a `304 Not Modified` while nothing has changed.")
+
+    # Change-data-capture export of all events (FUSIONX_CDC_FORMAT)
+    if cdc:
+        st.markdown("#### Event Export")
+        cdc_stats = cdc.stats()
+        cols = st.columns(4)
+        cols[0].metric("Events Written", cdc_stats['written'])
+        cols[1].metric("Segments", cdc_stats['segments'])
+        cols[2].metric("Backlog", cdc_stats['backlog'])
+        cols[3].metric("Dropped", cdc_stats['dropped'])
+        st.caption(f"{cdc.fmt.upper()} segments in {cdc.out_dir}")
+
+    # Server-wide cache for generated PDFs and avatars (FUSIONX_CACHE_MB / FUSIONX_SESSION_CACHE_MB)
+    st.markdown("#### Object Cache")
+    cache_stats = object_cache.stats()
+    cols = st.columns(5)
+    cols[0].metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    cols[1].metric("In Memory", f"{cache_stats['memory_bytes'] / 1024 / 1024:.1f} MB")
+    cols[2].metric("On Disk", f"{cache_stats['disk_bytes'] / 1024 / 1024:.1f} MB")
+    cols[3].metric("Entries", cache_stats['entries'])
+    cols[4].metric("Evictions", cache_stats['evictions'])
+
+    # Boot warm-up of the read models; the /readyz side-car reports the same status
+    st.markdown("#### Warm-up")
+    warmup_status = warmup.status()
+    cols = st.columns(4)
+    cols[0].metric("State", warmup_status['state'].title())
+    cols[1].metric("Read Models Warmed", f"{len(warmup_status['tasks'])}/{len(warmup.tasks)}")
+    cols[2].metric("Warm-up Time", f"{warmup_status['seconds']} s" if warmup_status['seconds'] is not None else "—")
+    cols[3].metric("Steady p99", f"{warmup_status['p99_ms'][-1]:.1f} ms" if warmup_status['p99_ms'] else "—")
+    if warmup_status['failed']:
+        st.caption("Built on first use instead: " + ", ".join(warmup_status['failed']))
+
+    # Background upload checks (type sniffing, ZIP listing, size limits)
+    st.markdown("#### Upload Inspection")
+    upload_stats = uploads.stats()
+    cols = st.columns(4)
+    cols[0].metric("Files Inspected", upload_stats['checked'])
+    cols[1].metric("Rejected", upload_stats['rejected'])
+    cols[2].metric("Re-uploads Skipped", upload_stats['reused'])
+    cols[3].metric("Bytes Scanned", f"{upload_stats['bytes'] / 1024 / 1024:.1f} MB")
+
+    # Cold tier for closed competitions (FUSIONX_ARCHIVE_AFTER_DAYS)
+    st.markdown("#### Competition Archive")
+    archive_stats = archive.stats()
+    cols = st.columns(4)
+    cols[0].metric("Archived Competitions", len(archive.titles()) + len(global_archive.titles()))
+    cols[1].metric("Segments Written", archive_stats['segments'])
+    cols[2].metric("Opened", archive_stats['loads'])
+    cols[3].metric("Loaded in Memory", archive_stats['in_memory'])
 
 # =======================
 # Tab 5: Gamified Challenges
@@ -896,75 +1455,64 @@ with tab5:
 st.markdown("---")
 st.subheader("Notifications & Engagement")
 
-# Initialize notifications & XP
-if 'notifications' not in st.session_state:
-    st.session_state.notifications = {}  # {email: [messages]}
+# Notifications live in the shared store; XP in the XP ledger
 if 'student_accounts' not in st.session_state:
     st.session_state.student_accounts = {}  # Ensure accounts exist
-if 'xp_points' not in st.session_state:
-    st.session_state.xp_points = {}  # {email: XP}
 
 # --- Helper Functions ---
-def add_notification(email, message):
-    if email not in st.session_state.notifications:
-        st.session_state.notifications[email] = []
-    st.session_state.notifications[email].append(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {message}")
-
-def add_xp(email, points):
-    if email not in st.session_state.xp_points:
-        st.session_state.xp_points[email] = 0
-    st.session_state.xp_points[email] += points
-    # Update in account profile if exists
-    if email in st.session_state.student_accounts:
-        st.session_state.student_accounts[email]['xp'] = st.session_state.xp_points[email]
+# XP windows: (start, end) dates, None = open
+def xp_window(choice):
+    today = datetime.date.today()
+    if choice == "This Week":
+        return today - datetime.timedelta(days=today.weekday()), today
+    if choice == "This Month":
+        return today.replace(day=1), today
+    if choice == "Last 30 Days":
+        return today - datetime.timedelta(days=29), today
+    return None, None
 
 # =======================
 # Example Triggers
 # =======================
-# 1. Portfolio Vote
-if 'portfolio_votes' in st.session_state:
-    for email, votes in st.session_state.portfolio_votes.items():
-        # Add notification and XP
-        add_notification(email, f"Your portfolio has {votes} votes.")
-        add_xp(email, votes)  # 1 XP per vote
-
-# 2. New Submission
-if 'competition_submissions' in st.session_state:
-    for comp_title, submissions in st.session_state.competition_submissions.items():
-        for submission in submissions:
-            submitter_email = submission.get("submitter_email")
-            add_notification(submitter_email, f"You submitted '{submission['title']}' to '{comp_title}'.")
-            add_xp(submitter_email, 5)  # 5 XP for submission
-
-# 3. Competition Join
-if 'participants' in st.session_state:
-    for comp_title, users in st.session_state.participants.items():
-        for user in users:
-            # Find email from name
-            email = None
-            for e, account in st.session_state.student_accounts.items():
-                if account['name'] == user:
-                    email = e
-            if email:
-                add_notification(email, f"You joined the competition '{comp_title}'.")
-                add_xp(email, 2)  # 2 XP for joining competition
+# XP and notifications for votes, submissions and joins are recorded once, when
+# the event happens (get_xp_ledger, get_notifier)
 
 # =======================
 # Display Notifications & XP
 # =======================
 st.markdown("### Your Notifications & XP")
 if 'student_accounts' in st.session_state and st.session_state.student_accounts:
-    selected_email = st.selectbox("Select your account to view notifications", list(st.session_state.student_accounts.keys()), key="notif_email")
-    
-    st.markdown(f"**XP Points:** {st.session_state.xp_points.get(selected_email, 0)}")
+    selected_email = account_picker("Select your account to view notifications", "notif_email", st.session_state.student_accounts)
+    if selected_email:
+
+        week_start_day, today = xp_window("This Week")
+        st.session_state.student_accounts[selected_email]['xp'] = xp_ledger.total(selected_email)
+        st.markdown(f"**XP Points:** {st.session_state.student_accounts[selected_email]['xp']} "
+                    f"({xp_ledger.total(selected_email, week_start_day, today)} this week)")
     
-    user_notifications = st.session_state.notifications.get(selected_email, [])
-    if user_notifications:
-        st.markdown("**Recent Notifications:**")
-        for msg in reversed(user_notifications[-10:]):  # Show last 10 notifications
-            st.markdown(f"- {msg}")
-    else:
-        st.info("No notifications yet.")
+        user_notifications = store.notifications(selected_email, last=10)
+        if user_notifications:
+            st.markdown("**Recent Notifications:**")
+            for msg in reversed(user_notifications):  # Show last 10 notifications
+                st.markdown(f"- {msg}")
+        else:
+            st.info("No notifications yet.")
+
+# --- XP Leaderboard for any window ---
+st.markdown("### XP Leaderboard")
+xp_period = st.selectbox("Period", ["This Week", "This Month", "Last 30 Days", "All Time", "Custom Range"], key="xp_period")
+if xp_period == "Custom Range":
+    xp_range = st.date_input("From / To", value=(datetime.date.today().replace(day=1), datetime.date.today()), key="xp_range")
+    xp_start, xp_end = xp_range if len(xp_range) == 2 else (xp_range[0], xp_range[0])
+else:
+    xp_start, xp_end = xp_window(xp_period)
+xp_leaders = xp_ledger.leaderboard(xp_start, xp_end, k=10)
+if xp_leaders:
+    for rank, (email, points) in enumerate(xp_leaders, start=1):
+        name = st.session_state.student_accounts.get(email, {}).get('name', email)
+        st.markdown(f"**{rank}. {name}** — {points} XP")
+else:
+    st.info("No XP earned in this period.")
 # -----------------------------
 # Add-On: Enhanced Portfolio System
 # -----------------------------
@@ -973,7 +1521,7 @@ st.subheader("Enhanced Portfolio System")
 
 # Initialize portfolio data structures if not exist
 if 'portfolios' not in st.session_state:
-    st.session_state.portfolios = {}  # {email: [{"title":..., "field":..., "description":..., "versions":[...], "verified":False, "votes":0, "comments":[]}]}
+    st.session_state.portfolios = {}  # {email: [{"id":..., "title":..., "field":..., "description":..., "versions":[...], "verified":False, "votes":0, "comment_count":0}]}
 
 if 'portfolio_votes' not in st.session_state:
     st.session_state.portfolio_votes = {}  # {email: total_votes}
@@ -981,45 +1529,54 @@ if 'portfolio_votes' not in st.session_state:
 # --- Submit or Update Portfolio Project ---
 st.markdown("### Submit or Update a Portfolio Project")
 if 'student_accounts' in st.session_state and st.session_state.student_accounts:
-    student_email = st.selectbox("Select your account", list(st.session_state.student_accounts.keys()), key="portfolio_email")
-    student_name = st.session_state.student_accounts[student_email]['name']
-
-    with st.form("portfolio_submission_form"):
-        proj_title = st.text_input("Project Title")
-        proj_desc = st.text_area("Project Description")
-        proj_field = st.selectbox("Field", ["AI","Robotics","Design","Science","Math","Business","Art","Other"])
-        submit_portfolio = st.form_submit_button("Submit / Update Project")
-
-        if submit_portfolio:
-            if proj_title and proj_desc:
-                # Initialize student's portfolio if needed
-                if student_email not in st.session_state.portfolios:
-                    st.session_state.portfolios[student_email] = []
-
-                # Check if project exists for versioning
-                existing_proj = None
-                for p in st.session_state.portfolios[student_email]:
-                    if p['title'] == proj_title:
-                        existing_proj = p
-                        break
-
-                if existing_proj:
-                    # Add new version
-                    existing_proj['versions'].append({"description": proj_desc, "field": proj_field, "timestamp": datetime.datetime.now()})
-                    st.success(f"Project '{proj_title}' updated with a new version.")
-                else:
-                    # Create new project
-                    new_proj = {
-                        "title": proj_title,
-                        "field": proj_field,
-                        "description": proj_desc,
-                        "versions": [{"description": proj_desc, "field": proj_field, "timestamp": datetime.datetime.now()}],
-                        "verified": False,
-                        "votes": 0,
-                        "comments": []
-                    }
-                    st.session_state.portfolios[student_email].append(new_proj)
-                    st.success(f"Project '{proj_title}' submitted.")
+    student_email = account_picker("Select your account", "portfolio_email", st.session_state.student_accounts)
+    if student_email:
+        student_name = st.session_state.student_accounts[student_email]['name']
+
+        with st.form("portfolio_submission_form"):
+            proj_title = st.text_input("Project Title")
+            proj_desc = st.text_area("Project Description")
+            proj_field = st.selectbox("Field", ["AI","Robotics","Design","Science","Math","Business","Art","Other"])
+            submit_portfolio = st.form_submit_button("Submit / Update Project")
+
+            if submit_portfolio:
+                if proj_title and proj_desc:
+                    # Initialize student's portfolio if needed
+                    if student_email not in st.session_state.portfolios:
+                        st.session_state.portfolios[student_email] = []
+
+                    # Check if project exists for versioning
+                    existing_proj = None
+                    for p in st.session_state.portfolios[student_email]:
+                        if p['title'] == proj_title:
+                            existing_proj = p
+                            break
+
+                    if existing_proj:
+                        # Add new version
+                        existing_proj['versions'].append({"description": proj_desc, "field": proj_field, "timestamp": datetime.datetime.now()})
+                        events.publish(ev.PROJECT_SAVED, email=student_email, title=proj_title, field=proj_field,
+                                       version=len(existing_proj['versions']))
+                        duplicates.check(f"project:{project_id(student_email, existing_proj)}", proj_desc,
+                                         {"kind": "portfolio project", "title": proj_title, "owner": student_email, "where": "Portfolio"})
+                        st.success(f"Project '{proj_title}' updated with a new version.")
+                    else:
+                        # Create new project
+                        new_proj = {
+                            "id": uuid.uuid4().hex,
+                            "title": proj_title,
+                            "field": proj_field,
+                            "description": proj_desc,
+                            "versions": [{"description": proj_desc, "field": proj_field, "timestamp": datetime.datetime.now()}],
+                            "verified": False,
+                            "votes": 0,
+                            "comment_count": 0  # comments live in the shared store
+                        }
+                        st.session_state.portfolios[student_email].append(new_proj)
+                        events.publish(ev.PROJECT_SAVED, email=student_email, title=proj_title, field=proj_field, version=1)
+                        duplicates.check(f"project:{new_proj['id']}", proj_desc,
+                                         {"kind": "portfolio project", "title": proj_title, "owner": student_email, "where": "Portfolio"})
+                        st.success(f"Project '{proj_title}' submitted.")
 
 # --- Mentor Verification ---
 st.markdown("### Mentor / Judge Verification")
@@ -1027,7 +1584,7 @@ mentor_email = st.text_input("Mentor Email (for verification purposes)")
 if st.button("Verify a Project"):
     if mentor_email and 'student_accounts' in st.session_state:
         # Select student and project
-        verify_student_email = st.selectbox("Select student", list(st.session_state.student_accounts.keys()), key="verify_student")
+        verify_student_email = account_picker("Select student", "verify_student", st.session_state.student_accounts)
         if verify_student_email in st.session_state.portfolios:
             proj_titles = [p['title'] for p in st.session_state.portfolios[verify_student_email]]
             selected_proj_title = st.selectbox("Select project to verify", proj_titles, key="verify_proj")
@@ -1035,43 +1592,25 @@ if st.button("Verify a Project"):
             for p in st.session_state.portfolios[verify_student_email]:
                 if p['title'] == selected_proj_title:
                     p['verified'] = True
+                    events.publish(ev.PROJECT_VERIFIED, email=verify_student_email, title=selected_proj_title, mentor=mentor_email)
                     st.success(f"Project '{selected_proj_title}' verified by mentor {mentor_email}!")
 
 # --- Portfolio Voting & Comments ---
 st.markdown("### Portfolio Voting & Feedback")
 
+# Most voted and commented projects lately
+trending_projects = trending.top("projects", 5)
+if trending_projects:
+    st.markdown("#### 🔥 Trending this week")
+    for _, score, info in trending_projects:
+        owner = st.session_state.student_accounts.get(info['email'], {}).get('name', info['email'])
+        st.markdown(f"- **{info['title']}** by {owner} (🔥 {score:.1f})")
+
 if 'student_accounts' in st.session_state and 'portfolios' in st.session_state:
     for email, projects in st.session_state.portfolios.items():
-        student_name = st.session_state.student_accounts.get(email, {}).get('name', 'Unknown')
         for proj in projects:  # <-- Make sure this loop exists
-            st.markdown(f"**{proj['title']}** by {student_name} ({proj['field']})")
-            st.markdown(f"{proj['description']}")
-            
-            if proj.get('verified'):
-                st.markdown("✅ Verified")
-            
-            # Voting
-            vote = st.radio(f"Vote for {proj['title']}", ["No", "Yes"], key=f"vote_{email}_{proj['title']}")
-            if st.button(f"Submit Vote for {proj['title']}", key=f"vote_btn_{email}_{proj['title']}"):
-                if vote == "Yes":
-                    proj['votes'] += 1
-                    st.success(f"You voted for {proj['title']}")
-                    # Increment total portfolio votes for account
-                    if email not in st.session_state.portfolio_votes:
-                        st.session_state.portfolio_votes[email] = 0
-                    st.session_state.portfolio_votes[email] += 1
-
-            # Commenting
-            comment_text = st.text_input(f"Leave a comment for {proj['title']}", key=f"comment_{email}_{proj['title']}")
-            if st.button(f"Submit Comment for {proj['title']}", key=f"comment_btn_{email}_{proj['title']}"):
-                if comment_text:
-                    if 'comments' not in proj:
-                        proj['comments'] = []
-                    proj['comments'].append(comment_text)
-                    st.success("Comment submitted.")
-
-            # Average votes
-            st.markdown(f"⭐ Votes: {proj.get('votes',0)}")
+            # Each card is a fragment: a vote or comment reruns only that card
+            portfolio_card(store, events, email, proj['title'])
 # -----------------------------
 # Add-On: Portfolio Badges Display
 # -----------------------------
@@ -1099,48 +1638,38 @@ for email, projects in st.session_state.portfolios.items():
 
         # Example: verified project badge
         for proj in projects:
-            if proj.get('verified') and "Verified Project" not in account['badges']:
-                account['badges'].append(f"✅ Verified Project: {proj['title']}")
-
-            # Example: top 3 competition badge (assumes st.session_state.competition_votes exists)
-            if 'competition_votes' in st.session_state:
-                for comp_title, votes_list in st.session_state.competition_votes.items():
-                    # Check if this student is top 3
-                    sorted_votes = sorted(votes_list, key=lambda x: x['votes'], reverse=True)[:3]
-                    for i, winner in enumerate(sorted_votes):
-                        if winner['email'] == email:
-                            badge_name = f"🏆 Top {i+1} in {comp_title}"
-                            if badge_name not in account['badges']:
-                                account['badges'].append(badge_name)
+            if proj.get('verified') and not has_badge(account, f"✅ Verified Project: {proj['title']}"):
+                grant_badge(email, account, f"✅ Verified Project: {proj['title']}")
+
+            # Top 3 competition badges are awarded once when a competition closes
+            # (merged into the account in "Automatic Badges & Vote Tracking")
 
 # --- Display portfolios with badges ---
 if st.session_state.student_accounts:
-    selected_email = st.selectbox("Select a student to view portfolio and badges", list(st.session_state.student_accounts.keys()))
-    account = st.session_state.student_accounts[selected_email]
-    st.markdown(f"### {account['name']}'s Portfolio & Badges")
-
-    # Display badges earned
-    if 'badges' in account and account['badges']:
-        st.markdown("**Badges / Achievements:**")
-        for b in account['badges']:
-            st.markdown(f"- {b}")
-    else:
-        st.markdown("No badges earned yet.")
-
-    # Display portfolio projects
-    if selected_email in st.session_state.portfolios:
-        for proj in st.session_state.portfolios[selected_email]:
-            st.markdown(f"**{proj['title']}** ({proj.get('field','No field')})")
-            st.markdown(f"{proj['description']}")
-            if proj.get('verified'):
-                st.markdown("✅ Verified")
-            # Show comments if exist
-            if proj.get('comments'):
-                st.markdown("**Comments:**")
-                for c in proj['comments']:
-                    st.markdown(f"- {c}")
-            # Show votes
-            st.markdown(f"⭐ Votes: {proj.get('votes',0)}")
+    selected_email = account_picker("Select a student to view portfolio and badges", "badges_email", st.session_state.student_accounts)
+    if selected_email:
+        account = st.session_state.student_accounts[selected_email]
+        st.markdown(f"### {account['name']}'s Portfolio & Badges")
+
+        # Display badges earned
+        if 'badges' in account and account['badges']:
+            st.markdown("**Badges / Achievements:**")
+            for b in account['badges']:
+                st.markdown(f"- {badge_label(b)}")
+        else:
+            st.markdown("No badges earned yet.")
+
+        # Display portfolio projects
+        if selected_email in st.session_state.portfolios:
+            for proj in st.session_state.portfolios[selected_email]:
+                st.markdown(f"**{proj['title']}** ({proj.get('field','No field')})")
+                st.markdown(f"{proj['description']}")
+                if proj.get('verified'):
+                    st.markdown("✅ Verified")
+                # Show comment count and the latest comments
+                comment_summary(store, selected_email, proj)
+                # Show votes
+                st.markdown(f"⭐ Votes: {proj.get('votes',0)}")
 # -----------------------------
 # Add-On: Enhanced Badges with Date, Icons & Filtering
 # -----------------------------
@@ -1153,6 +1682,16 @@ import datetime
 for email, account in st.session_state.student_accounts.items():
     if 'badges' not in account:
         account['badges'] = []  # Each badge will now be a dict with name, date, icon, activity_type
+    # Upgrade plain-string badges from the earlier add-ons to dicts
+    account['badges'] = [
+        b if isinstance(b, dict) else {
+            "name": b,
+            "date_awarded": datetime.datetime.now().strftime("%Y-%m-%d"),
+            "icon": "",
+            "activity": "Achievement"
+        }
+        for b in account['badges']
+    ]
 
 # --- Example badge icons ---
 badge_icons = {
@@ -1172,29 +1711,15 @@ for email, projects in st.session_state.portfolios.items():
         # Verified projects
         for proj in projects:
             badge_name = f"Verified: {proj['title']}"
-            if proj.get('verified') and not any(b['name'] == badge_name for b in account['badges']):
-                account['badges'].append({
+            if proj.get('verified') and not has_badge(account, badge_name):
+                grant_badge(email, account, {
                     "name": badge_name,
                     "date_awarded": datetime.datetime.now().strftime("%Y-%m-%d"),
                     "icon": badge_icons.get("Verified Project","✅"),
                     "activity": "Verification"
                 })
 
-        # Top 3 competitions
-        if 'competition_votes' in st.session_state:
-            for comp_title, votes_list in st.session_state.competition_votes.items():
-                sorted_votes = sorted(votes_list, key=lambda x: x['votes'], reverse=True)[:3]
-                for i, winner in enumerate(sorted_votes):
-                    if winner['email'] == email:
-                        badge_name = f"Top {i+1} in {comp_title}"
-                        if not any(b['name'] == badge_name for b in account['badges']):
-                            icon_key = f"Top {i+1} in Competition"
-                            account['badges'].append({
-                                "name": badge_name,
-                                "date_awarded": datetime.datetime.now().strftime("%Y-%m-%d"),
-                                "icon": badge_icons.get(icon_key, "🏆"),
-                                "activity": "Competition"
-                            })
+        # Top 3 competitions: awarded by the lifecycle scheduler, already on the account
 
 # --- Filter Portfolios by Badge ---
 st.markdown("### Filter Portfolios by Badge")
@@ -1230,10 +1755,7 @@ for email, projects in st.session_state.portfolios.items():
         st.markdown(f"{proj['description']}")
         if proj.get('verified'):
             st.markdown("✅ Verified")
-        if proj.get('comments'):
-            st.markdown("**Comments:**")
-            for c in proj['comments']:
-                st.markdown(f"- {c}")
+        comment_summary(store, email, proj)
         st.markdown(f"⭐ Votes: {proj.get('votes',0)}")
 # -----------------------------
 # Add-On: Weekly Newsletter Tab
@@ -1249,26 +1771,40 @@ with tab3:
     st.markdown("### Weekly Competition Winners & Featured Projects")
 
     import io
+    import pandas as pd
     from fpdf import FPDF
 
+    # One precomputed week row from the weekly rollups
+    newsletter_weeks = rollups.weeks()
+    if week_key() not in newsletter_weeks:
+        newsletter_weeks.insert(0, week_key())
+    newsletter_week = st.selectbox("Week", newsletter_weeks, key="newsletter_week")
+    week = rollups.week(newsletter_week)
+    st.caption(f"Week of {week['starts']:%B %d, %Y}")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Submissions", week['totals']['submissions'])
+    col2.metric("Votes", week['totals']['votes'])
+    col3.metric("Competition Joins", week['totals']['joins'])
+    col4.metric("XP Earned", week['totals']['xp'])
+
     # Prepare newsletter content
     newsletter_content = []
 
-    if 'competition_votes' in st.session_state and st.session_state.competition_votes:
-        for comp_title, votes_list in st.session_state.competition_votes.items():
+    # Winners of competitions that closed this week
+    if week['closed']:
+        for closed in week['closed']:
+            comp_title = closed['competition']
             # Top 3 winners
-            sorted_votes = sorted(votes_list, key=lambda x: x['votes'], reverse=True)[:3]
-            if sorted_votes:
+            if closed['results']:
                 st.markdown(f"#### {comp_title}")
-                for i, winner in enumerate(sorted_votes):
+                for i, winner in enumerate(closed['results']):
                     email = winner['email']
-                    votes = winner['votes']
-                    student = st.session_state.student_accounts.get(email, {"name":"Unknown"})
-                    proj_title = "Unknown Project"
-                    if email in st.session_state.portfolios:
-                        proj_title = st.session_state.portfolios[email][0]['title']
+                    votes = round(winner['score'], 2)
+                    student = st.session_state.student_accounts.get(email, {"name": winner['name'] or "Unknown"})
+                    proj_title = winner['title'] or "Unknown Project"
                     rank = f"{i+1}{['st','nd','rd'][i] if i<3 else 'th'} Place"
-                    st.markdown(f"🏆 {rank}: {proj_title} by {student['name']} ({email}) | Votes: {votes}")
+                    st.markdown(f"🏆 {rank}: {proj_title} by {student['name']} ({email}) | Score: {votes}")
 
                     newsletter_content.append({
                         "competition": comp_title,
@@ -1279,17 +1815,43 @@ with tab3:
                         "votes": votes
                     })
     else:
-        st.info("No competition votes yet this week.")
+        st.info("No competition winners yet this week.")
+
+    # Most voted portfolio projects this week
+    if week['projects']:
+        st.markdown("#### Featured Projects")
+        for proj in week['projects']:
+            student = st.session_state.student_accounts.get(proj['email'], {"name": proj['email']})
+            st.markdown(f"⭐ {proj['title']} by {student['name']} | {proj['votes']} votes this week")
+            newsletter_content.append({
+                "competition": "Featured Projects",
+                "rank": "Featured",
+                "project": proj['title'],
+                "student_name": student['name'],
+                "email": proj['email'],
+                "votes": proj['votes']
+            })
+
+    # Activity by field and competition
+    if week['fields']:
+        st.markdown("#### Activity by Field")
+        st.dataframe(pd.DataFrame.from_dict(week['fields'], orient="index"))
+    if week['competitions']:
+        st.markdown("#### Activity by Competition")
+        st.dataframe(pd.DataFrame.from_dict(week['competitions'], orient="index")[["submissions", "joins"]])
 
     # --- Download PDF Button ---
     if newsletter_content:
         st.markdown("---")
         st.markdown("### Download Newsletter PDF")
+        pdf_key = content_key("newsletter_pdf", week['week'], newsletter_content)
         if st.button("Download Weekly Newsletter PDF"):
             pdf = FPDF()
             pdf.add_page()
             pdf.set_font("Arial", "B", 16)
             pdf.cell(0, 10, "FusionX Weekly Competition Newsletter", ln=True, align="C")
+            pdf.set_font("Arial", "", 11)
+            pdf.cell(0, 8, f"Week of {week['starts']:%B %d, %Y}", ln=True, align="C")
             pdf.set_font("Arial", "", 12)
             pdf.ln(5)
             for entry in newsletter_content:
@@ -1298,12 +1860,56 @@ with tab3:
                     f"Rank: {entry['rank']}\n"
                     f"Project: {entry['project']}\n"
                     f"Student: {entry['student_name']} ({entry['email']})\n"
-                    f"Votes: {entry['votes']}\n\n"
+                    f"{'Votes' if entry['rank'] == 'Featured' else 'Score'}: {entry['votes']}\n\n"
                 )
-            pdf_buffer = io.BytesIO()
-            pdf.output(pdf_buffer)
-            pdf_buffer.seek(0)
-            st.download_button("Download PDF", data=pdf_buffer, file_name="weekly_newsletter.pdf", mime="application/pdf")
+            object_cache.put(st.session_state.guest_id, pdf_key, pdf.output())
+        pdf_bytes = object_cache.get(st.session_state.guest_id, pdf_key)
+        if pdf_bytes:
+            st.download_button("Download PDF", data=pdf_bytes, file_name=f"weekly_newsletter_{week['week']}.pdf", mime="application/pdf")
+# -----------------------------
+# Add-On: Static Site Export
+# -----------------------------
+# Anonymous visitors can browse app/static/site/ (or a copy on any static file
+# server) without a rerun. Reruns hand over a snapshot at most every
+# FUSIONX_SITE_INTERVAL seconds; only pages whose data changed are rewritten.
+if site.due():
+    public_portfolios = {}
+    for email, projects in st.session_state.portfolios.items():
+        account = st.session_state.student_accounts.get(email)
+        if not account:
+            continue  # only portfolios linked to an account are published
+        public_portfolios[email] = {
+            "name": account['name'],
+            "fields": account.get('field', []),
+            "badges": [badge_label(b) for b in account.get('badges', [])],
+            "xp": xp_ledger.total(email),
+            "projects": [{
+                "title": proj['title'],
+                "field": proj.get('field'),
+                "description": proj['description'],
+                "versions": len(proj.get('versions', [])) or 1,
+                "votes": store.project_votes(email, proj['title']),
+                "comments": store.comment_count(project_id(email, proj))
+            } for proj in projects]
+        }
+    week_start_day, today = xp_window("This Week")
+    site_boards = {
+        "top3": top_3,
+        "trending": [(owner, round(score, 1)) for owner, score, _ in trending.top("portfolios", 10)],
+        "xp_week": xp_ledger.leaderboard(week_start_day, today, k=10)
+    }
+    listed = {email for board in site_boards.values() for email, _ in board}
+    site.submit({
+        "portfolios": public_portfolios,
+        "names": {email: st.session_state.student_accounts[email]['name'] for email in sorted(listed)
+                  if email in st.session_state.student_accounts},
+        "winners": {**archive.results(), **global_archive.results(), **st.session_state.competition_results},
+        **site_boards
+    })
+st.markdown("---")
+site_path = campus_dir("app/static/site", campus)
+st.markdown(f"🌐 [Browse portfolios, leaderboards and winners without signing in]({site_path}/index.html)")
+
 # -----------------------------
 # Add-On: Top Header Bar for Fusion Home Page
 # -----------------------------
@@ -0,0 +1,50 @@
+# benchmarks/bench_accounts.py
+# Account picker options per rerun: a selectbox of every account against the
+# prefix index's top matches, for a few typed prefixes, and adding one new
+# account to the index against rebuilding it.
+#
+#   python benchmarks/bench_accounts.py [--accounts 1000 10000 100000]
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.search import PrefixIndex  # noqa: E402
+from fusionx.widgets import PICKER_LIMIT  # noqa: E402
+
+QUERIES = ["", "s", "student 4", "student 4242", "fusion", "zzz"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.accounts:
+        accounts = {f"student{i}@fusion.edu": {"name": f"Student {i}"} for i in range(n)}
+        everything = [f"{a['name']} ({email})" for email, a in accounts.items()]
+        began = time.perf_counter()
+        index = PrefixIndex((email, [email, a["name"]]) for email, a in accounts.items())
+        built = time.perf_counter() - began
+        print(f"{n:,} accounts: index of {len(index):,} terms built in {built * 1000:.0f} ms; "
+              f"selectbox of all accounts sends {len(json.dumps(everything)) / 1e3:,.0f} kB per rerun")
+        accounts["new.student@fusion.edu"] = {"name": "New Student"}
+        began = time.perf_counter()
+        index.add("new.student@fusion.edu", ["new.student@fusion.edu", "New Student"])
+        print(f"  one new account added in {(time.perf_counter() - began) * 1000:.2f} ms instead of a rebuild")
+        for query in QUERIES:
+            began = time.perf_counter()
+            for _ in range(100):
+                emails = index.search(query, PICKER_LIMIT) if query else list(itertools.islice(accounts, PICKER_LIMIT))
+            elapsed = (time.perf_counter() - began) / 100
+            options = [f"{accounts[e]['name']} ({e})" for e in emails]
+            print(f"  {query!r:>16}: {len(options)} options, {len(json.dumps(options)) / 1e3:.1f} kB, {elapsed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_api.py
+# Cost of a polling client on the JSON API side-car: a full render of the
+# competitions list versus an unconditional GET of the cached response versus
+# a conditional GET answered with 304, for 2,000 competitions and 50k joins.
+#
+#   python benchmarks/bench_api.py [--competitions 2000] [--joins 50000]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.api import ApiApp  # noqa: E402
+from fusionx.state import MemoryBackend, SharedStore  # noqa: E402
+
+
+def timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"  {label}: {(time.perf_counter() - start) / repeat * 1e6:.1f} us")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--competitions", type=int, default=2000)
+    parser.add_argument("--joins", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    store = SharedStore(MemoryBackend())
+    for i in range(args.competitions):
+        store.add_competition({"title": f"Competition {i}", "description": "Build something useful " * 5,
+                               "threshold": rng.randint(2, 20), "field": rng.choice(["AI", "Math", "Art"])})
+    for _ in range(args.joins):
+        store.join(f"Competition {rng.randrange(args.competitions)}", f"student{rng.randrange(20_000)}@fusion.edu")
+
+    app = ApiApp(store, tempfile.mkdtemp(), ttl=3600)
+    query = "status=all&per_page=200"
+    gzip_headers = {"accept-encoding": "gzip"}
+
+    def render():
+        app._rendered.clear()
+        return app.respond("GET", "/api/competitions", query, gzip_headers)
+
+    status, headers, body = timed("full render (cache miss)", render, repeat=20)
+    etag = dict(headers)["etag"]
+    print(f"  page of 200: {len(app.render('/api/competitions', query).body):,} bytes, {len(body):,} gzipped")
+    timed("200 from cache", lambda: app.respond("GET", "/api/competitions", query, gzip_headers), repeat=10_000)
+    status, _, _ = timed("304 conditional GET", lambda: app.respond(
+        "GET", "/api/competitions", query, {**gzip_headers, "if-none-match": etag}), repeat=10_000)
+    assert status == 304
+
+    store.join("Competition 0", "new@fusion.edu")  # bumps the version, so the next request re-renders
+    status, headers, _ = app.respond("GET", "/api/competitions", query, {**gzip_headers, "if-none-match": etag})
+    print(f"after a join: {status}, etag {'changed' if dict(headers)['etag'] != etag else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
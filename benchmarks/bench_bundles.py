@@ -0,0 +1,84 @@
+# benchmarks/bench_bundles.py
+# Bundle a competition's uploads into one ZIP and check that the server's
+# peak RSS does not grow with the bundle size. Uploads are random bytes
+# written to a temporary blob store in chunks, so generating them does not
+# inflate RSS either.
+#
+#   python benchmarks/bench_bundles.py [--size-mb 1024] [--files 200]
+#   python benchmarks/bench_bundles.py --size-mb 5120   # the 5 GB case
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.blobs import BlobStore  # noqa: E402
+from fusionx.bundles import BundleExporter  # noqa: E402
+
+
+class RandomFile:
+    # File-like object producing `size` random bytes without holding them
+    def __init__(self, size, seed):
+        self.remaining = size
+        self.block = os.urandom(1024 * 1024 - seed % 997)
+
+    def read(self, n=-1):
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        self.remaining -= n
+        return (self.block * (n // len(self.block) + 1))[:n]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        blobs = BlobStore(os.path.join(tmp, "blobs"))
+        exporter = BundleExporter(blobs, os.path.join(tmp, "bundles"))
+        per_file = args.size_mb * 1024 * 1024 // args.files
+
+        start = time.perf_counter()
+        submissions = []
+        for i in range(args.files):
+            ref = blobs.put(RandomFile(per_file, i))
+            submissions.append({
+                "id": f"sub-{i}", "title": f"Project {i}", "submitter": f"Student {i}",
+                "description": "benchmark", "file": f"project-{i}.pdf", "file_ref": ref, "file_size": per_file
+            })
+        print(f"stored {args.files} uploads ({args.size_mb} MB) in {time.perf_counter() - start:.1f}s")
+
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        path = exporter.bundle("Benchmark Cup", submissions)
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"bundle: {size_mb:.0f} MB in {elapsed:.1f}s ({size_mb / elapsed:.0f} MB/s)")
+        print(f"peak RSS: {rss_before:.0f} MB before, {peak_rss_mb():.0f} MB after")
+
+        start = time.perf_counter()
+        assert exporter.bundle("Benchmark Cup", submissions) == path
+        print(f"cached bundle lookup: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        submissions.pop()
+        start = time.perf_counter()
+        new_path = exporter.bundle("Benchmark Cup", submissions)
+        print(f"rebuild after a deletion: {time.perf_counter() - start:.1f}s (previous bundle kept for open links: {os.path.exists(path)})")
+
+        with zipfile.ZipFile(new_path) as zf:
+            names = zf.namelist()
+            assert len(names) == args.files - 1 + 2  # files + manifest.json + manifest.csv
+
+
+if __name__ == "__main__":
+    main()
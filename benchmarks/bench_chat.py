@@ -0,0 +1,78 @@
+# benchmarks/bench_chat.py
+# Fan-out latency of the chat broker: 500 sessions subscribed to one room,
+# each on its own thread waiting on its queue, while messages are posted at
+# 20/s. A few sessions never drain and must be dropped without slowing
+# delivery to the others.
+#
+#   python benchmarks/bench_chat.py [--subscribers 500] [--messages 200] [--rate 20]
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.pubsub import ChatBroker  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=5, help="subscribers that never drain")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=20.0, help="messages per second")
+    args = parser.parse_args()
+
+    broker = ChatBroker(queue_size=50)
+    latencies = []
+    received = [0] * args.subscribers
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def consume(i):
+        subscription = broker.subscribe("AI", f"session-{i}")
+        while not done.is_set():
+            for msg in subscription.get(timeout=0.2):
+                latency = time.perf_counter() - msg["sent"]
+                received[i] += 1
+                with lock:
+                    latencies.append(latency)
+
+    threads = [threading.Thread(target=consume, args=(i,), daemon=True) for i in range(args.subscribers)]
+    for t in threads:
+        t.start()
+    for i in range(args.slow):
+        broker.subscribe("AI", f"slow-{i}")  # never drained
+    while broker.subscribers("AI") < args.subscribers + args.slow:
+        time.sleep(0.01)
+
+    publish_times = []
+    for n in range(args.messages):
+        start = time.perf_counter()
+        broker.publish("AI", {"index": n, "user": "bench", "message": f"message {n}",
+                              "timestamp": datetime.datetime.now(), "sent": start})
+        publish_times.append(time.perf_counter() - start)
+        time.sleep(max(0.0, 1 / args.rate - publish_times[-1]))
+    time.sleep(0.5)
+    done.set()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    stats = broker.stats()
+    print(f"{args.subscribers} subscribers (+{args.slow} that never drain), {args.messages} messages at {args.rate:.0f}/s")
+    print(f"  publish: median {statistics.median(publish_times) * 1000:.2f} ms per message (fan-out to every queue)")
+    print(f"  delivery latency: p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+    print(f"  delivered {sum(received):,} of {args.subscribers * args.messages:,} "
+          f"(every active subscriber got every message: {min(received) == args.messages})")
+    print(f"  slow subscribers dropped: {stats['dropped']}, still subscribed: {stats['subscribers']}")
+    assert latencies[-1] < 1.0 and min(received) == args.messages and stats['dropped'] == args.slow
+
+
+if __name__ == "__main__":
+    main()
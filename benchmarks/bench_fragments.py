@@ -0,0 +1,83 @@
+# benchmarks/bench_fragments.py
+# Compare the cost of a full FusionXapp.py rerun against rerunning a single
+# portfolio card fragment, with 1,000 portfolio projects in session state.
+#
+#   python benchmarks/bench_fragments.py [--projects 1000] [--repeat 5]
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CARD_SCRIPT = """
+from fusionx.state import MemoryBackend, SharedStore
+from fusionx.widgets import portfolio_card
+portfolio_card(SharedStore(MemoryBackend()), EMAIL, TITLE)
+"""
+
+
+# Portfolios are keyed by email but not linked to accounts, like the ones
+# submitted from the "Portfolios" page, so the badge add-ons skip them.
+def make_state(n_projects, per_student=5):
+    portfolios = {}
+    for i in range(n_projects):
+        email = f"student{i // per_student}@fusion.edu"
+        if email not in portfolios:
+            portfolios[email] = []
+        portfolios[email].append({
+            "title": f"Project {i}",
+            "field": "AI",
+            "description": f"Description for project {i}",
+            "versions": [{"description": f"Description for project {i}", "field": "AI", "timestamp": datetime.datetime.now()}],
+            "verified": False,
+            "votes": 0,
+            "comments": []
+        })
+    return {"student_accounts": {}, "portfolios": portfolios, "portfolio_votes": {}}
+
+
+def time_runs(at, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    state = make_state(args.projects)
+    email = next(iter(state["portfolios"]))
+
+    full = AppTest.from_file(os.path.join(ROOT, "FusionXapp.py"), default_timeout=600)
+    for key, value in state.items():
+        full.session_state[key] = value
+    full_time = time_runs(full, args.repeat)
+
+    script = CARD_SCRIPT.replace("EMAIL", repr(email)).replace("TITLE", repr("Project 0"))
+    card = AppTest.from_string(script, default_timeout=60)
+    for key, value in state.items():
+        card.session_state[key] = value
+    card_time = time_runs(card, args.repeat)
+
+    print(f"projects:          {args.projects}")
+    print(f"full script rerun: {full_time * 1000:10.1f} ms")
+    print(f"fragment rerun:    {card_time * 1000:10.1f} ms")
+    print(f"speedup:           {full_time / card_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
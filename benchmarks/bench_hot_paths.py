@@ -0,0 +1,136 @@
+# benchmarks/bench_hot_paths.py
+# Time the per-rerun hot paths of FusionXapp.py on synthetic data
+# (benchmarks/synthetic.py) at several scales. Each case calls the same
+# fusionx functions as the matching section of FusionXapp.py; only the
+# Streamlit calls around them (st.markdown, st.toast, ...) are left out.
+#
+#   python benchmarks/bench_hot_paths.py [--records 1000 10000 100000] [--repeat 5]
+#
+# Use --records 1000000 for the largest scale (generation takes a while).
+# benchmarks/test_hot_paths.py runs the same cases under pytest-benchmark.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fusionx import events as ev  # noqa: E402
+from fusionx.events import EventBus  # noqa: E402
+from fusionx.lifecycle import competition_phase  # noqa: E402
+from fusionx.membership import Membership  # noqa: E402
+from fusionx.notifications import Notifier  # noqa: E402
+from fusionx.profiles import badge_label, grant_badges, portfolio_pdf, profile_lines, top_portfolios, track_votes  # noqa: E402
+from fusionx.widgets import chat_line  # noqa: E402
+from synthetic import FIELDS, generate  # noqa: E402
+
+EVENTS = EventBus()  # no subscribers: publishing costs what it does in the app before handlers run
+
+
+def grant_badge(email, account, badge):
+    # FusionXapp.grant_badge
+    account['badges'].append(badge)
+    EVENTS.publish(ev.BADGE, email=email, badge=badge_label(badge))
+
+
+# --- Cases: fn(data, membership) ---
+def filter_competitions(data, membership):
+    # Home / Pending pages: phase of every competition
+    closed = data.store.closed_competitions()
+    phases = {"pending": [], "active": [], "closed": []}
+    for comp in data.store.list_competitions():
+        phases[competition_phase(comp, membership.count(comp['title']), comp['title'] in closed)].append(comp)
+    return phases
+
+
+def top_3(data, membership):
+    # Sidebar "Special Recognition"
+    return top_portfolios(data.store.portfolio_votes(), 3)
+
+
+def badges(data, membership):
+    # "Automatic Badges & Vote Tracking"
+    accounts = data.session_state['student_accounts']
+    earned = grant_badges(accounts, data.session_state['portfolios'], membership.multi_field(2), data.store.badges, grant_badge)
+    track_votes(accounts, data.session_state['portfolio_votes'])
+    return earned
+
+
+def notifications(data, membership):
+    # get_notifier: one yes vote, one submission and one join, as their events arrive
+    notifier = Notifier(data.store)
+    email = data.emails[0]
+    notifier.handle({"type": ev.VOTE, "email": email, "choice": "yes"})
+    notifier.handle({"type": ev.SUBMISSION, "email": email, "title": "Project", "competition": "Cup"})
+    notifier.handle({"type": ev.JOIN, "email": email, "competition": "Cup"})
+
+
+def render_profiles(data, membership, sample=100):
+    # "User Accounts & Profile Pages" for `sample` accounts
+    lines = []
+    for email in data.emails[:sample]:
+        lines += profile_lines(email, data.session_state['student_accounts'][email],
+                               data.session_state['portfolios'].get(email), membership.joined(email))
+    return lines
+
+
+def export_pdf(data, membership):
+    # "Portfolio Export" for the largest portfolio
+    email, projects = max(data.session_state['portfolios'].items(), key=lambda item: len(item[1]))
+    return portfolio_pdf(data.session_state['student_accounts'][email]['name'], projects)
+
+
+def render_chat(data, membership):
+    # Field chat rooms
+    return [chat_line(msg) for field in FIELDS for msg in data.store.chat_messages(field)]
+
+
+CASES = [
+    ("active/pending filtering", filter_competitions),
+    ("top 3 portfolios", top_3),
+    ("badge granting", badges),
+    ("notifications (3 events)", notifications),
+    ("profile rendering (100)", render_profiles),
+    ("PDF export", export_pdf),
+    ("chat rendering (all rooms)", render_chat)
+]
+
+
+def median_time(fn, repeat):
+    fn()  # warm-up: first-rerun work (badges granted, notifications sent) is not repeated later
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    for records in args.records:
+        start = time.perf_counter()
+        data = generate(records, args.seed)
+        membership = Membership(data.store)
+        print(f"{records:,} records generated in {time.perf_counter() - start:.1f}s")
+        for name, fn in CASES:
+            results[(name, records)] = median_time(lambda: fn(data, membership), args.repeat)
+
+    width = max(len(name) for name, _ in CASES)
+    print()
+    print(f"{'median ms':<{width}}" + "".join(f"{r:>12,}" for r in args.records))
+    for name, _ in CASES:
+        print(f"{name:<{width}}" + "".join(f"{results[(name, r)] * 1000:>12.2f}" for r in args.records))
+
+
+if __name__ == "__main__":
+    main()
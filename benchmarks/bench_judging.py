@@ -0,0 +1,90 @@
+# benchmarks/bench_judging.py
+# Balanced judge assignment: 50,000 submissions across 500 judges with field
+# expertise, capacities and conflicts of interest, three reviews each. Times
+# the assignment itself and the same run through the shared-store log, then
+# the spread of judge loads and how many reviews went to non-experts.
+#
+#   python benchmarks/bench_judging.py [--submissions 50000] [--judges 500]
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.judging import JudgePool, ReviewAssigner  # noqa: E402
+from fusionx.state import MemoryBackend, SharedStore  # noqa: E402
+
+FIELDS = ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"]
+
+
+def make_data(n_submissions, n_judges, reviews, rng):
+    # Capacity is spread so the judges can just take every review (plus 10%)
+    weights = [rng.uniform(0.5, 1.5) for _ in range(n_judges)]
+    total = n_submissions * reviews * 1.1
+    judges = [{
+        "name": f"judge{j}", "email": f"judge{j}@fusion.edu",
+        "fields": rng.sample(FIELDS, rng.randint(1, 3)),
+        "capacity": max(1, round(total * w / sum(weights))),
+        "conflicts": [f"student{rng.randrange(20_000)}@fusion.edu" for _ in range(5)]
+    } for j, w in enumerate(weights)]
+    submissions = [(f"Competition {rng.randrange(200)}", f"s{i}", {
+        "title": f"Project {i}", "submitter": f"Student {i % 20_000}",
+        "email": f"student{i % 20_000}@fusion.edu", "field": rng.choice(FIELDS)
+    }) for i in range(n_submissions)]
+    return judges, submissions
+
+
+def report(assigner, label, elapsed):
+    loads = assigner.loads()
+    ratios = [row["assigned"] / row["capacity"] for row in loads]
+    reviews = sum(row["assigned"] for row in loads)
+    experts = {p["name"]: set(p["fields"]) for p in assigner.judges}
+    off_field = sum(1 for key, judges in assigner.assigned.items() for j in judges
+                    if assigner.submissions[key]["field"] not in experts[assigner.judges[j]["name"]])
+    print(f"{label}: {elapsed:.2f} s, {reviews:,} reviews, {len(assigner.short())} submissions short")
+    print(f"  load / capacity: min {min(ratios):.2f}, median {statistics.median(ratios):.2f}, max {max(ratios):.2f}; "
+          f"outside the judge's fields: {off_field / max(reviews, 1):.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--judges", type=int, default=500)
+    parser.add_argument("--reviews", type=int, default=3)
+    args = parser.parse_args()
+
+    judges, submissions = make_data(args.submissions, args.judges, args.reviews, random.Random(5))
+
+    assigner = ReviewAssigner(args.reviews)
+    start = time.perf_counter()
+    for profile in judges:
+        assigner.set_judge(profile)
+    for competition, sid, info in submissions:
+        key = (competition, sid)
+        assigner.apply({"op": "submission", "competition": competition, "submission": sid, "info": info})
+        for judge in assigner.choose(key, info):
+            assigner.apply({"op": "assign", "competition": competition, "submission": sid, "judge": judge})
+    report(assigner, "in memory", time.perf_counter() - start)
+
+    pool = JudgePool(SharedStore(MemoryBackend()), args.reviews)
+    start = time.perf_counter()
+    for profile in judges:
+        pool.set_judge(**profile)
+    for competition, sid, info in submissions:
+        pool.assign(competition, sid, **info)
+    report(pool.assigner, "through the store log", time.perf_counter() - start)
+
+    # Incremental rebalancing: the busiest judge leaves, their reviews move elsewhere
+    busiest = max(pool.loads(), key=lambda row: row["assigned"])
+    start = time.perf_counter()
+    pool.remove_judge(busiest["judge"])
+    print(f"{busiest['judge']} left: {busiest['assigned']} reviews reassigned in {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"{len(pool.assigner.short())} submissions short")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_membership.py
+# Compare the old list-based participant / interest lookups with the bitmap
+# indexes for 100k students, 500 competitions over 8 fields and 2M joins.
+#
+#   python benchmarks/bench_membership.py [--students 100000] [--joins 2000000]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.membership import BitmapIndex  # noqa: E402
+
+FIELDS = ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"]
+
+
+def timed(label, fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"  {label}: {(time.perf_counter() - start) / repeat * 1000:.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--competitions", type=int, default=500)
+    parser.add_argument("--joins", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    comp_field = {f"comp-{c}": FIELDS[c % len(FIELDS)] for c in range(args.competitions)}
+    comp_titles = list(comp_field)
+    join_comp = rng.integers(0, args.competitions, args.joins)
+    join_student = rng.integers(0, args.students, args.joins)
+    interests = [rng.choice(len(FIELDS), rng.integers(0, 4), replace=False).tolist() for _ in range(args.students)]
+
+    # Old layout: {title: [student names]} and a field list per account
+    participants = {t: [] for t in comp_titles}
+    for c, s in zip(join_comp.tolist(), join_student.tolist()):
+        participants[comp_titles[c]].append(f"student-{s}")
+    accounts = {f"student-{s}": {"field": [FIELDS[f] for f in fs]} for s, fs in enumerate(interests)}
+
+    # Bitmaps
+    start = time.perf_counter()
+    competitions = BitmapIndex(capacity=args.students)
+    for c, s in zip(join_comp.tolist(), join_student.tolist()):
+        competitions.add(comp_titles[c], s)
+    fields = BitmapIndex(capacity=args.students)
+    for s, fs in enumerate(interests):
+        for f in fs:
+            fields.add(FIELDS[f], s)
+    print(f"built bitmaps for {args.joins:,} joins in {time.perf_counter() - start:.1f}s")
+
+    target = comp_titles[3]
+    ai = [t for t in comp_titles if comp_field[t] == "AI"]
+    math = [t for t in comp_titles if comp_field[t] == "Math"]
+
+    print("lists:")
+    timed("has student joined", lambda: "student-99999" in participants[target])
+    timed("participant count (len of 4k-entry list, with duplicates)", lambda: len(participants[target]))
+    old_both = timed("students in both AI and Math competitions", lambda: (
+        set(s for t in ai for s in participants[t]) & set(s for t in math for s in participants[t])), repeat=1)
+    old_multi = timed("multi-field badge eligibility", lambda: [e for e, a in accounts.items() if len(a['field']) >= 2], repeat=1)
+
+    print("bitmaps:")
+    timed("has student joined", lambda: competitions.contains(target, 99999))
+    timed("participant count (distinct)", lambda: competitions.count(target))
+    both = timed("students in both AI and Math competitions", lambda: np.flatnonzero(competitions.any_of(ai) & competitions.any_of(math)))
+    multi = timed("multi-field badge eligibility", lambda: np.flatnonzero(fields.at_least(FIELDS, 2)))
+
+    assert len(both) == len(old_both) and len(multi) == len(old_multi)
+    print(f"results match: {len(both):,} students in AI and Math, {len(multi):,} multi-field")
+    memory = sum(row.nbytes for row in competitions.rows.values()) + sum(row.nbytes for row in fields.rows.values())
+    print(f"bitmap memory: {memory / 1e6:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_scoring.py
+# Rank 10k submissions scored by 100 judges (1M rubric rows) with per-judge
+# z-score normalization and trimmed means, cold and from the per-competition
+# cache.
+#
+#   python benchmarks/bench_scoring.py [--submissions 10000] [--judges 100]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.scoring import RUBRIC, SCORE_MAX, SCORE_MIN, ScoreBoard  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=10000)
+    parser.add_argument("--judges", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    n_sub, n_judge = args.submissions, args.judges
+    quality = rng.normal(0, 1.5, n_sub)  # true submission quality
+    bias = rng.normal(0, 1.0, n_judge)  # harsh vs generous judges
+    sub_idx = np.repeat(np.arange(n_sub, dtype=np.int32), n_judge)
+    judge_idx = np.tile(np.arange(n_judge, dtype=np.int32), n_sub)
+    noise = rng.normal(0, 1.0, (len(sub_idx), len(RUBRIC)))
+    scores = np.clip(5.5 + quality[sub_idx, None] + bias[judge_idx, None] + noise, SCORE_MIN, SCORE_MAX).astype(np.float32)
+
+    board = ScoreBoard()
+    board.load_arrays(
+        [{"id": f"sub-{i}", "title": f"Submission {i}"} for i in range(n_sub)],
+        [f"Judge {j}" for j in range(n_judge)],
+        sub_idx, judge_idx, scores
+    )
+
+    cold = []
+    for _ in range(args.repeat):
+        board.version += 1  # invalidate the cache
+        start = time.perf_counter()
+        ranking = board.rankings()
+        cold.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(1000):
+        board.rankings()
+    cached = (time.perf_counter() - start) / 1000
+
+    top = ranking["submission_id"].str.slice(4).astype(int).to_numpy()[:100]
+    print(f"score rows:        {len(sub_idx):,} ({n_sub:,} submissions x {n_judge} judges)")
+    print(f"ranking (cold):    {min(cold) * 1000:8.1f} ms")
+    print(f"ranking (cached):  {cached * 1e6:8.1f} us")
+    print(f"top-100 precision: {np.isin(top, np.argsort(-quality)[:100]).mean():.0%} vs. true quality")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_similarity.py
+# Index 200k synthetic descriptions with MinHash/LSH, plant lightly edited
+# copies of 1% of them, and measure how fast and how reliably the copies are
+# found compared with exact pairwise Jaccard.
+#
+#   python benchmarks/bench_similarity.py [--docs 200000] [--copies 2000]
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.similarity import LSHIndex, minhash, shingles  # noqa: E402
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--copies", type=int, default=2000)
+    parser.add_argument("--edit-rate", type=float, default=0.05, help="fraction of words changed in a copy")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+    docs = [" ".join(rng.choices(vocab, k=rng.randint(40, 80))) for _ in range(args.docs)]
+
+    index = LSHIndex()
+    start = time.perf_counter()
+    sigs = [minhash(d) for d in docs]
+    sig_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for i, sig in enumerate(sigs):
+        index.add(i, sig)
+    add_time = time.perf_counter() - start
+    print(f"{args.docs:,} docs: minhash {sig_time / args.docs * 1e6:.0f} µs/doc, LSH insert {add_time / args.docs * 1e6:.1f} µs/doc")
+
+    # Lightly edited copies of random originals
+    originals = rng.sample(range(args.docs), args.copies)
+    copies = []
+    for i in originals:
+        words = docs[i].split()
+        for j in rng.sample(range(len(words)), max(1, int(len(words) * args.edit_rate))):
+            words[j] = rng.choice(vocab)
+        copies.append(" ".join(words))
+
+    start = time.perf_counter()
+    found = 0
+    false_matches = 0
+    candidates = 0
+    for original, copy in zip(originals, copies):
+        sig = minhash(copy)
+        matches = index.query(sig)
+        candidates += len(matches)
+        found += any(doc_id == original for doc_id, _ in matches)
+        false_matches += sum(jaccard(shingles(copy), shingles(docs[d])) < 0.5 for d, _ in matches if d != original)
+    query_time = time.perf_counter() - start
+    true_sims = [jaccard(shingles(c), shingles(docs[i])) for i, c in zip(originals[:200], copies[:200])]
+    print(f"{args.copies:,} copies (true Jaccard {min(true_sims):.2f}-{max(true_sims):.2f}): "
+          f"{query_time / args.copies * 1000:.2f} ms/query incl. minhash")
+    print(f"recall {found / args.copies:.1%}, unrelated matches {false_matches}, matches/query {candidates / args.copies:.2f}")
+
+    # Exact pairwise Jaccard for one new description, extrapolated from a sample
+    sample = 2000
+    copy_shingles = shingles(copies[0])
+    doc_shingles = [shingles(d) for d in docs[:sample]]
+    start = time.perf_counter()
+    for s in doc_shingles:
+        jaccard(copy_shingles, s)
+    per_pair = (time.perf_counter() - start) / sample
+    print(f"exact pairwise check of one description against {args.docs:,}: "
+          f"~{per_pair * args.docs * 1000:.0f} ms (plus shingling every document)")
+
+
+if __name__ == "__main__":
+    main()
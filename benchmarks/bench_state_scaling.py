@@ -0,0 +1,96 @@
+# benchmarks/bench_state_scaling.py
+# Throughput of the shared Redis state backend with 1..N FusionXapp worker
+# processes. Each worker replays the request mix of a page view (read
+# competitions + participants, cast a vote, post a chat message, notify).
+#
+#   python benchmarks/bench_state_scaling.py [--redis-url redis://localhost:6379/15]
+#
+# Without --redis-url a fakeredis TCP server is started in a child process.
+# fakeredis is single-threaded Python, so it saturates long before a real
+# redis-server does; use a local redis-server to see scaling to the core count.
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.state import SharedStore, backend_from_url  # noqa: E402
+
+FIELDS = ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"]
+
+
+def run_fake_server(port, ready):
+    from fakeredis import TcpFakeServer
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    ready.set()
+    server.serve_forever()
+
+
+def seed(url, namespace):
+    store = SharedStore(backend_from_url(url), namespace=namespace)
+    for i in range(50):
+        store.add_competition({"title": f"Competition {i}", "description": "Seeded", "threshold": 5, "field": FIELDS[i % len(FIELDS)]})
+
+
+def worker(url, namespace, worker_id, duration, results):
+    store = SharedStore(backend_from_url(url), namespace=namespace)
+    ops = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        comps = store.list_competitions()
+        store.participants([c['title'] for c in comps[:10]])
+        store.cast_portfolio_vote(f"voter-{worker_id}-{ops}", f"student-{ops % 100}", "yes", 5, 30)
+        store.post_chat(FIELDS[ops % len(FIELDS)], f"worker-{worker_id}", "hello")
+        store.notify(f"student-{ops % 100}@fusion.edu", "Your portfolio has a new vote.")
+        ops += 1
+    results.put(ops)
+
+
+def measure(url, processes, duration):
+    namespace = f"bench{processes}"
+    seed(url, namespace)
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=worker, args=(url, namespace, i, duration, results)) for i in range(processes)]
+    for p in procs:
+        p.start()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url")
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count())
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    server = None
+    url = args.redis_url
+    if not url:
+        port = 16379
+        ready = multiprocessing.Event()
+        server = multiprocessing.Process(target=run_fake_server, args=(port, ready), daemon=True)
+        server.start()
+        ready.wait(10)
+        time.sleep(0.2)
+        url = f"redis://127.0.0.1:{port}/0"
+
+    try:
+        baseline = None
+        print(f"{'processes':>9} {'page views/s':>14} {'speedup':>8} {'efficiency':>10}")
+        for n in range(1, args.max_processes + 1):
+            rate = measure(url, n, args.duration)
+            baseline = baseline or rate
+            print(f"{n:>9} {rate:>14.0f} {rate / baseline:>8.2f} {rate / baseline / n:>10.0%}")
+    finally:
+        if server is not None:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_uploads.py
+# Rerun-thread cost of an upload with background inspection (attach) versus
+# copying it to the blob store inline, and how long the worker takes to check
+# typical and hostile files: a 40 MB ZIP of 2,000 entries, a zip bomb
+# (1 GB of zeros), a 500-page PDF and a PNG claiming 100k x 100k pixels.
+#
+#   python benchmarks/bench_uploads.py
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.blobs import BlobStore  # noqa: E402
+from fusionx.uploads import UploadInspector, describe  # noqa: E402
+
+
+class Upload(io.BytesIO):
+    # Stand-in for Streamlit's UploadedFile
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def make_files():
+    files = {}
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as z:
+        for i in range(2000):
+            z.writestr(f"project/file{i}.bin", os.urandom(20_000))
+    files["project.zip"] = buffer.getvalue()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        with z.open("zeros.bin", "w", force_zip64=True) as entry:
+            block = bytes(1024 * 1024)
+            for _ in range(1024):
+                entry.write(block)
+    files["bomb.zip"] = buffer.getvalue()
+    pages = b"".join(b"%d 0 obj << /Type /Page /Parent 2 0 R /Contents %d 0 R >> endobj\n" % (i, i) + os.urandom(4000)
+                     for i in range(500))
+    files["report.pdf"] = b"%PDF-1.7\n" + pages + b"2 0 obj << /Type /Pages /Count 500 >> endobj\n%%EOF"
+    files["huge.png"] = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", 100_000, 100_000, 8, 2, 0, 0, 0)
+    return files
+
+
+def main():
+    files = make_files()
+    blobs = BlobStore(tempfile.mkdtemp(prefix="fusionx-blobs-"))
+    inspector = UploadInspector(blobs)
+    for name, data in files.items():
+        start = time.perf_counter()
+        blobs.put_upload(Upload(name, data))
+        inline = time.perf_counter() - start
+
+        item = {}
+        start = time.perf_counter()
+        future = inspector.attach(item, Upload(name, data))
+        attach = time.perf_counter() - start
+        if future:
+            future.result()
+        total = time.perf_counter() - start
+        print(f"{name} ({len(data) / 1e6:.1f} MB): inline copy {inline * 1000:.1f} ms, attach {attach * 1000:.2f} ms, "
+              f"checked after {total * 1000:.1f} ms -> {describe(item['upload'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_warmup.py
+# What the first visitor after a deploy pays with and without the boot
+# warm-up: the hot reads of one rerun (participant counts, score rankings,
+# trending, XP leaderboard, duplicate index) against freshly started services
+# whose models are still empty, versus the same reads after Warmup replayed
+# the logs on a thread pool. Also times the warm-up itself and its p99 probe.
+#
+#   python benchmarks/bench_warmup.py [--records 100000] [--workers 4]
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fusionx import events as ev  # noqa: E402
+from fusionx.membership import Membership  # noqa: E402
+from fusionx.scoring import RUBRIC, MentorScoring  # noqa: E402
+from fusionx.similarity import DuplicateDetector  # noqa: E402
+from fusionx.trending import Trending  # noqa: E402
+from fusionx.warmup import Warmup  # noqa: E402
+from fusionx.xp import XPLedger  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+
+def fill_logs(data, rng):
+    # Scores, trend signals, XP entries and description signatures on top of the synthetic data
+    store = data.store
+    scoring, trending, xp, duplicates = MentorScoring(store), Trending(store), XPLedger(store), DuplicateDetector(store)
+    now = datetime.datetime.now()
+    for title, submissions in data.session_state["competition_submissions"].items():
+        for s in submissions:
+            for judge in rng.sample(range(40), 3):
+                scoring.submit(title, s, f"judge{judge}", {c: rng.randint(1, 10) for c in RUBRIC})
+            duplicates.check(f"submission:{s['id']}", s["description"], {"kind": "submission", "title": s["title"]})
+            event = {"type": ev.SUBMISSION, "competition": title, "email": s["submitter_email"],
+                     "timestamp": (now - datetime.timedelta(hours=rng.randrange(24 * 14))).isoformat()}
+            trending.handle(event)
+            xp.handle(event)
+
+
+def reads(store):
+    # The services of a freshly started process and one rerun's hot reads on them
+    membership, scoring, trending, xp, duplicates = (Membership(store), MentorScoring(store), Trending(store),
+                                                     XPLedger(store), DuplicateDetector(store))
+    titles = [c["title"] for c in store.list_competitions()]
+    return [
+        ("competitions", lambda: [membership.count(t) for t in titles]),
+        ("rankings", lambda: [scoring.rankings(t) for t in titles]),
+        ("trending", lambda: trending.top("competitions", 20)),
+        ("xp", lambda: xp.leaderboard(k=10)),
+        ("duplicates", duplicates.sync)
+    ]
+
+
+def first_rerun(tasks):
+    start = time.perf_counter()
+    for _, fn in tasks:
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    data = generate(args.records)
+    fill_logs(data, random.Random(1))
+    print(f"{args.records:,} records, {sum(len(s) for s in data.session_state['competition_submissions'].values()):,} submissions")
+
+    print(f"first rerun, cold: {first_rerun(reads(data.store)) * 1000:.0f} ms")
+
+    tasks = reads(data.store)
+    warmup = Warmup(tasks, workers=args.workers)
+    start = time.perf_counter()
+    warmup.start()
+    warmup.ready.wait()
+    status = warmup.status()
+    print(f"warm-up with {args.workers} workers: ready after {time.perf_counter() - start:.2f} s, "
+          f"slowest model {max(status['tasks'].items(), key=lambda t: t[1])}, probe p99 {status['p99_ms']} ms")
+    print(f"first rerun, warmed: {first_rerun(tasks) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_webhooks.py
+# Push thousands of submission events per second through WebhookDispatcher
+# against a local HTTP stub server and report submit latency (what a
+# Streamlit rerun pays) and end-to-end delivery throughput.
+#
+#   python benchmarks/bench_webhooks.py [--events 20000] [--endpoints 3] [--fail-rate 0.1]
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx import events as ev  # noqa: E402
+from fusionx.webhooks import WebhookDispatcher  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    received = 0
+    requests = 0
+    fail_rate = 0.0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < self.fail_rate:
+            self.send_response(503)
+            self.end_headers()
+            return
+        count = len(json.loads(body).get("events", []))
+        with StubHandler.lock:
+            StubHandler.received += count
+            StubHandler.requests += 1
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--endpoints", type=int, default=3)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    StubHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    endpoints = [{"url": f"{base}/hook/{i}", "kind": "generic", "events": [ev.SUBMISSION]} for i in range(args.endpoints)]
+
+    dead_letter = os.path.join(tempfile.mkdtemp(), "dead_letter.jsonl")
+    dispatcher = WebhookDispatcher(lambda: endpoints, dead_letter_path=dead_letter, queue_size=args.events,
+                                   endpoint_queue_size=args.events,
+                                   batch_size=200, batch_interval=0.05, backoff_base=0.05, backoff_max=1.0)
+    dispatcher.start()
+    bus = ev.EventBus()
+    bus.subscribe(dispatcher.submit)
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.events):
+        t0 = time.perf_counter()
+        bus.publish(ev.SUBMISSION, competition=f"Competition {i % 20}", title=f"Work {i}", submitter=f"Student {i}")
+        latencies.append(time.perf_counter() - t0)
+    submitted = time.perf_counter() - start
+    dispatcher.wait_idle(timeout=120)
+    elapsed = time.perf_counter() - start
+    stats = dispatcher.stats()
+    dispatcher.stop()
+    server.shutdown()
+
+    latencies.sort()
+    expected = args.events * args.endpoints
+    print(f"events submitted:      {args.events} x {args.endpoints} endpoints")
+    print(f"submit latency p50:    {statistics.median(latencies) * 1e6:8.1f} us")
+    print(f"submit latency p99:    {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us")
+    print(f"submit rate:           {args.events / submitted:8.0f} events/s")
+    print(f"delivered:             {StubHandler.received}/{expected} in {StubHandler.requests} requests")
+    print(f"delivery throughput:   {StubHandler.received / elapsed:8.0f} events/s")
+    print(f"retries / failed:      {stats['retries']} / {stats['failed']}")
+    print(f"dropped (backpressure): {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
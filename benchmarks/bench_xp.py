@@ -0,0 +1,80 @@
+# benchmarks/bench_xp.py
+# Windowed XP totals and leaderboards from the prefix-sum ledger versus
+# summing the raw ledger entries, for 20k students and 1M XP entries spread
+# over 600 days.
+#
+#   python benchmarks/bench_xp.py [--students 20000] [--entries 1000000]
+import argparse
+import collections
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.state import MemoryBackend, SharedStore  # noqa: E402
+from fusionx.xp import EPOCH, XPLedger  # noqa: E402
+
+
+def timed(label, fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f"  {label}: {(time.perf_counter() - start) / repeat * 1000:.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=600)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    students = rng.zipf(1.3, args.entries) % args.students  # a few very active students
+    days = rng.integers(0, args.days, args.entries)
+    points = rng.choice([1, 2, 5], args.entries)
+    entries = [(f"student{s}@fusion.edu", EPOCH + datetime.timedelta(days=int(d)), int(p))
+               for s, d, p in zip(students.tolist(), days.tolist(), points.tolist())]
+
+    store = SharedStore(MemoryBackend())
+    for email, day, p in entries:
+        store.add_xp_entry({"email": email, "points": p, "day": day.isoformat(), "reason": "vote"})
+    ledger = XPLedger(store)
+    start = time.perf_counter()
+    ledger.total("student0@fusion.edu")
+    print(f"replayed {args.entries:,} entries in {time.perf_counter() - start:.2f}s "
+          f"({ledger.cum.nbytes / 1e6:.0f} MB of prefix sums)")
+
+    window = (EPOCH + datetime.timedelta(days=300), EPOCH + datetime.timedelta(days=306))
+    email = "student7@fusion.edu"
+
+    def scan_total():
+        return sum(p for e, d, p in entries if e == email and window[0] <= d <= window[1])
+
+    def scan_top():
+        totals = collections.Counter()
+        for e, d, p in entries:
+            if window[0] <= d <= window[1]:
+                totals[e] += p
+        return totals.most_common(10)
+
+    print("ledger scan:")
+    old_total = timed("one student's XP in a week", scan_total, repeat=1)
+    old_top = timed("top 10 for a week", scan_top, repeat=1)
+    print("prefix sums:")
+    total = timed("one student's XP in a week", lambda: ledger.total(email, *window), repeat=1000)
+    top = timed("top 10 for a week", lambda: ledger.leaderboard(*window, k=10))
+    timed("top 10 all time", lambda: ledger.leaderboard(k=10))
+
+    assert total == old_total and [p for _, p in top] == [p for _, p in old_top]
+    print(f"results match: {total} XP, leader {top[0][0]} with {top[0][1]} XP")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/synthetic.py
+# Deterministic synthetic FusionX data for benchmarks: accounts, competitions
+# (pending / active / closed), joins, versioned portfolio projects,
+# submissions with files, votes, comments and chat rooms.
+#
+# `records` is the rough total number of records, split across entity types
+# in fixed proportions, so --records 1000 is a quiet school and
+# --records 1000000 a very busy competition season. The same seed and scale
+# always produce the same data.
+#
+#   python benchmarks/synthetic.py [--records 100000] [--seed 0]
+#
+# Shared data goes into a SharedStore (in-memory unless a backend is given)
+# and a BlobStore; per-session data is returned as a session_state dict that
+# can be handed to AppTest or used directly.
+import argparse
+import datetime
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fusionx.blobs import BlobStore  # noqa: E402
+from fusionx.membership import Membership  # noqa: E402
+from fusionx.state import MemoryBackend, SharedStore  # noqa: E402
+
+FIELDS = ["AI", "Robotics", "Design", "Science", "Math", "Business", "Art", "Other"]
+START = datetime.datetime(2024, 9, 2)
+FILE_VARIANTS = 64  # distinct upload contents; the blob store dedups the rest
+
+# Share of `records` per entity type
+SHARES = {
+    "accounts": 0.05,
+    "competitions": 0.005,
+    "joins": 0.2,
+    "projects": 0.1,
+    "submissions": 0.1,
+    "votes": 0.25,
+    "comments": 0.1,
+    "chat": 0.1
+}
+
+WORDS = ("robot sensor model data design prototype circuit neural chart survey market "
+         "canvas solar water energy app game network vision sound print bridge rocket").split()
+
+
+class Dataset:
+    def __init__(self, store, blobs, session_state, counts):
+        self.store = store
+        self.blobs = blobs
+        self.session_state = session_state  # student_accounts, portfolios, competition_submissions, ...
+        self.counts = counts
+
+    @property
+    def emails(self):
+        return list(self.session_state["student_accounts"])
+
+
+def sizes(records):
+    return {kind: max(3 if kind == "competitions" else 10, int(records * share)) for kind, share in SHARES.items()}
+
+
+def text(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def generate(records=10_000, seed=0, store=None, blob_dir=None):
+    rng = random.Random(seed)
+    n = sizes(records)
+    store = store or SharedStore(MemoryBackend())
+    blobs = BlobStore(blob_dir or tempfile.mkdtemp(prefix="fusionx-blobs-"))
+    membership = Membership(store)
+
+    # Accounts with 0-3 field interests
+    accounts = {}
+    for i in range(n["accounts"]):
+        email = f"student{i}@fusion.edu"
+        fields = rng.sample(FIELDS, rng.randint(0, 3))
+        accounts[email] = {"name": f"Student {i}", "field": fields, "avatar_ref": None, "votes": 0, "badges": []}
+        membership.set_fields(email, fields)
+    emails = list(accounts)
+
+    # Competitions: every third stays below its threshold (pending), a tenth are closed
+    competitions = []
+    for i in range(n["competitions"]):
+        comp = {"title": f"Competition {i}", "description": text(rng, 20), "threshold": rng.randint(3, 20),
+                "field": FIELDS[i % len(FIELDS)]}
+        store.add_competition(comp)
+        competitions.append(comp)
+    open_titles = [c["title"] for i, c in enumerate(competitions) if i % 3]
+    for _ in range(n["joins"]):
+        store.join(rng.choice(open_titles), rng.choice(emails))
+    for i, comp in enumerate(competitions):
+        if i % 3 == 0:
+            continue
+        store.mark_activated(comp["title"])
+        if i % 10 == 1:
+            store.close_competition(comp["title"])
+
+    # Submissions with small files (1-64 KB)
+    contents = [rng.randbytes(rng.randint(1, 64) * 1024) for _ in range(FILE_VARIANTS)]
+    refs = [(blobs.put(io.BytesIO(content)), len(content)) for content in contents]
+    submissions = {}
+    for i in range(n["submissions"]):
+        title = rng.choice(open_titles)
+        email = rng.choice(emails)
+        ref, size = rng.choice(refs)
+        submissions.setdefault(title, []).append({
+            "id": f"sub{i}",
+            "submitter": accounts[email]["name"],
+            "submitter_email": email,
+            "title": f"Submission {i}",
+            "description": text(rng, 30),
+            "file": f"work{i}.zip",
+            "file_ref": ref,
+            "file_size": size
+        })
+
+    # Portfolio projects with 1-4 versions
+    portfolios = {}
+    for i in range(n["projects"]):
+        email = rng.choice(emails)
+        field = rng.choice(FIELDS)
+        versions = [{"description": text(rng, 25), "field": field, "timestamp": START + datetime.timedelta(hours=i + v)}
+                    for v in range(rng.randint(1, 4))]
+        portfolios.setdefault(email, []).append({
+            "id": f"proj{i}",
+            "title": f"Project {i}",
+            "field": field,
+            "description": versions[-1]["description"],
+            "versions": versions,
+            "verified": rng.random() < 0.2,
+            "votes": 0,
+            "comment_count": 0
+        })
+    projects = [(email, proj) for email, projs in portfolios.items() for proj in projs]
+
+    # Votes: portfolio votes (5 per voter) and project votes
+    for i in range(n["votes"]):
+        if i % 2:
+            store.cast_portfolio_vote(f"voter{i // 5}", rng.choice(emails), rng.choice(("yes", "yes", "no")), 5, 30)
+        else:
+            email, proj = rng.choice(projects)
+            store.vote_project(email, proj["title"])
+
+    # Comments and chat
+    for i in range(n["comments"]):
+        email, proj = rng.choice(projects)
+        proj["comment_count"] = store.add_comment(proj["id"], rng.choice(emails), text(rng, 12),
+                                                  timestamp=START + datetime.timedelta(minutes=i))
+    for i in range(n["chat"]):
+        store.post_chat(rng.choice(FIELDS), accounts[rng.choice(emails)]["name"], text(rng, 10),
+                        timestamp=START + datetime.timedelta(seconds=i * 30))
+
+    session_state = {
+        "student_accounts": accounts,
+        "portfolios": portfolios,
+        "competition_submissions": submissions,
+        "portfolio_votes": store.portfolio_votes(),
+        "xp_points": {}
+    }
+    return Dataset(store, blobs, session_state, n)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = generate(args.records, args.seed)
+    print(f"generated {args.records:,} records in {time.perf_counter() - start:.1f}s (blobs in {data.blobs.root})")
+    for kind, count in data.counts.items():
+        print(f"  {kind}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# benchmarks/test_hot_paths.py
+# The cases of bench_hot_paths.py as a pytest-benchmark suite, so a change to
+# FusionXapp.py can be compared against a saved run:
+#
+#   python -m pytest benchmarks/test_hot_paths.py --benchmark-autosave
+#   python -m pytest benchmarks/test_hot_paths.py --benchmark-compare
+#
+# FUSIONX_BENCH_RECORDS sets the scales, e.g. "1000,100000,1000000".
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+pytest.importorskip("pytest_benchmark")
+
+from bench_hot_paths import CASES  # noqa: E402
+
+from fusionx.membership import Membership  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+SCALES = [int(n) for n in os.environ.get("FUSIONX_BENCH_RECORDS", "1000,10000").split(",")]
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda n: f"{n}-records")
+def dataset(request):
+    data = generate(request.param, seed=0)
+    return data, Membership(data.store)
+
+
+@pytest.mark.parametrize("name,case", CASES, ids=[name for name, _ in CASES])
+def test_hot_path(benchmark, dataset, name, case):
+    data, membership = dataset
+    case(data, membership)  # first-rerun work (badges granted, notifications sent) is not repeated later
+    benchmark.group = name
+    benchmark(case, data, membership)
@@ -0,0 +1,2 @@
+# fusionx/__init__.py
+# Shared building blocks used by FusionXapp.py
@@ -0,0 +1,237 @@
+# fusionx/abuse.py
+# Streaming vote-abuse detection in constant memory.
+#
+# Every vote is scored against sketches of the last hour of votes:
+#   - a Count-Min sketch (with conservative update) of votes per voter name,
+#     per session, per target and per session -> target pair; counts can
+#     only be overestimated;
+#   - HyperLogLog distinct counters kept Count-Min style (each key hashes to
+#     one small HLL per row, the smallest estimate wins): voter names per
+#     session and sessions per target.
+#
+# From those a vote is flagged as
+#   - "burst": one voter or one session voting much faster than a person would;
+#   - "name cycling": one session voting under several names to get around
+#     the per-name monthly quota;
+#   - "ring": sessions voting for the same target again and again, or a
+#     target collecting many votes from very few sessions.
+#
+# The window slides in BUCKETS steps: each sketch has one slice per step and
+# the oldest slice is cleared when a new step starts (and subtracted from a
+# running window total), so memory is fixed at about 6 MB however many
+# votes and voters there are. Updates are a handful of array reads and
+# writes, tens of microseconds per vote. Counts stay accurate to about one
+# vote up to ~10,000 votes an hour. Sketches are per server process; flags go
+# to the shared store for mentors to review.
+import array
+import collections
+import datetime
+import math
+import threading
+
+import numpy as np
+
+WINDOW_SECONDS = 3600
+BUCKETS = 6  # the window slides in 10-minute steps
+CMS_DEPTH = 4
+CMS_WIDTH = 8192
+PAIR_WIDTH = 32768  # session -> target pairs are far more numerous than any single key
+HLL_DEPTH = 2
+HLL_WIDTH = 8192
+HLL_REGISTERS = 16  # small HLLs: the counts that matter here are a handful
+_HLL_BITS = HLL_REGISTERS.bit_length() - 1
+_HLL_ALPHA = 0.673
+_MASK64 = (1 << 64) - 1
+
+# Per window of WINDOW_SECONDS
+VOTER_BURST = 15  # votes under one name
+SESSION_BURST = 30  # votes from one session
+NAMES_PER_SESSION = 3  # voter names used by one session
+RING_MIN_VOTES = 10  # votes for one target before checking where they come from
+RING_MAX_SESSIONS = 2  # ... if they all come from this few sessions it is a ring
+REPEAT_VOTES = 5  # votes from one session for one target
+FLAG_MEMORY = 1024  # (reason, key) pairs remembered so each is flagged once per window
+
+
+def _hash(text):
+    # Two 64-bit hashes. Python's (SipHash, randomly seeded) string hash is fine
+    # because sketches never leave the process.
+    return hash(text) & _MASK64, hash((text, 1)) & _MASK64 | 1
+
+
+def _cells(key, depth, width):
+    # Row cells for key (Kirsch-Mitzenmacher double hashing)
+    h1, h2 = _hash(key)
+    return [((h1 + i * h2) & _MASK64) % width for i in range(depth)]
+
+
+def hll_estimate(registers):
+    m = len(registers)
+    zeros = registers.count(0)
+    estimate = _HLL_ALPHA * m * m / math.fsum(2.0 ** -r for r in registers)
+    if estimate <= 2.5 * m and zeros:
+        return m * math.log(m / zeros)  # linear counting for small cardinalities
+    return estimate
+
+
+class CountMinWindow:
+    # Count-Min sketch over a sliding window: one slice per step plus their running sum
+    def __init__(self, buckets, depth=CMS_DEPTH, width=CMS_WIDTH, typecode="I"):
+        self.depth = depth
+        self.width = width
+        size = array.array(typecode).itemsize
+        self.slices = [[array.array(typecode, bytes(size * width)) for _ in range(depth)] for _ in range(buckets)]
+        self.window = [array.array(typecode, bytes(size * width)) for _ in range(depth)]
+        self._dtype = np.dtype(f"u{size}")
+
+    def clear(self, slot):
+        for row, counts in zip(self.window, self.slices[slot]):
+            np.frombuffer(row, dtype=self._dtype)[:] -= np.frombuffer(counts, dtype=self._dtype)
+            np.frombuffer(counts, dtype=self._dtype)[:] = 0
+
+    def add(self, slot, key):
+        # Conservative update: only the cells at the current minimum are raised; returns the new estimate
+        cells = _cells(key, self.depth, self.width)
+        current = [row[c] for row, c in zip(self.window, cells)]
+        low = min(current)
+        for r, c in enumerate(cells):
+            if current[r] == low:
+                self.window[r][c] += 1
+                self.slices[slot][r][c] += 1
+        return low + 1
+
+    def count(self, key):
+        return min(row[c] for row, c in zip(self.window, _cells(key, self.depth, self.width)))
+
+    def nbytes(self):
+        return self.window[0].itemsize * self.depth * self.width * (len(self.slices) + 1)
+
+
+class DistinctWindow:
+    # Count-Min grid of small HyperLogLogs over a sliding window. The registers of
+    # one cell for every slice are stored side by side, so merging a cell over the
+    # window reads one contiguous run of bytes.
+    def __init__(self, buckets, depth=HLL_DEPTH, width=HLL_WIDTH, m=HLL_REGISTERS):
+        self.buckets = buckets
+        self.depth = depth
+        self.width = width
+        self.m = m
+        self.registers = bytearray(depth * width * buckets * m)
+
+    def clear(self, slot):
+        grid = np.frombuffer(self.registers, dtype=np.uint8).reshape(self.depth, self.width, self.buckets, self.m)
+        grid[:, :, slot, :] = 0
+
+    def _bases(self, key):
+        run = self.buckets * self.m
+        return [(r * self.width + c) * run for r, c in enumerate(_cells(key, self.depth, self.width))]
+
+    def add(self, slot, key, item):
+        # True if a register went up, i.e. the estimate may have changed
+        x, _ = _hash(item)
+        register = x & (self.m - 1)
+        rank = (64 - _HLL_BITS) - (x >> _HLL_BITS).bit_length() + 1
+        changed = False
+        for base in self._bases(key):
+            i = base + slot * self.m + register
+            if self.registers[i] < rank:
+                self.registers[i] = rank
+                changed = True
+        return changed
+
+    def estimate(self, key):
+        # Estimated distinct items added for key in the window
+        estimate = None
+        for base in self._bases(key):
+            slices = [self.registers[base + b * self.m:base + (b + 1) * self.m] for b in range(self.buckets)]
+            row_estimate = hll_estimate(list(map(max, *slices)))  # registers merged over the window
+            estimate = row_estimate if estimate is None else min(estimate, row_estimate)
+        return round(estimate)
+
+    def nbytes(self):
+        return len(self.registers)
+
+
+class VoteAbuseDetector:
+    def __init__(self, store, window_seconds=WINDOW_SECONDS, buckets=BUCKETS):
+        self.store = store
+        self.step = window_seconds / buckets
+        self.buckets = buckets
+        self.votes = CountMinWindow(buckets)  # keys "t:<target>", "v:<voter>", "s:<session>"
+        self.pairs = CountMinWindow(buckets, width=PAIR_WIDTH, typecode="H")  # "<session>><target>"
+        self.names = DistinctWindow(buckets)  # session -> voter names
+        self.sessions = DistinctWindow(buckets)  # target -> sessions
+        self._epoch = None  # step number of the newest slice
+        self._flagged = collections.OrderedDict()  # (reason, key) -> step flagged
+        self._lock = threading.Lock()
+        self._stats = {"votes": 0, "flags": 0}
+
+    # --- Sliding window ---
+    def _advance(self, when):
+        epoch = int(when.timestamp() // self.step)
+        if self._epoch is None:
+            self._epoch = epoch
+        elif epoch > self._epoch:
+            for e in range(self._epoch + 1, min(epoch, self._epoch + self.buckets) + 1):
+                for sketch in (self.votes, self.pairs, self.names, self.sessions):
+                    sketch.clear(e % self.buckets)
+            self._epoch = epoch
+        return self._epoch % self.buckets  # late events count in the newest slice
+
+    # --- Scoring ---
+    def observe(self, target, voter=None, session=None, when=None):
+        # Adds one vote; returns [(reason, key, value, limit)] for the checks it newly trips
+        when = when or datetime.datetime.now()
+        checks = []
+        with self._lock:
+            slot = self._advance(when)
+            self._stats["votes"] += 1
+            target_votes = self.votes.add(slot, "t:" + target)
+            if voter:
+                checks.append(("burst", "voter " + voter, self.votes.add(slot, "v:" + voter), VOTER_BURST))
+            if session:
+                session_votes = self.votes.add(slot, "s:" + session)
+                checks.append(("burst", "session " + session, session_votes, SESSION_BURST))
+                repeats = self.pairs.add(slot, f"{session}>{target}")
+                checks.append(("ring", "target " + target, repeats, REPEAT_VOTES))
+                # Distinct counts are only estimated when the vote counts make a flag possible
+                if voter:
+                    if self.names.add(slot, session, voter) and session_votes > NAMES_PER_SESSION:
+                        # A session cannot have used more names than it cast votes
+                        names = min(self.names.estimate(session), session_votes)
+                        checks.append(("name cycling", "session " + session, names, NAMES_PER_SESSION))
+                self.sessions.add(slot, target, session)
+                # Checked every RING_MIN_VOTES votes a target gets, not on each one
+                if target_votes % RING_MIN_VOTES == 0 and self.sessions.estimate(target) <= RING_MAX_SESSIONS:
+                    checks.append(("ring", "target " + target, target_votes, RING_MIN_VOTES - 1))
+            new = []
+            for reason, key, value, limit in checks:
+                if value <= limit or (reason, key) in self._flagged:
+                    continue  # fine, or already flagged in this window
+                self._flagged[(reason, key)] = self._epoch
+                new.append((reason, key, value, limit))
+            while self._flagged and (len(self._flagged) > FLAG_MEMORY or
+                                     next(iter(self._flagged.values())) <= self._epoch - self.buckets):
+                self._flagged.popitem(last=False)
+            self._stats["flags"] += len(new)
+        return new
+
+    def count(self, key):
+        with self._lock:
+            return self.votes.count(key)
+
+    def handle(self, event):
+        # VOTE event subscriber; flags go to the shared store for mentors
+        target = event.get("project_id") or event.get("email")
+        if not target:
+            return
+        when = datetime.datetime.fromisoformat(event["timestamp"])
+        for reason, key, value, limit in self.observe(target, event.get("voter"), event.get("session"), when):
+            self.store.add_vote_flag({
+                "reason": reason, "key": key, "value": value, "limit": limit,
+                "target": target, "voter": event.get("voter"), "flagged_at": event["timestamp"]
+            })
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "memory_bytes": sum(s.nbytes() for s in (self.votes, self.pairs, self.names, self.sessions))}
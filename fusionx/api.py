@@ -0,0 +1,350 @@
+# fusionx/api.py
+# Read-only JSON API for school dashboards and integrations, run next to the
+# Streamlit app as its own ASGI process so polling it never starts a session:
+#
+#     FUSIONX_STATE_URL=redis://... uvicorn --factory fusionx.api:create_app --port 8600
+#
+# It reads the same shared store as the app (so it needs the Redis backend to
+# see the app's data), plus the public portfolio pages the static site
+# exporter writes (portfolios only live in session state).
+#
+#     GET /api/competitions?status=active|pending|closed|archived
+#     GET /api/leaderboards/votes | /api/leaderboards/xp?period=week|month|all
+#         | /api/leaderboards/trending?kind=portfolios|projects|competitions
+#     GET /api/portfolios, /api/portfolios/<slug>
+#     GET /api/winners?week=2026-W42
+#
+# Lists are paginated with ?page= and ?per_page=. Every response carries an
+# ETag (a hash of the body) and Last-Modified, and is gzipped when the client
+# accepts it. The store bumps a version counter for each resource on every
+# write it depends on; a rendered response is reused while that counter is
+# unchanged (and for at most ttl seconds, since trending scores decay and
+# competitions open with time), so a conditional GET from a polling client
+# costs one HGET and a 304. Requests are handled on worker threads, since even
+# that HGET is a blocking round trip to the store.
+#
+# The API is as public as the static site: students appear by portfolio slug
+# and display name, never by email.
+import asyncio
+import collections
+import datetime
+import email.utils
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+from fusionx.campus import DEFAULT_CAMPUS, CampusRouter, campus_dir
+from fusionx.lifecycle import competition_phase
+from fusionx.rollups import week_key
+from fusionx.site import DIGESTS, portfolio_slug, public_results
+from fusionx.trending import Trending
+from fusionx.xp import XPLedger
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+LEADERBOARD_SIZE = 1000  # students ranked on the XP leaderboard
+GZIP_MIN_BYTES = 512  # smaller bodies are sent as they are
+CACHE_TTL = 30.0
+STATUSES = ["active", "pending", "closed", "archived"]
+XP_PERIODS = ["week", "month", "all"]
+TRENDING_KINDS = ["portfolios", "projects", "competitions"]
+WEEK_PATTERN = re.compile(r"^\d{4}-W\d{2}$")
+SITE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "site")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def paginate(items, params):
+    try:
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, "page and per_page must be integers")
+    if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"page must be >= 1 and per_page between 1 and {MAX_PAGE_SIZE}")
+    start = (page - 1) * per_page
+    return {
+        "items": items[start:start + per_page],
+        "page": page,
+        "per_page": per_page,
+        "total": len(items),
+        "next_page": page + 1 if start + per_page < len(items) else None
+    }
+
+
+def choice(params, name, options, default):
+    value = params.get(name, default)
+    if value not in options:
+        raise ApiError(400, f"{name} must be one of: {', '.join(options)}")
+    return value
+
+
+def etag_matches(header, etag):
+    # If-None-Match may list several tags, weak ones, or "*"; the gzip variant has its own suffix
+    tags = [t.strip().removeprefix("W/").replace("-gzip\"", "\"") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+class Rendered:
+    __slots__ = ("version", "expires", "etag", "last_modified", "body", "gzipped")
+
+    def __init__(self, version, expires, etag, last_modified, body):
+        self.version = version
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.gzipped = None  # compressed on first request that accepts gzip
+
+
+class ApiApp:
+    def __init__(self, store, site_dir=SITE_DIR, ttl=CACHE_TTL, cache_size=256):
+        self.store = store
+        self.site_dir = site_dir
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.xp = XPLedger(store)
+        self.trending = Trending(store)
+        self._rendered = collections.OrderedDict()  # (path, query) -> Rendered
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "not_modified": 0, "renders": 0}
+        # path prefix -> (version resource, handler)
+        self.routes = {
+            "/api/competitions": ("competitions", self.competitions),
+            "/api/leaderboards/votes": ("leaderboards", self.votes),
+            "/api/leaderboards/xp": ("leaderboards", self.xp_leaderboard),
+            "/api/leaderboards/trending": ("leaderboards", self.trending_leaderboard),
+            "/api/portfolios": (None, self.portfolios),
+            "/api/winners": ("winners", self.winners)
+        }
+
+    # --- Resources ---
+    def competitions(self, params, rest):
+        status = choice(params, "status", STATUSES + ["all"], "all")
+        items = []
+        if status != "archived":
+            closed = self.store.closed_competitions()
+            participants = self.store.participants()
+            for comp in self.store.list_competitions():
+                count = len(participants.get(comp['title'], []))
+                phase = competition_phase(comp, count, comp['title'] in closed)
+                if status in ("all", phase):
+                    items.append({
+                        "title": comp['title'], "description": comp.get('description'), "field": comp.get('field'),
+                        "status": phase, "participants": count, "threshold": comp.get('threshold'),
+                        "opens_at": comp.get('opens_at'), "closes_at": comp.get('closes_at')
+                    })
+        if status in ("all", "archived"):
+            for title, record in sorted(self.store.archived_competitions().items()):
+                comp = record['competition']
+                items.append({
+                    "title": title, "description": comp.get('description'), "field": comp.get('field'),
+                    "status": "archived", "participants": len(record['participants']), "threshold": comp.get('threshold'),
+                    "opens_at": comp.get('opens_at'), "closes_at": record['closed_at'], "winners": public_results(record['results'])
+                })
+        return paginate(items, params)
+
+    def _names(self):
+        # Display names by portfolio slug, published by the static site (the store only has emails)
+        try:
+            with open(os.path.join(self.site_dir, "leaderboards.json"), encoding="utf-8") as f:
+                return json.load(f).get("names", {})
+        except (OSError, ValueError):
+            return {}
+
+    def votes(self, params, rest):
+        names = self._names()
+        ranking = []
+        for student, counts in self.store.portfolio_votes().items():
+            yes = counts["yes"] if isinstance(counts, dict) else counts
+            slug = portfolio_slug(student)
+            ranking.append({"student": slug, "name": names.get(slug), "votes": yes})
+        ranking.sort(key=lambda r: r["votes"], reverse=True)
+        return paginate(ranking, params)
+
+    def xp_leaderboard(self, params, rest):
+        period = choice(params, "period", XP_PERIODS, "week")
+        today = datetime.date.today()
+        start = {"week": today - datetime.timedelta(days=today.weekday()), "month": today.replace(day=1), "all": None}[period]
+        names = self._names()
+        board = self.xp.leaderboard(start, today if start else None, k=LEADERBOARD_SIZE)
+        return {"period": period, **paginate(
+            [{"student": portfolio_slug(s), "name": names.get(portfolio_slug(s)), "xp": int(xp)} for s, xp in board], params)}
+
+    def trending_leaderboard(self, params, rest):
+        kind = choice(params, "kind", TRENDING_KINDS, "portfolios")
+        items = []
+        for item, score, info in self.trending.top(kind, 50):
+            if kind == "portfolios":
+                item = portfolio_slug(item)
+            if info and "email" in info:
+                if item.startswith(info["email"] + "/"):  # projects from before ids are keyed by owner email
+                    item = portfolio_slug(info["email"]) + item[len(info["email"]):]
+                info = {"student": portfolio_slug(info["email"]), "title": info.get("title")}
+            items.append({"item": item, "score": round(score, 2), "info": info})
+        return {"kind": kind, **paginate(items, params)}
+
+    def portfolios(self, params, rest):
+        try:
+            with open(os.path.join(self.site_dir, DIGESTS), encoding="utf-8") as f:
+                digests = json.load(f)
+        except (OSError, ValueError):
+            digests = {}
+        if rest:
+            if rest not in digests or not rest.startswith("portfolio-"):
+                raise ApiError(404, "No such portfolio")
+            with open(os.path.join(self.site_dir, rest + ".json"), encoding="utf-8") as f:
+                return {"slug": rest, **json.load(f)}
+        items = [{"slug": slug, "name": info["title"], "url": f"/api/portfolios/{slug}"}
+                 for slug, info in sorted(digests.items(), key=lambda x: x[1]["title"] or "") if slug.startswith("portfolio-")]
+        return paginate(items, params)
+
+    def winners(self, params, rest):
+        week = params.get("week") or week_key()
+        if not WEEK_PATTERN.match(week):
+            raise ApiError(400, "week must look like 2026-W42")
+        try:  # 2026-W99 matches the pattern but is not a week
+            datetime.date.fromisocalendar(int(week[:4]), int(week[6:]), 1)
+        except ValueError:
+            raise ApiError(404, f"No such week: {week}")
+        records = [{**r, "results": public_results(r.get("results", []))} for r in self.store.rollup_records(week, "closed")]
+        return {"week": week, **paginate(records, params)}
+
+    # --- HTTP ---
+    def _version(self, resource):
+        if resource is not None:
+            return self.store.version(resource)
+        try:  # portfolios change when the site exporter rewrites its digests
+            return os.stat(os.path.join(self.site_dir, DIGESTS)).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _route(self, path):
+        for prefix, route in self.routes.items():
+            if path == prefix:
+                return route, ""
+            if path.startswith(prefix + "/") and prefix == "/api/portfolios":
+                return route, path[len(prefix) + 1:]
+        raise ApiError(404, "Not found")
+
+    def render(self, path, query):
+        # Rendered response for path?query, reused while its resource version is unchanged
+        (resource, handler), rest = self._route(path.rstrip("/"))
+        version = self._version(resource)
+        key = (path, query)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is not None and cached.version == version and now < cached.expires:
+                self._rendered.move_to_end(key)
+                return cached
+        params = dict(urllib.parse.parse_qsl(query))
+        body = json.dumps(handler(params, rest), sort_keys=True, default=str).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        # Unchanged bodies keep their Last-Modified, so If-Modified-Since still works after a rebuild
+        last_modified = cached.last_modified if cached is not None and cached.etag == etag else time.time()
+        rendered = Rendered(version, now + self.ttl, etag, last_modified, body)
+        with self._lock:
+            self._stats["renders"] += 1
+            self._rendered[key] = rendered
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
+        return rendered
+
+    def respond(self, method, path, query, headers):
+        # (status, [(name, value)], body) for one request; headers are lower-cased names
+        with self._lock:
+            self._stats["requests"] += 1
+        if method not in ("GET", "HEAD"):
+            return self._error(405, "Read-only API", [("allow", "GET, HEAD")])
+        try:
+            rendered = self.render(path, query)
+        except ApiError as e:
+            return self._error(e.status, str(e))
+        use_gzip = "gzip" in headers.get("accept-encoding", "") and len(rendered.body) >= GZIP_MIN_BYTES
+        etag = rendered.etag[:-1] + '-gzip"' if use_gzip else rendered.etag
+        response_headers = [
+            ("etag", etag),
+            ("last-modified", email.utils.formatdate(rendered.last_modified, usegmt=True)),
+            ("cache-control", "no-cache"),  # always revalidate; a 304 is cheap
+            ("vary", "Accept-Encoding")
+        ]
+        if self._not_modified(headers, rendered):
+            with self._lock:
+                self._stats["not_modified"] += 1
+            return 304, response_headers, b""
+        body = rendered.body
+        if use_gzip:
+            if rendered.gzipped is None:
+                rendered.gzipped = gzip.compress(rendered.body, compresslevel=6)
+            body = rendered.gzipped
+            response_headers.append(("content-encoding", "gzip"))
+        response_headers += [("content-type", "application/json"), ("content-length", str(len(body)))]
+        return 200, response_headers, b"" if method == "HEAD" else body
+
+    def _not_modified(self, headers, rendered):
+        if "if-none-match" in headers:
+            return etag_matches(headers["if-none-match"], rendered.etag)
+        if "if-modified-since" in headers:
+            try:
+                since = email.utils.parsedate_to_datetime(headers["if-modified-since"]).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(rendered.last_modified) <= since
+        return False
+
+    def _error(self, status, message, extra_headers=()):
+        body = json.dumps({"error": message}).encode("utf-8")
+        return status, [("content-type", "application/json"), ("content-length", str(len(body))), *extra_headers], body
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "cached": len(self._rendered)}
+
+    # --- ASGI ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        # Store reads block (a Redis round trip, or a log replay on a cold cache), so keep them off the event loop
+        status, response_headers, body = await asyncio.to_thread(
+            self.respond, scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"), headers)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(n.encode("latin-1"), v.encode("latin-1")) for n, v in response_headers]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_app():
+    # One API process per campus (FUSIONX_API_CAMPUS), reading only that campus's partition
+    campus = os.environ.get("FUSIONX_API_CAMPUS", DEFAULT_CAMPUS)
+    return ApiApp(CampusRouter.from_env().store(campus),
+                  site_dir=os.environ.get("FUSIONX_SITE_DIR", campus_dir(SITE_DIR, campus)),
+                  ttl=float(os.environ.get("FUSIONX_API_TTL", CACHE_TTL)))
+
+
+if __name__ == "__main__":
+    import uvicorn  # optional dependency, only needed to serve the API
+
+    uvicorn.run(create_app(), host=os.environ.get("FUSIONX_API_HOST", "127.0.0.1"),
+                port=int(os.environ.get("FUSIONX_API_PORT", "8600")))
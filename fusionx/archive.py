@@ -0,0 +1,168 @@
+# fusionx/archive.py
+# Cold tier for competitions that closed more than after_days ago.
+#
+# Archiving a competition moves it out of every hot structure (competition
+# list, participant lists, membership bitmaps, lifecycle and results hashes)
+# into one small archive record in the shared store (competition, field,
+# participants, winners) plus the submissions written as compressed
+# columnar segments under root/<slug>/. Uploaded files stay where they are,
+# in the content-addressed blob store, and segments reference them by hash.
+#
+# Submissions live in each session's state, so every session that holds
+# submissions for an archived competition writes them as its own segment
+# (named by a digest of its rows) and drops them; the record is written once.
+#
+# Archived competitions are read-only and only loaded when someone opens one;
+# the last few loads are kept in memory. Segments are zstd Parquet (needs
+# pyarrow) or gzip JSON lines.
+import collections
+import datetime
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from fusionx.bundles import bundle_digest, manifest_rows, slugify
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ["parquet", "jsonl"]
+SEGMENT_FIELDS = ["id", "title", "submitter", "email", "description", "file", "file_size", "file_ref", "submitted_at"]
+
+
+def as_submission(row):
+    # Segment row -> submission dict as the app and BundleExporter expect it
+    return {"id": row["id"], "title": row["title"], "submitter": row["submitter"], "submitter_email": row["email"],
+            "description": row["description"], "file": row["file"], "file_size": row["file_size"],
+            "file_ref": row["file_ref"], "timestamp": row["submitted_at"]}
+
+
+class CompetitionArchive:
+    def __init__(self, store, root, fmt="parquet", after_days=7, cache_size=8):
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401  optional dependency, only needed for Parquet
+            except ImportError:
+                logger.warning("pyarrow is not installed; archiving submissions as JSONL")
+                fmt = "jsonl"
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {fmt}")
+        self.store = store
+        self.root = root
+        self.fmt = fmt
+        self.after_days = after_days
+        self.cache_size = cache_size
+        self._loaded = collections.OrderedDict()  # (title, segments) -> archived competition
+        self._lock = threading.Lock()
+        self._stats = {"archived": 0, "segments": 0, "loads": 0, "load_hits": 0}
+        os.makedirs(root, exist_ok=True)
+
+    # --- Archiving ---
+    def due(self, now=None):
+        # Titles closed more than after_days ago
+        cutoff = (now or datetime.datetime.now()) - datetime.timedelta(days=self.after_days)
+        return [title for title, closed_at in self.store.closed_times().items()
+                if datetime.datetime.fromisoformat(closed_at) <= cutoff]
+
+    def sweep(self, session_submissions, now=None):
+        # Archives due competitions and moves this session's submissions for
+        # archived ones out of session_submissions; returns the titles moved
+        for title in self.due(now):
+            self.archive(title)
+        moved = [title for title in session_submissions if self.store.is_archived(title)]
+        for title in moved:
+            self.write_segment(title, session_submissions.pop(title))
+        return moved
+
+    def archive(self, title):
+        comp = next((c for c in self.store.list_competitions() if c['title'] == title), {"title": title})
+        record = {
+            "competition": comp,
+            "participants": self.store.participants([title])[title],
+            "results": self.store.competition_results().get(title, []),
+            "closed_at": self.store.closed_times().get(title),
+            "archived_at": datetime.datetime.now().isoformat()
+        }
+        if not self.store.archive_competition(title, record):
+            return False  # another session got there first
+        with self._lock:
+            self._stats["archived"] += 1
+        return True
+
+    def write_segment(self, title, submissions):
+        # One segment per distinct set of submissions; file bytes stay in the blob store
+        manifest = manifest_rows(submissions)
+        if not manifest:
+            return None
+        rows = [{f: row[f] for f in SEGMENT_FIELDS} for row in manifest]
+        ext = "parquet" if self.fmt == "parquet" else "jsonl.gz"
+        path = os.path.join(self.root, slugify(title), f"{bundle_digest(title, manifest)}.{ext}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".segment-")
+            os.close(fd)
+            try:
+                if self.fmt == "parquet":
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                    schema = pa.schema([(f, pa.int64() if f == "file_size" else pa.string()) for f in SEGMENT_FIELDS])
+                    pq.write_table(pa.Table.from_pylist(rows, schema=schema), tmp_path, compression="zstd")
+                else:
+                    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                        for row in rows:
+                            f.write(json.dumps(row, default=str) + "\n")
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self._stats["segments"] += 1
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        self.store.add_archive_segment(title, os.path.relpath(path, self.root))
+        return path
+
+    # --- Reading (lazy, read-only) ---
+    def titles(self):
+        return self.store.archived_titles()
+
+    def results(self):
+        # {title: winners} of every archived competition
+        return {title: record["results"] for title, record in self.store.archived_competitions().items()}
+
+    def _read_segment(self, path):
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            return pq.read_table(path).to_pylist()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def load(self, title):
+        # {"competition", "participants", "results", "closed_at", "archived_at", "submissions"} or None
+        record = self.store.archived_competitions().get(title)
+        if record is None:
+            return None
+        segments = self.store.archive_segments(title)
+        key = (title, tuple(segments))
+        with self._lock:
+            self._stats["loads"] += 1
+            if key in self._loaded:
+                self._stats["load_hits"] += 1
+                self._loaded.move_to_end(key)
+                return self._loaded[key]
+        submissions = {}
+        for segment in segments:
+            for row in self._read_segment(os.path.join(self.root, segment)):
+                submissions[row["id"]] = as_submission(row)  # the same submission can be in several sessions' segments
+        loaded = {**record, "submissions": list(submissions.values())}
+        with self._lock:
+            self._loaded[key] = loaded
+            while len(self._loaded) > self.cache_size:
+                self._loaded.popitem(last=False)
+        return loaded
+
+    def stats(self):
+        # Counters are for this process; "in_memory" is the number of loaded competitions kept
+        with self._lock:
+            return {**self._stats, "in_memory": len(self._loaded)}
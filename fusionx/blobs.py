@@ -0,0 +1,84 @@
+# fusionx/blobs.py
+# Content-addressed file storage for uploads.
+#
+# Uploaded files are copied to disk in fixed-size chunks and referenced by the
+# SHA-256 of their contents ("file_ref"), so submissions and portfolios no
+# longer carry the raw bytes around in st.session_state. Identical uploads
+# are stored once. Every server process pointing at the same directory sees
+# the same blobs.
+import hashlib
+import os
+import shutil
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, root, chunk_size=CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, ref):
+        return os.path.join(self.root, ref[:2], ref[2:])
+
+    def exists(self, ref):
+        return bool(ref) and os.path.exists(self.path(ref))
+
+    def size(self, ref):
+        return os.path.getsize(self.path(ref))
+
+    def open(self, ref):
+        return open(self.path(ref), "rb")
+
+    def stage(self, fileobj):
+        # Streams fileobj to a temp file in the store while hashing; returns (ref, temp path)
+        # for keep() or discard(), so a file can be checked before anything references it
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = fileobj.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            return digest.hexdigest(), tmp_path
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+
+    def keep(self, ref, tmp_path):
+        # Moves a staged file into place
+        try:
+            target = self.path(ref)
+            if os.path.exists(target):
+                os.remove(tmp_path)  # already stored
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return ref
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+
+    def discard(self, tmp_path):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    def put(self, fileobj):
+        return self.keep(*self.stage(fileobj))
+
+    def put_upload(self, upload):
+        # Streamlit UploadedFile (or None) -> {"file", "file_ref", "file_size"}
+        if upload is None:
+            return {"file": None, "file_ref": None, "file_size": 0}
+        upload.seek(0)
+        ref = self.put(upload)
+        return {"file": upload.name, "file_ref": ref, "file_size": self.size(ref)}
+
+    def copy_to(self, ref, dest):
+        with self.open(ref) as src:
+            shutil.copyfileobj(src, dest, self.chunk_size)
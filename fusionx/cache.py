@@ -0,0 +1,169 @@
+# fusionx/cache.py
+# Byte-budgeted LRU cache for heavy per-session objects (generated PDFs,
+# avatar data URIs, ...), shared by every session in this server process.
+#
+# Each entry belongs to a session (or to "shared"). Two budgets apply:
+#   - per session: a session that goes over evicts its own oldest entries
+#   - global: when all sessions together go over, the least recently used
+#     entries of any session are evicted
+# Values above spill_threshold are written to spill_dir instead of being kept
+# in memory; spilled files have their own disk budget and are evicted the same
+# way. Sessions that end simply age out, so memory is bounded on a busy day
+# without relying on cleanup.
+import collections
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+SHARED = "shared"  # session id for entries every session can use (e.g. avatars)
+
+
+def content_key(kind, *parts):
+    # Cache key that changes whenever the content a value was built from changes
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{kind}:{digest[:32]}"
+
+
+class Entry:
+    __slots__ = ("value", "path", "size")
+
+    def __init__(self, value, path, size):
+        self.value = value  # bytes, or None when spilled
+        self.path = path  # spill file, or None when in memory
+        self.size = size
+
+
+class ByteBudgetCache:
+    def __init__(self, budget_bytes=256 * 1024 * 1024, session_budget_bytes=16 * 1024 * 1024,
+                 spill_dir=None, spill_threshold=256 * 1024, disk_budget_bytes=2 * 1024 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.session_budget_bytes = session_budget_bytes
+        self.spill_dir = spill_dir
+        self.spill_threshold = spill_threshold
+        self.disk_budget_bytes = disk_budget_bytes
+
+        self._entries = collections.OrderedDict()  # (session, key) -> Entry, least recently used first
+        self._session_bytes = collections.Counter()  # session -> bytes (memory + disk)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "spills": 0, "rejected": 0}
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            for name in os.listdir(spill_dir):  # left over from a previous run; the index lives in memory
+                try:
+                    os.remove(os.path.join(spill_dir, name))
+                except OSError:
+                    pass
+
+    # --- Reading ---
+    def get(self, session, key):
+        with self._lock:
+            entry = self._entries.get((session, key))
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end((session, key))
+            self._stats["hits"] += 1
+            path = entry.path
+            if path is None:
+                return entry.value
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:  # spill file removed underneath us (evicted, or replaced by a newer put)
+            with self._lock:
+                entry = self._entries.get((session, key))
+                if entry is not None and entry.path == path:
+                    self._remove((session, key), count=False)
+            return None
+
+    def get_or_create(self, session, key, factory):
+        value = self.get(session, key)
+        if value is None:
+            value = factory()
+            self.put(session, key, value)
+        return value
+
+    # --- Writing ---
+    def put(self, session, key, value):
+        value = bytes(value)
+        size = len(value)
+        limit = self.session_budget_bytes if session != SHARED else self.budget_bytes
+        if size > limit:
+            with self._lock:
+                self._stats["rejected"] += 1
+            return False
+        path = None
+        if self.spill_dir and size >= self.spill_threshold:
+            # Unique per put, so replacing a spilled value never removes the file just written
+            name = hashlib.sha256(f"{session}\0{key}".encode("utf-8")).hexdigest()[:32] + "-" + uuid.uuid4().hex[:12]
+            path = os.path.join(self.spill_dir, name)
+            with open(path, "wb") as f:
+                f.write(value)
+        with self._lock:
+            self._remove((session, key), count=False)
+            self._entries[(session, key)] = Entry(None if path else value, path, size)
+            self._session_bytes[session] += size
+            if path:
+                self._disk_bytes += size
+                self._stats["spills"] += 1
+            else:
+                self._memory_bytes += size
+            self._evict(session)
+        return True
+
+    def discard(self, session, key):
+        with self._lock:
+            self._remove((session, key), count=False)
+
+    def drop_session(self, session):
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == session]:
+                self._remove(entry_key, count=False)
+
+    # --- Eviction ---
+    def _remove(self, entry_key, count=True):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self._session_bytes[entry_key[0]] -= entry.size
+        if self._session_bytes[entry_key[0]] <= 0:
+            del self._session_bytes[entry_key[0]]
+        if entry.path:
+            self._disk_bytes -= entry.size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        else:
+            self._memory_bytes -= entry.size
+        if count:
+            self._stats["evictions"] += 1
+
+    def _evict(self, session):
+        if session != SHARED and self._session_bytes[session] > self.session_budget_bytes:
+            for entry_key in [k for k in self._entries if k[0] == session]:
+                if self._session_bytes[session] <= self.session_budget_bytes:
+                    break
+                self._remove(entry_key)
+        while self._memory_bytes > self.budget_bytes:
+            self._remove(next(k for k, e in self._entries.items() if e.path is None))
+        while self._disk_bytes > self.disk_budget_bytes:
+            self._remove(next(k for k, e in self._entries.items() if e.path is not None))
+
+    # --- Stats ---
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            lookups = snapshot["hits"] + snapshot["misses"]
+            snapshot.update({
+                "hit_rate": snapshot["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "sessions": len(self._session_bytes),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes
+            })
+        return snapshot
@@ -0,0 +1,127 @@
+# fusionx/campus.py
+# Campus (tenant) partitioning.
+#
+# Every campus has its own partition of the shared state: a SharedStore whose
+# keys live under the campus namespace ("fusionx:<campus>:..."), on the state
+# backend (e.g. a Redis shard) the routing table assigns to it. Campus pages
+# only ever read their own partition. The "global" partition holds
+# cross-campus competitions, which every campus lists and can join. Their
+# lifecycle events go out on the global partition's event bus, which each
+# campus's webhooks, CDC export and newsletter rollups follow as well as
+# their own (integration_buses).
+#
+# The routing table comes from FUSIONX_CAMPUSES, JSON (or the path of a JSON
+# file) like
+#     {"north": {"state_url": "redis://shard-a:6379/0", "app_url": "https://north.fusionx.example"},
+#      "south": {"state_url": "redis://shard-b:6379/0"}}
+# Campuses without a state_url use FUSIONX_STATE_URL. The default "main"
+# campus keeps the original un-prefixed namespace, so existing data stays put.
+#
+# FUSIONX_SERVE_CAMPUSES lists the campuses this process serves ("*" for
+# all); others are sent to their app_url. A campus moves to another process
+# by adding it there and pointing its app_url at it, since its data lives on
+# its shard, not in the process.
+#
+# A browser session belongs to one campus at a time; its session-only data
+# (accounts, portfolios, submissions, ...) is kept per campus and swapped
+# when the session switches campus.
+import json
+import os
+import threading
+
+from fusionx.state import SharedStore, backend_from_url
+
+DEFAULT_CAMPUS = "main"
+GLOBAL_CAMPUS = "global"
+NAMESPACE = "fusionx"
+# Session state that belongs to the campus being viewed
+CAMPUS_SESSION_KEYS = {
+    "badges", "competition_submissions", "current_projects", "gamified_challenges",
+    "last_submission_count", "my_competitions", "portfolios", "student_accounts"
+}
+CAMPUS_SESSION_PREFIXES = ("chat_log_", "comment_pages_")
+
+
+def campus_namespace(campus):
+    return NAMESPACE if campus == DEFAULT_CAMPUS else f"{NAMESPACE}:{campus}"
+
+
+def campus_dir(base, campus):
+    # Per-campus runtime directory; the default campus keeps using base itself
+    return base if campus == DEFAULT_CAMPUS else os.path.join(base, "campuses", campus)
+
+
+def integration_buses(event_bus, campus):
+    # Buses a campus's outbound integrations subscribe to; event_bus(campus) is a partition's bus
+    if campus == GLOBAL_CAMPUS:
+        return [event_bus(GLOBAL_CAMPUS)]
+    return [event_bus(campus), event_bus(GLOBAL_CAMPUS)]
+
+
+def load_routes(value):
+    if not value:
+        return {}
+    if not value.lstrip().startswith("{"):
+        with open(value, encoding="utf-8") as f:
+            value = f.read()
+    return json.loads(value)
+
+
+class CampusRouter:
+    def __init__(self, routes=None, default_url=None, served="*"):
+        self.routes = routes or {}
+        self.default_url = default_url
+        self.served = None if served in (None, "*") else set(served)
+        self._backends = {}  # state URL -> backend, shared by the campuses on one shard
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        served = os.environ.get("FUSIONX_SERVE_CAMPUSES", "*")
+        return cls(
+            load_routes(os.environ.get("FUSIONX_CAMPUSES")),
+            default_url=os.environ.get("FUSIONX_STATE_URL"),
+            served=served if served == "*" else [c.strip() for c in served.split(",") if c.strip()]
+        )
+
+    def campuses(self):
+        # Campuses students can pick (the global partition is not one)
+        return [DEFAULT_CAMPUS] + sorted(c for c in self.routes if c not in (DEFAULT_CAMPUS, GLOBAL_CAMPUS))
+
+    def state_url(self, campus):
+        return self.routes.get(campus, {}).get("state_url") or self.default_url
+
+    def store(self, campus):
+        url = self.state_url(campus)
+        with self._lock:
+            if url not in self._backends:
+                self._backends[url] = backend_from_url(url)
+            backend = self._backends[url]
+        return SharedStore(backend, namespace=campus_namespace(campus))
+
+    def serves(self, campus):
+        return self.served is None or campus in self.served
+
+    def app_url(self, campus):
+        return self.routes.get(campus, {}).get("app_url")
+
+
+def is_campus_key(key):
+    return key in CAMPUS_SESSION_KEYS or key.startswith(CAMPUS_SESSION_PREFIXES)
+
+
+def switch_campus(state, campus):
+    # Stashes the session data of the campus being left and restores campus's
+    current = state.get("active_campus")
+    if current == campus:
+        return False
+    stash = state.setdefault("campus_data", {})
+    if current is not None:
+        keys = [k for k in list(state.keys()) if is_campus_key(k)]
+        stash[current] = {k: state[k] for k in keys}
+        for k in keys:
+            del state[k]
+    for k, v in stash.pop(campus, {}).items():
+        state[k] = v
+    state["active_campus"] = campus
+    return True
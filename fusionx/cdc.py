@@ -0,0 +1,262 @@
+# fusionx/cdc.py
+# Change-data-capture export: every domain event, appended to compressed
+# segment files for offline reporting and audits.
+#
+# CDCExporter.submit() is an event-bus subscriber; it only puts the event on a
+# bounded queue, and a background thread writes it to the current segment.
+# A segment is closed ("rotated") once it reaches max_bytes or max_seconds,
+# and only then renamed from its ".partial" name, so readers only ever see
+# complete files. Formats:
+#   - "jsonl":   gzip-compressed JSON lines (events-<start>-<pid>-<seq>.jsonl.gz)
+#   - "parquet": zstd-compressed Parquet with timestamp, type and the event
+#                as a JSON column (needs pyarrow; falls back to jsonl)
+#
+# Events reach disk as they arrive, in both formats: the open segment (for
+# Parquet, a gzip JSON lines spool that is converted on rotation) is flushed
+# whenever the queue runs empty, at most every poll_interval. The open
+# segment is sealed when the process exits normally (atexit), and segments
+# left ".partial" by a process that died are sealed by the next exporter
+# started on the same directory, keeping every event up to the last flush.
+#
+# If the writer falls behind and the queue fills up, new events are counted
+# as dropped rather than blocking the page.
+#
+# Exported: proposals, competition activation / closing / deletion, joins,
+# submissions (new, updated, deleted), mentor scores, votes, comments, chat,
+# accounts (created, updated), portfolio projects and their verification,
+# badges and winners. Not exported: session-only state with no event of its
+# own (gamified challenge progress, cached PDFs, drafts in forms).
+import atexit
+import datetime
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+CDC_FORMATS = ["jsonl", "parquet"]
+SPOOL = ".jsonl.gz"  # appended to a Parquet segment's name for its spool
+_SEGMENT_PID = re.compile(r"^events-\d{8}T\d{6}-(\d+)-\d+\.")
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def read_events(path):
+    # Events of a gzip JSON lines file, up to the last complete line (the file may be cut short)
+    decompressor = zlib.decompressobj(wbits=31)
+    data = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            try:
+                data.append(decompressor.decompress(chunk))
+            except zlib.error:
+                break
+    events = []
+    for line in b"".join(data).split(b"\n")[:-1]:  # the part after the last newline is incomplete
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            pass
+    return events
+
+
+class CDCExporter:
+    def __init__(self, out_dir, fmt="jsonl", max_bytes=64 * 1024 * 1024, max_seconds=3600.0,
+                 queue_size=10000, poll_interval=1.0):
+        if fmt == "parquet":
+            try:
+                import pyarrow  # optional dependency, only needed for Parquet
+                import pyarrow.parquet  # noqa: F401
+                # Building the first table imports more modules (pandas, if installed);
+                # do it now, since the segment sealed at exit cannot import anything
+                pyarrow.table({"type": ["warm-up"]})
+            except ImportError:
+                logger.warning("pyarrow is not installed; writing CDC segments as JSONL")
+                fmt = "jsonl"
+        if fmt not in CDC_FORMATS:
+            raise ValueError(f"Unsupported CDC format: {fmt}")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.poll_interval = poll_interval
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "segments": 0, "dropped": 0}
+        self._thread = None
+        self._seq = 0
+        self._segment = None  # {"path", "opened", "bytes", "count", "raw", "file"}
+        self._flushed_at = 0.0
+        os.makedirs(out_dir, exist_ok=True)
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self.recover()
+        self._thread = threading.Thread(target=self._run, name="fusionx-cdc", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5.0):
+        # Writes what is queued and closes the open segment
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- Event subscriber ---
+    def submit(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "backlog": self._queue.qsize()}
+
+    def segments(self):
+        # Completed segment files, oldest first
+        return sorted(name for name in os.listdir(self.out_dir) if not name.endswith(".partial"))
+
+    # --- Recovery ---
+    def recover(self):
+        # Seals segments left ".partial" by exporters that are gone; returns how many events were kept
+        kept = 0
+        for name in sorted(os.listdir(self.out_dir)):
+            if not name.endswith(".partial"):
+                continue
+            path = os.path.join(self.out_dir, name)
+            if name.endswith(".recovered.partial"):
+                os.remove(path)  # an interrupted recovery; its source is still there
+                continue
+            match = _SEGMENT_PID.match(name)
+            try:
+                stale = time.time() - os.path.getmtime(path) > self.max_seconds + 60
+            except OSError:
+                continue
+            if match and pid_alive(int(match.group(1))) and not stale:
+                continue  # still being written, by another server process or another exporter in this one
+            try:
+                kept += self._seal_orphan(path[:-len(".partial")])
+            except Exception:
+                logger.exception("Could not recover CDC segment %s", name)
+        return kept
+
+    def _seal_orphan(self, partial):
+        # partial: the ".partial" file's name without that suffix
+        if partial.endswith(".parquet"):
+            # Parquet being written when the process died; its spool is still there
+            os.remove(partial + ".partial")
+            return 0
+        if partial.endswith(".parquet" + SPOOL):
+            final = partial[:-len(SPOOL)]
+            events = [] if os.path.exists(final) else read_events(partial + ".partial")
+            if events:
+                self._write_parquet(final, events)
+            os.remove(partial + ".partial")
+        else:
+            events = read_events(partial + ".partial")
+            if events:
+                with gzip.open(partial + ".recovered.partial", "wb") as f:
+                    for event in events:
+                        f.write(json.dumps(event, default=str).encode("utf-8") + b"\n")
+                os.replace(partial + ".recovered.partial", partial)
+            os.remove(partial + ".partial")
+        if events:
+            logger.warning("Recovered %d CDC events into %s", len(events), os.path.basename(partial))
+            with self._lock:
+                self._stats["segments"] += 1
+        return len(events)
+
+    # --- Writer thread ---
+    def _run(self):
+        while True:
+            try:
+                event = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                event = False
+            if event is None:
+                self._rotate()
+                return
+            try:
+                if event:
+                    self._write(event)
+                if self._segment and (self._segment["bytes"] >= self.max_bytes
+                                      or time.monotonic() - self._segment["opened"] >= self.max_seconds):
+                    self._rotate()
+                elif self._segment and self._queue.empty() and time.monotonic() - self._flushed_at >= self.poll_interval:
+                    self._flush()
+            except Exception:
+                logger.exception("CDC export failed")
+
+    def _flush(self):
+        # Everything written so far becomes readable from the .partial file (a gzip sync point)
+        self._segment["file"].flush()
+        self._segment["raw"].flush()
+        self._flushed_at = time.monotonic()
+
+    def _open(self):
+        self._seq += 1
+        started = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        ext = "jsonl.gz" if self.fmt == "jsonl" else "parquet"
+        # The pid keeps segments of several server processes sharing out_dir apart
+        path = os.path.join(self.out_dir, f"events-{started}-{os.getpid()}-{self._seq:06d}.{ext}")
+        self._segment = {"path": path, "opened": time.monotonic(), "bytes": 0, "count": 0}
+        # JSON lines go straight into the segment; Parquet segments are spooled as JSON lines first
+        spool = path if self.fmt == "jsonl" else path + SPOOL
+        self._segment["raw"] = open(spool + ".partial", "wb")
+        self._segment["file"] = gzip.GzipFile(fileobj=self._segment["raw"], mode="wb")
+
+    def _write(self, event):
+        if self._segment is None:
+            self._open()
+        self._segment["file"].write(json.dumps(event, default=str).encode("utf-8") + b"\n")
+        self._segment["bytes"] = self._segment["raw"].tell()  # compressed bytes so far
+        self._segment["count"] += 1
+        with self._lock:
+            self._stats["written"] += 1
+
+    def _rotate(self):
+        segment, self._segment = self._segment, None
+        if segment is None:
+            return
+        segment["file"].close()
+        segment["raw"].close()
+        if self.fmt == "jsonl":
+            os.replace(segment["path"] + ".partial", segment["path"])
+        else:
+            spool = segment["path"] + SPOOL + ".partial"
+            self._write_parquet(segment["path"], read_events(spool))
+            os.remove(spool)
+        with self._lock:
+            self._stats["segments"] += 1
+
+    def _write_parquet(self, path, events):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({
+            "timestamp": [e.get("timestamp") for e in events],
+            "type": [e.get("type") for e in events],
+            "event": [json.dumps(e, default=str) for e in events]
+        })
+        pq.write_table(table, path + ".partial", compression="zstd")
+        os.replace(path + ".partial", path)
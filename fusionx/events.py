@@ -0,0 +1,61 @@
+# fusionx/events.py
+# In-process domain event bus. FusionXapp publishes an event whenever something
+# happens (a proposal, a submission, a vote, a comment, a chat message, a join,
+# a badge, a competition activating, a winner being decided, an account or
+# portfolio project being saved, a mentor score) and background services such
+# as the webhook dispatcher, the weekly rollups, trending and the CDC export
+# subscribe to them.
+#
+# Handlers run on the publisher's thread (usually a Streamlit rerun), so they
+# must only hand the event off (e.g. put it on a queue) and never block.
+import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SUBMISSION = "submission"
+COMPETITION_ACTIVATED = "competition_activated"
+WINNER = "winner"
+COMPETITION_CLOSED = "competition_closed"
+VOTE = "vote"
+JOIN = "join"
+COMMENT = "comment"
+PROPOSAL = "competition_proposed"
+CHAT = "chat"
+BADGE = "badge"
+COMPETITION_DELETED = "competition_deleted"
+SUBMISSION_UPDATED = "submission_updated"
+SUBMISSION_DELETED = "submission_deleted"
+SCORE = "score"
+ACCOUNT_CREATED = "account_created"
+ACCOUNT_UPDATED = "account_updated"
+PROJECT_SAVED = "project_saved"
+PROJECT_VERIFIED = "project_verified"
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = []  # [(handler, set_of_types or None)]
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler, types=None):
+        with self._lock:
+            self._subscribers.append((handler, set(types) if types else None))
+
+    def unsubscribe(self, handler):
+        with self._lock:
+            self._subscribers = [(h, t) for h, t in self._subscribers if h is not handler]
+
+    def publish(self, event_type, **payload):
+        event = {"type": event_type, "timestamp": datetime.datetime.now().isoformat(), **payload}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for handler, types in subscribers:
+            if types is not None and event_type not in types:
+                continue
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler %r failed for %s", handler, event_type)
+        return event
@@ -0,0 +1,279 @@
+# fusionx/judging.py
+# Balanced assignment of submissions to mentors (judges).
+#
+# Every submission is reviewed by REVIEWS_PER_SUBMISSION judges. Each judge
+# has a capacity (most reviews they take on), fields of expertise and a list
+# of conflicts (names or emails of students they must not judge; their own
+# submissions always conflict).
+#
+# Assignment is greedy on load: judges sit in one min-heap per field (plus
+# one heap of every judge) keyed by load / capacity, so a submission takes
+# the least loaded judges who know its field and are free of conflicts,
+# falling back to the least loaded judges of any field when there are not
+# enough experts. Heap entries are never updated in place: a judge whose load
+# changes gets a new entry and the old one is skipped when popped (its
+# version no longer matches), and full judges drop out until their capacity
+# is raised. Each assignment is a few heap operations, so 50,000 submissions
+# go to 500 judges in a second or two.
+#
+# New submissions are assigned as their SUBMISSION events arrive. When a
+# judge leaves or their capacity drops, their excess reviews are handed back
+# and reassigned one by one, and judges joining later take the next
+# submissions first, so the balance is kept up incrementally instead of by
+# re-solving the whole assignment.
+#
+# The roster and every assignment are appended to one log in the shared
+# store and replayed by each process, like mentor scores. Two processes can
+# pick judges for the same submission at once and both append their assigns;
+# replay keeps the first ones in the log and ignores any that would go past
+# the submission's reviews or a judge's capacity, so every process ends up
+# with the same assignment, and the loser picks again from the replayed state.
+import datetime
+import heapq
+import threading
+
+REVIEWS_PER_SUBMISSION = 3
+DEFAULT_CAPACITY = 40
+ANY_FIELD = "*"
+
+
+def conflict_names(values):
+    return {str(v).strip().lower() for v in values or () if str(v).strip()}
+
+
+class ReviewAssigner:
+    # In-memory assignment state; every change goes through apply()
+    def __init__(self, reviews=REVIEWS_PER_SUBMISSION):
+        self.reviews = reviews
+        self.judges = []  # index -> {"name", "email", "fields", "capacity", "conflicts"}
+        self._judge_index = {}  # name -> index
+        self.active = []  # index -> still on the roster
+        self.load = []  # index -> reviews assigned
+        self._version = []  # index -> bumped whenever the heap key changes
+        self._conflicts = []  # index -> lowercased names / emails
+        self._heaps = {ANY_FIELD: []}  # field -> [(load ratio, load, index, version)]
+        self.submissions = {}  # (competition, submission id) -> {"title", "submitter", "email", "field"}
+        self.assigned = {}  # (competition, submission id) -> [judge index]
+        self.queue = []  # index -> {(competition, submission id): None}, oldest first
+
+    # --- Roster ---
+    def _push(self, j):
+        self._version[j] += 1
+        profile = self.judges[j]
+        if not self.active[j] or self.load[j] >= profile["capacity"]:
+            return  # off the heaps until they leave or get more capacity
+        entry = (self.load[j] / profile["capacity"], self.load[j], j, self._version[j])
+        for field in [ANY_FIELD] + profile["fields"]:
+            heap = self._heaps.setdefault(field, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 8 * len(self.judges) + 64:
+                self._compact(field)
+
+    def _compact(self, field):
+        self._heaps[field] = [e for e in self._heaps[field] if e[3] == self._version[e[2]]]
+        heapq.heapify(self._heaps[field])
+
+    def set_judge(self, profile):
+        # Returns the keys handed back because the judge left or has less capacity
+        name = profile["name"]
+        j = self._judge_index.get(name)
+        if j is None:
+            j = self._judge_index[name] = len(self.judges)
+            self.judges.append(None)
+            self.active.append(True)
+            self.load.append(0)
+            self._version.append(0)
+            self._conflicts.append(set())
+            self.queue.append({})
+        self.judges[j] = {
+            "name": name,
+            "email": profile.get("email"),
+            "fields": list(profile.get("fields") or []),
+            "capacity": max(int(profile.get("capacity") or DEFAULT_CAPACITY), 1),
+            "conflicts": sorted(conflict_names(profile.get("conflicts")))
+        }
+        self._conflicts[j] = conflict_names(profile.get("conflicts")) | conflict_names([name, profile.get("email")])
+        self.active[j] = profile.get("active", True)
+        self._push(j)
+        limit = self.judges[j]["capacity"] if self.active[j] else 0
+        return list(self.queue[j])[limit:]  # the most recently assigned go back first
+
+    # --- Assignment ---
+    def conflicted(self, j, info):
+        conflicts = self._conflicts[j]
+        return (info.get("submitter") or "").strip().lower() in conflicts or (info.get("email") or "").strip().lower() in conflicts
+
+    def choose(self, key, info, needed=None):
+        # Names of the judges to add to key; does not change any load
+        taken = set(self.assigned.get(key, []))
+        if needed is None:
+            needed = self.reviews - len(taken)
+        chosen = []
+        for field in ([info["field"]] if info.get("field") else []) + [ANY_FIELD]:
+            heap = self._heaps.get(field, [])
+            popped = []
+            while heap and len(chosen) < needed:
+                entry = heapq.heappop(heap)
+                j = entry[2]
+                if entry[3] != self._version[j]:
+                    continue  # stale: the judge has a newer entry, or none because they are full
+                popped.append(entry)
+                if j in taken or self.conflicted(j, info):
+                    continue
+                chosen.append(j)
+                taken.add(j)
+            for entry in popped:
+                heapq.heappush(heap, entry)
+            if len(chosen) >= needed:
+                break
+        return [self.judges[j]["name"] for j in chosen]
+
+    def apply(self, record):
+        # Replays one log record: a roster change, a new submission or one (un)assignment
+        op = record["op"]
+        if op == "judge":
+            return self.set_judge(record["profile"])
+        key = (record["competition"], record["submission"])
+        if op == "submission":
+            self.submissions.setdefault(key, record["info"])
+            return []
+        j = self._judge_index.get(record["judge"])
+        if j is None:
+            return []
+        judges = self.assigned.setdefault(key, [])
+        if op == "assign" and j not in judges:
+            if len(judges) >= self.reviews or not self.active[j] or self.load[j] >= self.judges[j]["capacity"]:
+                return []  # lost a race with an earlier assign in the log
+            judges.append(j)
+            self.queue[j][key] = None
+            self.load[j] += 1
+            self._push(j)
+        elif op == "unassign" and j in judges:
+            judges.remove(j)
+            del self.queue[j][key]
+            self.load[j] -= 1
+            self._push(j)
+        return []
+
+    # --- Queries ---
+    def judges_of(self, key):
+        return [self.judges[j]["name"] for j in self.assigned.get(key, [])]
+
+    def assignments(self, judge):
+        j = self._judge_index.get(judge)
+        return [] if j is None else list(self.queue[j])
+
+    def short(self):
+        # Submissions with fewer than `reviews` judges (e.g. not enough free judges)
+        return [key for key in self.submissions if len(self.assigned.get(key, [])) < self.reviews]
+
+    def loads(self):
+        return [{"judge": p["name"], "fields": ", ".join(p["fields"]) or "any", "assigned": self.load[j], "capacity": p["capacity"]}
+                for j, p in enumerate(self.judges) if self.active[j]]
+
+
+class JudgePool:
+    # ReviewAssigner shared through the store: each process replays new log
+    # entries before assigning, then appends its own decisions
+    def __init__(self, store, reviews=REVIEWS_PER_SUBMISSION):
+        self.store = store
+        self.assigner = ReviewAssigner(reviews)
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._stats = {"assigned": 0, "reassigned": 0}
+
+    def _sync(self):
+        records = self.store.judge_records(start=self._offset)
+        handed_back = []
+        for record in records:
+            handed_back += self.assigner.apply(record)
+        self._offset += len(records)
+        return handed_back
+
+    def _write(self, op, key, **fields):
+        self.store.add_judge_record({"op": op, "competition": key[0], "submission": key[1], **fields,
+                                     "timestamp": datetime.datetime.now().isoformat()})
+
+    def _fill(self, key):
+        # Tops key up to the configured number of reviews; returns the judges this process added
+        added = []
+        while True:
+            judges = self.assigner.choose(key, self.assigner.submissions[key])
+            if not judges:
+                return added
+            for judge in judges:
+                self._write("assign", key, judge=judge)
+            self._sync()
+            kept = set(self.assigner.judges_of(key))
+            added += [judge for judge in judges if judge in kept and judge not in added]
+            if all(judge in kept for judge in judges):
+                return added
+            # another process's assigns got there first; choose again from what replay kept
+
+    def set_judge(self, name, email=None, fields=(), capacity=DEFAULT_CAPACITY, conflicts=(), active=True):
+        profile = {"name": name, "email": email, "fields": list(fields), "capacity": capacity,
+                   "conflicts": list(conflicts), "active": active}
+        with self._lock:
+            self._sync()
+            self.store.add_judge_record({"op": "judge", "profile": profile, "timestamp": datetime.datetime.now().isoformat()})
+            handed_back = self._sync()
+            for key in handed_back:
+                self._write("unassign", key, judge=name)
+            self._sync()
+            for key in handed_back:
+                self._fill(key)
+            self._stats["reassigned"] += len(handed_back)
+            # Judges joining or gaining capacity pick up submissions nobody was free for
+            for key in self.assigner.short():
+                self._fill(key)
+
+    def remove_judge(self, name):
+        profile = next((p for p in self.roster() if p["name"] == name), None)
+        if profile:
+            self.set_judge(**{**profile, "active": False})
+
+    def assign(self, competition, submission_id, title=None, submitter=None, email=None, field=None):
+        # Judges newly assigned to the submission ([] if it already has enough)
+        key = (competition, submission_id)
+        with self._lock:
+            self._sync()
+            if key not in self.assigner.submissions:
+                self._write("submission", key, info={"title": title, "submitter": submitter, "email": email, "field": field})
+                self._sync()
+            judges = self._fill(key)
+            self._stats["assigned"] += len(judges)
+            return judges
+
+    def handle(self, event):
+        # SUBMISSION event subscriber
+        if event.get("submission_id"):
+            self.assign(event["competition"], event["submission_id"], event.get("title"),
+                        event.get("submitter"), event.get("email"), event.get("field"))
+
+    def roster(self):
+        with self._lock:
+            self._sync()
+            a = self.assigner
+            return [{**p, "active": True} for j, p in enumerate(a.judges) if a.active[j]]
+
+    def assignments(self, judge):
+        # [(competition, submission id, submission info)] assigned to judge, oldest first
+        with self._lock:
+            self._sync()
+            return [(c, s, self.assigner.submissions[(c, s)]) for c, s in self.assigner.assignments(judge)]
+
+    def judges_of(self, competition, submission_id):
+        with self._lock:
+            self._sync()
+            return self.assigner.judges_of((competition, submission_id))
+
+    def loads(self):
+        with self._lock:
+            self._sync()
+            return self.assigner.loads()
+
+    def stats(self):
+        with self._lock:
+            self._sync()
+            a = self.assigner
+            return {**self._stats, "judges": sum(a.active), "submissions": len(a.submissions), "short": len(a.short())}
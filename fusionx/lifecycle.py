@@ -0,0 +1,173 @@
+# fusionx/lifecycle.py
+# Competition lifecycle: pending -> active -> closed.
+#
+# A competition is pending until it has opened (opens_at) and reached its
+# joining threshold, then active until its submission deadline (closes_at).
+# CompetitionScheduler keeps a heap of upcoming open/close deadlines on a
+# background thread. When a competition closes it freezes submissions,
+# computes the winners from mentor scores once, persists them in the shared
+# store and publishes events for webhooks, badges and the newsletter.
+#
+# Every server process runs a scheduler. Activation and finalization are
+# claimed with HSETNX in the shared store, so only one process announces them.
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from fusionx import events as ev
+
+logger = logging.getLogger(__name__)
+
+OPEN = "open"
+CLOSE = "close"
+WINNER_ICONS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+
+def parse_time(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def competition_phase(comp, participant_count, closed, now=None):
+    if closed:
+        return "closed"
+    now = now or datetime.datetime.now()
+    opens_at = parse_time(comp.get("opens_at"))
+    if (opens_at is None or now >= opens_at) and participant_count >= comp['threshold']:
+        return "active"
+    return "pending"
+
+
+def award_winner_badge(store, event):
+    # WINNER event subscriber: badges are stored once and merged into accounts on rerun
+    if not event.get("email"):
+        return
+    store.award_badge(event["email"], {
+        "name": f"Top {event['rank']} in {event['competition']}",
+        "date_awarded": event["timestamp"][:10],
+        "icon": WINNER_ICONS.get(event["rank"], "🏆"),
+        "activity": "Competition"
+    })
+
+
+class CompetitionScheduler:
+    def __init__(self, store, scoring, events, resync_interval=30.0, winners=3):
+        self.store = store
+        self.scoring = scoring
+        self.events = events
+        self.resync_interval = resync_interval
+        self.winners = winners
+
+        self._heap = []  # [(timestamp, seq, action, title)]
+        self._scheduled = set()  # {(action, title, timestamp)} already on the heap
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._last_sync = 0.0
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="fusionx-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # --- Scheduling ---
+    def schedule(self, comp):
+        # Called when a competition is proposed and on every resync; duplicates are ignored
+        for action, field in ((OPEN, "opens_at"), (CLOSE, "closes_at")):
+            when = parse_time(comp.get(field))
+            if when is None:
+                continue
+            entry = (action, comp['title'], when.timestamp())
+            with self._cond:
+                if entry in self._scheduled:
+                    continue
+                self._scheduled.add(entry)
+                heapq.heappush(self._heap, (entry[2], next(self._seq), action, comp['title']))
+                self._cond.notify()
+
+    def pending_deadlines(self):
+        with self._cond:
+            return sorted((datetime.datetime.fromtimestamp(t), action, title) for t, _, action, title in self._heap)
+
+    def _resync(self):
+        # Pick up competitions proposed in other server processes
+        self._last_sync = time.monotonic()
+        closed = self.store.closed_competitions()
+        for comp in self.store.list_competitions():
+            if comp['title'] not in closed:
+                self.schedule(comp)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap))
+                if not due:
+                    next_sync = self._last_sync + self.resync_interval - time.monotonic()
+                    timeout = min(next_sync, self._heap[0][0] - now) if self._heap else next_sync
+                    if timeout > 0:
+                        self._cond.wait(timeout)
+            for when, _, action, title in due:
+                try:
+                    self.run_action(action, title, when)
+                except Exception:
+                    logger.exception("Scheduled %s for '%s' failed", action, title)
+            if time.monotonic() - self._last_sync >= self.resync_interval:
+                try:
+                    self._resync()
+                except Exception:
+                    logger.exception("Competition resync failed")
+
+    # --- Actions ---
+    def run_action(self, action, title, when=None):
+        comp = next((c for c in self.store.list_competitions() if c['title'] == title), None)
+        if comp is None or title in self.store.closed_competitions():
+            return  # deleted or already closed
+        if action == OPEN:
+            self.try_activate(comp)
+        elif action == CLOSE:
+            self.close(comp)
+
+    def try_activate(self, comp, participant_count=None):
+        if participant_count is None:
+            participant_count = len(self.store.participants([comp['title']])[comp['title']])
+        if competition_phase(comp, participant_count, closed=False) != "active":
+            return False
+        if self.store.mark_activated(comp['title']):
+            self.events.publish(ev.COMPETITION_ACTIVATED, competition=comp['title'],
+                                participants=participant_count, threshold=comp['threshold'])
+            return True
+        return False
+
+    def close(self, comp):
+        title = comp['title']
+        self.store.close_competition(title)  # freezes submissions
+        ranking = self.scoring.rankings(title)
+        results = [
+            {"rank": int(row.rank), "email": row.email, "name": row.submitter, "title": row.title, "score": float(row.score)}
+            for row in ranking.head(self.winners).itertuples()
+        ]
+        if not self.store.finalize_competition(title, results):
+            return None  # another process already announced the winners
+        for winner in results:
+            self.events.publish(ev.WINNER, competition=title, **winner)
+        self.events.publish(ev.COMPETITION_CLOSED, competition=title, results=results)
+        return results
@@ -0,0 +1,147 @@
+# fusionx/membership.py
+# Bitmap indexes for competition membership and field interests.
+#
+# Every student (account email, or a per-session guest id) gets a small
+# integer id, and every competition / field gets one NumPy bool row with a
+# slot per student. Membership tests and participant counts read one row,
+# and questions such as "students in both an AI and a Math competition" or
+# "students interested in two or more fields" are a few vectorized OR / AND /
+# sum passes instead of loops over every participant list and account.
+#
+# Joins and interest changes are appended to a membership log in the shared
+# store and replayed into each process's bitmaps on read.
+import threading
+
+import numpy as np
+
+
+class BitmapIndex:
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.rows = {}  # key -> np.bool_ array of length capacity
+
+    def grow(self, capacity):
+        if capacity <= self.capacity:
+            return
+        while self.capacity < capacity:
+            self.capacity *= 2
+        for key, row in self.rows.items():
+            grown = np.zeros(self.capacity, dtype=bool)
+            grown[:len(row)] = row
+            self.rows[key] = grown
+
+    def add(self, key, member_id):
+        self.grow(member_id + 1)
+        if key not in self.rows:
+            self.rows[key] = np.zeros(self.capacity, dtype=bool)
+        self.rows[key][member_id] = True
+
+    def remove(self, key, member_id):
+        if key in self.rows and member_id < self.capacity:
+            self.rows[key][member_id] = False
+
+    def clear(self, key):
+        self.rows.pop(key, None)
+
+    def contains(self, key, member_id):
+        row = self.rows.get(key)
+        return member_id is not None and row is not None and member_id < len(row) and bool(row[member_id])
+
+    def count(self, key):
+        return int(np.count_nonzero(self.rows[key])) if key in self.rows else 0
+
+    def any_of(self, keys):
+        result = np.zeros(self.capacity, dtype=bool)
+        for key in keys:
+            if key in self.rows:
+                result |= self.rows[key]
+        return result
+
+    def at_least(self, keys, n):
+        counts = np.zeros(self.capacity, dtype=np.int32)
+        for key in keys:
+            if key in self.rows:
+                counts += self.rows[key]
+        return counts >= n
+
+    def keys_of(self, member_id):
+        return [key for key, row in self.rows.items() if member_id < len(row) and row[member_id]]
+
+
+class Membership:
+    def __init__(self, store):
+        self.store = store
+        self.competitions = BitmapIndex()
+        self.fields = BitmapIndex()
+        self.members = []  # id -> member (email or guest id)
+        self._ids = {}  # member -> id
+        self._offset = 0  # membership log entries already replayed
+        self._lock = threading.RLock()
+
+    def _id(self, member, create=False):
+        member_id = self._ids.get(member)
+        if member_id is None and create:
+            member_id = self._ids[member] = len(self.members)
+            self.members.append(member)
+        return member_id
+
+    def _sync(self):
+        records = self.store.membership_log(start=self._offset)
+        for r in records:
+            index = self.competitions if r["index"] == "competitions" else self.fields
+            if r["op"] == "clear":
+                index.clear(r["key"])
+            elif r["op"] == "add":
+                index.add(r["key"], self._id(r["member"], create=True))
+            elif r["op"] == "remove" and self._id(r["member"]) is not None:
+                index.remove(r["key"], self._id(r["member"]))
+        self._offset += len(records)
+
+    def _to_members(self, mask):
+        return [self.members[i] for i in np.flatnonzero(mask[:len(self.members)])]
+
+    # --- Competitions ---
+    def join(self, title, member):
+        # New participant count, or None if the member had already joined
+        return self.store.join(title, member)
+
+    def count(self, title):
+        with self._lock:
+            self._sync()
+            return self.competitions.count(title)
+
+    def has_joined(self, title, member):
+        with self._lock:
+            self._sync()
+            return self.competitions.contains(title, self._id(member))
+
+    def joined(self, member):
+        with self._lock:
+            self._sync()
+            member_id = self._id(member)
+            return [] if member_id is None else self.competitions.keys_of(member_id)
+
+    def in_every_group(self, groups):
+        # groups: [[competition titles]]; members in at least one competition of every group
+        with self._lock:
+            self._sync()
+            mask = np.ones(self.competitions.capacity, dtype=bool)
+            for titles in groups:
+                mask &= self.competitions.any_of(titles)
+            return self._to_members(mask)
+
+    # --- Field interests ---
+    def set_fields(self, member, fields):
+        with self._lock:
+            self._sync()
+            member_id = self._id(member)
+            current = set() if member_id is None else set(self.fields.keys_of(member_id))
+        for field in set(fields) - current:
+            self.store.log_membership("fields", field, member, "add")
+        for field in current - set(fields):
+            self.store.log_membership("fields", field, member, "remove")
+
+    def multi_field(self, min_fields=2):
+        with self._lock:
+            self._sync()
+            return self._to_members(self.fields.at_least(list(self.fields.rows), min_fields))
@@ -0,0 +1,40 @@
+# fusionx/notifications.py
+# Student notifications for votes, submissions and joins, sent from the event
+# bus when they happen instead of by rescanning every vote, submission and
+# join on each rerun. Each message is keyed by its text, so it is delivered
+# once even when several processes handle the same kind of event:
+#   - a yes vote: "Your portfolio has N votes." to the student voted for
+#   - a submission from an account: "You submitted '<title>' to '<competition>'."
+#   - a join from an account: "You joined the competition '<competition>'."
+from fusionx import events as ev
+
+NOTIFY_EVENTS = [ev.VOTE, ev.SUBMISSION, ev.JOIN]
+
+
+def notification_for(event, vote_count):
+    # (email, message) for one event, or None; vote_count(student) reads the current yes votes
+    kind = event["type"]
+    email = event.get("email")
+    if not email:
+        return None
+    if kind == ev.VOTE:
+        if event.get("choice", "yes") != "yes":
+            return None  # the yes count, and so the message, is unchanged
+        return email, f"Your portfolio has {vote_count(email)} votes."
+    if kind == ev.SUBMISSION:
+        return email, f"You submitted '{event['title']}' to '{event['competition']}'."
+    if kind == ev.JOIN:
+        return email, f"You joined the competition '{event['competition']}'."
+    return None
+
+
+class Notifier:
+    def __init__(self, store):
+        self.store = store
+
+    # --- Event subscriber ---
+    def handle(self, event):
+        notification = notification_for(event, self.store.portfolio_vote_count)
+        if notification:
+            email, message = notification
+            self.store.notify(email, message, key=message)
@@ -0,0 +1,93 @@
+# fusionx/profiles.py
+# Per-rerun student profile logic of FusionXapp.py: badges, vote tallies, the
+# profile page and the portfolio PDF. It lives here rather than in the app
+# script so benchmarks/ time the code that ships.
+from fpdf import FPDF
+
+FIRST_PORTFOLIO = "🏆 First Portfolio Submitted"
+MULTI_FIELD = "🌟 Multi-Field Participant"
+
+
+# Badges are plain strings in the early add-ons and dicts in "Enhanced Badges"
+def badge_label(badge):
+    return badge['name'] if isinstance(badge, dict) else badge
+
+
+def has_badge(account, name):
+    return any(badge_label(b) == name for b in account.get('badges', []))
+
+
+# portfolio_votes holds {"yes", "no"} counts for sidebar votes and plain totals for project votes
+def vote_counts(counts):
+    return counts if isinstance(counts, dict) else {"yes": counts, "no": 0}
+
+
+def top_portfolios(portfolio_votes, n=3):
+    # [(student, yes votes)], most voted first
+    ranking = [(student, vote_counts(counts)["yes"]) for student, counts in portfolio_votes.items()]
+    ranking.sort(key=lambda x: x[1], reverse=True)
+    return ranking[:n]
+
+
+def grant_badges(accounts, portfolios, multi_field, stored_badges, grant):
+    # Grants the automatic badges through grant(email, account, badge) and merges
+    # badges awarded elsewhere (stored_badges(email), e.g. competition winners).
+    # Returns [(account, badge)] newly earned on this rerun.
+    earned = []
+    for email, projects in portfolios.items():
+        account = accounts.get(email)
+        if projects and account and not has_badge(account, FIRST_PORTFOLIO):
+            grant(email, account, FIRST_PORTFOLIO)
+            earned.append((account, FIRST_PORTFOLIO))
+    # Students with 2+ field interests, from the field bitmap index
+    for email in multi_field:
+        account = accounts.get(email)
+        if account and not has_badge(account, MULTI_FIELD):
+            grant(email, account, MULTI_FIELD)
+            earned.append((account, MULTI_FIELD))
+    for email, account in accounts.items():
+        for badge in stored_badges(email):
+            if not has_badge(account, badge['name']):
+                account['badges'].append(badge)
+                earned.append((account, badge))
+    return earned
+
+
+def track_votes(accounts, portfolio_votes):
+    for email, counts in portfolio_votes.items():
+        account = accounts.get(email)
+        if account:
+            account['votes'] = vote_counts(counts)["yes"]
+
+
+def profile_lines(email, account, projects, joined):
+    # Markdown lines of the "View Your Profile" page (below the avatar)
+    lines = [
+        f"**Name:** {account['name']}",
+        f"**Email:** {email}",
+        f"**Fields of Interest:** {', '.join(account['field']) if account['field'] else 'None'}",
+        f"**Votes Received:** {account.get('votes', 0)}"
+    ]
+    if account.get("badges"):
+        lines += ["**Achievements / Badges:**", ", ".join(badge_label(b) for b in account["badges"])]
+    else:
+        lines.append("**Achievements / Badges:** None yet")
+    if projects is not None:
+        lines.append("**Portfolio Projects:**")
+        lines += [f"- {proj['title']} ({proj.get('field', 'No field')})" for proj in projects]
+    else:
+        lines.append("**Portfolio Projects:** None yet")
+    lines.append(f"**Competitions Joined:** {', '.join(joined) if joined else 'None yet'}")
+    return lines
+
+
+def portfolio_pdf(name, projects):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, f"{name}'s Portfolio", ln=True, align="C")
+    pdf.set_font("Arial", "", 12)
+    for proj in projects:
+        pdf.ln(5)
+        pdf.multi_cell(0, 10, f"Title: {proj['title']}\nField: {proj.get('field', 'N/A')}\nDescription: {proj['description']}")
+    return pdf.output()
@@ -0,0 +1,120 @@
+# fusionx/pubsub.py
+# In-process publish/subscribe for the field chat rooms.
+#
+# Every session viewing a room holds a Subscription: a small bounded queue
+# that the broker pushes new messages into as they are posted (the broker
+# listens for CHAT events on the event bus). The chat room fragment refreshes
+# itself every few seconds and drains only its own queue, so a refresh with
+# no new messages costs a length check instead of re-reading the whole room.
+#
+# Slow or gone consumers are dropped instead of slowing publishers down: a
+# subscription whose queue is full, or that has not been drained for
+# idle_timeout seconds, is removed and marked overflowed. If that session
+# comes back it subscribes again and catches up from the store.
+import collections
+import datetime
+import threading
+import time
+
+QUEUE_SIZE = 100  # undelivered messages per session before it is dropped
+IDLE_TIMEOUT = 60.0  # seconds without a drain before a session counts as gone
+
+
+class Subscription:
+    def __init__(self, room, session, maxsize=QUEUE_SIZE):
+        self.room = room
+        self.session = session
+        self.maxsize = maxsize
+        self.overflowed = False  # dropped by the broker; subscribe again
+        self.last_drain = time.monotonic()
+        self._messages = collections.deque()
+        self._ready = threading.Condition()
+
+    def offer(self, message):
+        with self._ready:
+            if len(self._messages) >= self.maxsize:
+                return False
+            self._messages.append(message)
+            self._ready.notify()
+            return True
+
+    def drain(self):
+        with self._ready:
+            messages = list(self._messages)
+            self._messages.clear()
+            self.last_drain = time.monotonic()
+            return messages
+
+    def get(self, timeout=None):
+        # Blocks until at least one message is queued; [] on timeout
+        with self._ready:
+            if not self._messages:
+                self._ready.wait(timeout)
+        return self.drain()
+
+
+class ChatBroker:
+    def __init__(self, queue_size=QUEUE_SIZE, idle_timeout=IDLE_TIMEOUT):
+        self.queue_size = queue_size
+        self.idle_timeout = idle_timeout
+        self._rooms = {}  # room -> {session: Subscription}
+        self._session_rooms = {}  # session -> room (one room per session at a time)
+        self._lock = threading.Lock()
+        self._stats = {"published": 0, "delivered": 0, "dropped": 0}
+
+    # --- Subscribers ---
+    def subscribe(self, room, session):
+        # The session's live subscription to room, replacing any previous room
+        with self._lock:
+            old_room = self._session_rooms.get(session)
+            if old_room is not None and old_room != room:
+                self._rooms.get(old_room, {}).pop(session, None)
+            subscription = self._rooms.get(room, {}).get(session)
+            if subscription is None:
+                subscription = Subscription(room, session, self.queue_size)
+                self._rooms.setdefault(room, {})[session] = subscription
+                self._session_rooms[session] = room
+            return subscription
+
+    def unsubscribe(self, session):
+        with self._lock:
+            room = self._session_rooms.pop(session, None)
+            if room is not None:
+                self._rooms.get(room, {}).pop(session, None)
+
+    def _drop(self, subscription):
+        # Caller holds self._lock
+        subscription.overflowed = True
+        self._rooms.get(subscription.room, {}).pop(subscription.session, None)
+        if self._session_rooms.get(subscription.session) == subscription.room:
+            del self._session_rooms[subscription.session]
+        self._stats["dropped"] += 1
+
+    # --- Publishing ---
+    def publish(self, room, message):
+        now = time.monotonic()
+        with self._lock:
+            self._stats["published"] += 1
+            for subscription in list(self._rooms.get(room, {}).values()):
+                if now - subscription.last_drain > self.idle_timeout or not subscription.offer(message):
+                    self._drop(subscription)
+                else:
+                    self._stats["delivered"] += 1
+
+    def handle(self, event):
+        # Event-bus subscriber for CHAT events
+        self.publish(event["field"], {
+            "index": event["index"],
+            "user": event["user"],
+            "message": event["message"],
+            "timestamp": datetime.datetime.fromisoformat(event["sent_at"])
+        })
+
+    # --- Stats ---
+    def subscribers(self, room):
+        with self._lock:
+            return len(self._rooms.get(room, {}))
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "subscribers": sum(len(s) for s in self._rooms.values())}
@@ -0,0 +1,101 @@
+# fusionx/rollups.py
+# Weekly rollups for the newsletter and analytics.
+#
+# Every vote, submission, join and winner event is added to a per-week row in
+# the shared store as it happens (one HINCRBY batch per event), broken down by
+# field, competition and project. Reading a week is then a single HGETALL of
+# that row instead of a scan over all votes and submissions ever made.
+#
+# Row fields are "<dimension>|<name>|<metric>", e.g. "total||votes",
+# "field|AI|submissions" or "competition|Math Cup|joins". Project names are
+# "<email>/<title>" so featured projects can link back to their owner.
+import datetime
+
+from fusionx import events as ev
+
+METRICS = ["votes", "submissions", "joins", "xp"]
+# XP per event, as in the "Notifications & Engagement" add-on
+XP_POINTS = {ev.VOTE: 1, ev.SUBMISSION: 5, ev.JOIN: 2}
+ROLLUP_EVENTS = [ev.VOTE, ev.SUBMISSION, ev.JOIN, ev.COMPETITION_CLOSED]
+
+
+def week_key(when=None):
+    # ISO week, Monday to Sunday: "2026-W42"
+    when = when or datetime.datetime.now()
+    if isinstance(when, str):
+        when = datetime.datetime.fromisoformat(when)
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_start(week):
+    return datetime.date.fromisocalendar(int(week[:4]), int(week[6:]), 1)
+
+
+def counters_for(event):
+    # {row field: increment} for one event
+    kind = event["type"]
+    metric = {ev.VOTE: "votes", ev.SUBMISSION: "submissions", ev.JOIN: "joins"}[kind]
+    if kind == ev.VOTE and event.get("choice", "yes") != "yes":
+        return {"total||votes_against": 1}
+    counters = {f"total||{metric}": 1}
+    if event.get("field"):
+        counters[f"field|{event['field']}|{metric}"] = 1
+    if event.get("competition"):
+        counters[f"competition|{event['competition']}|{metric}"] = 1
+    if kind == ev.VOTE and event.get("project"):
+        counters[f"project|{event['email']}/{event['project']}|votes"] = 1
+    if event.get("email") and kind in XP_POINTS:
+        points = XP_POINTS[kind]
+        counters["total||xp"] = points
+        counters[f"student|{event['email']}|xp"] = points
+        if event.get("field"):
+            counters[f"field|{event['field']}|xp"] = points
+    return counters
+
+
+class WeeklyRollups:
+    def __init__(self, store):
+        self.store = store
+
+    # --- Event subscriber ---
+    def handle(self, event):
+        week = week_key(event["timestamp"])
+        if event["type"] == ev.COMPETITION_CLOSED:
+            self.store.add_rollup_record(week, "closed", {
+                "competition": event["competition"],
+                "results": event["results"],
+                "closed_at": event["timestamp"]
+            })
+        else:
+            self.store.add_rollup(week, counters_for(event))
+
+    # --- Reading ---
+    def weeks(self):
+        return sorted(self.store.rollup_weeks(), reverse=True)
+
+    def week(self, week=None, featured=3):
+        week = week or week_key()
+        row = {
+            "week": week,
+            "starts": week_start(week),
+            "totals": dict.fromkeys(METRICS + ["votes_against"], 0),
+            "fields": {},
+            "competitions": {},
+            "students": {},
+            "projects": [],
+            "closed": self.store.rollup_records(week, "closed")
+        }
+        for name, value in self.store.rollup(week).items():
+            dimension, _, rest = name.partition("|")
+            label, _, metric = rest.rpartition("|")
+            if dimension == "total":
+                row["totals"][metric] = value
+            elif dimension == "project":
+                email, _, title = label.partition("/")
+                row["projects"].append({"email": email, "title": title, "votes": value})
+            else:
+                row[dimension + "s"].setdefault(label, dict.fromkeys(METRICS, 0))[metric] = value
+        row["projects"].sort(key=lambda p: p["votes"], reverse=True)
+        row["projects"] = row["projects"][:featured]
+        return row
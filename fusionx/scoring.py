@@ -0,0 +1,224 @@
+# fusionx/scoring.py
+# Structured mentor scoring for competitions.
+#
+# Every mentor (judge) scores a submission on a fixed rubric. Scores are kept
+# columnar per competition (NumPy arrays of submission index, judge index and
+# one column per rubric criterion) so rankings are a handful of vectorized
+# passes:
+#   1. weighted rubric total per score row
+#   2. per-judge z-score normalization (harsh and generous judges count alike)
+#   3. trimmed mean of z-scores per submission (drops outlier judges)
+# Rankings are cached per competition until a new score arrives.
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+RUBRIC = ["Originality", "Technical Quality", "Presentation", "Impact"]
+SCORE_MIN = 1
+SCORE_MAX = 10
+TRIM = 0.1  # fraction of judges dropped at each end per submission
+
+
+def submission_id(submission):
+    # Submissions created before ids existed fall back to submitter + title
+    if submission.get("id"):
+        return submission["id"]
+    submitter = submission.get("submitter_email") or submission.get("submitter_name") or submission.get("submitter")
+    return f"{submitter}|{submission['title']}"
+
+
+class ScoreBoard:
+    # Columnar scores for a single competition
+    def __init__(self, criteria=RUBRIC, weights=None):
+        self.criteria = list(criteria)
+        weights = np.ones(len(self.criteria)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.weights = weights / weights.sum()
+
+        self._n = 0
+        self._sub = np.empty(64, dtype=np.int32)
+        self._judge = np.empty(64, dtype=np.int32)
+        self._scores = np.empty((64, len(self.criteria)), dtype=np.float32)
+
+        self.submissions = []  # index -> {"id", "title", "submitter", "email"}
+        self._sub_index = {}  # submission id -> index
+        self.judges = []  # index -> judge name
+        self._judge_index = {}  # judge name -> index
+        self._rows = {}  # (submission index, judge index) -> row; re-scoring replaces the row
+        self.feedback = []  # [{"submission", "judge", "feedback", "timestamp"}]
+
+        self.version = 0
+        self._cache = None  # (version, trim, DataFrame)
+
+    def _grow(self, needed):
+        capacity = len(self._sub)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._sub = np.resize(self._sub, capacity)
+        self._judge = np.resize(self._judge, capacity)
+        scores = np.empty((capacity, len(self.criteria)), dtype=np.float32)
+        scores[:self._n] = self._scores[:self._n]
+        self._scores = scores
+
+    def _submission_idx(self, submission):
+        sid = submission["id"]
+        idx = self._sub_index.get(sid)
+        if idx is None:
+            idx = len(self.submissions)
+            self._sub_index[sid] = idx
+            self.submissions.append(submission)
+        return idx
+
+    def _judge_idx(self, judge):
+        idx = self._judge_index.get(judge)
+        if idx is None:
+            idx = len(self.judges)
+            self._judge_index[judge] = idx
+            self.judges.append(judge)
+        return idx
+
+    def add(self, submission, judge, scores, feedback="", timestamp=None):
+        # submission: {"id", "title", "submitter", "email"}; scores: one value per criterion
+        s = self._submission_idx(submission)
+        j = self._judge_idx(judge)
+        row = self._rows.get((s, j))
+        if row is None:
+            row = self._n
+            self._grow(row + 1)
+            self._rows[(s, j)] = row
+            self._n += 1
+        self._sub[row] = s
+        self._judge[row] = j
+        self._scores[row] = scores
+        if feedback:
+            self.feedback.append({"submission": submission["id"], "judge": judge, "feedback": feedback, "timestamp": timestamp})
+        self.version += 1
+
+    def has_score(self, sid, judge):
+        return (self._sub_index.get(sid), self._judge_index.get(judge)) in self._rows
+
+    def load_arrays(self, submissions, judges, sub_idx, judge_idx, scores):
+        # Bulk load (e.g. benchmarks or restoring an archive); one row per (submission, judge)
+        for submission in submissions:
+            self._submission_idx(submission)
+        for judge in judges:
+            self._judge_idx(judge)
+        n = len(sub_idx)
+        self._grow(self._n + n)
+        self._sub[self._n:self._n + n] = sub_idx
+        self._judge[self._n:self._n + n] = judge_idx
+        self._scores[self._n:self._n + n] = scores
+        for offset, key in enumerate(zip(sub_idx.tolist(), judge_idx.tolist())):
+            self._rows[key] = self._n + offset
+        self._n += n
+        self.version += 1
+
+    def rankings(self, trim=TRIM):
+        if self._cache is not None and self._cache[0] == self.version and self._cache[1] == trim:
+            return self._cache[2]
+        self._cache = (self.version, trim, self._compute(trim))
+        return self._cache[2]
+
+    def _compute(self, trim):
+        columns = ["rank", "submission_id", "title", "submitter", "email", "judges", "raw_score", "z_score", "score"]
+        n = self._n
+        if n == 0:
+            return pd.DataFrame(columns=columns)
+        sub = self._sub[:n]
+        judge = self._judge[:n]
+        total = (self._scores[:n] @ self.weights.astype(np.float32)).astype(np.float64)
+        n_sub = len(self.submissions)
+        n_judge = len(self.judges)
+
+        # Per-judge z-scores
+        judge_counts = np.bincount(judge, minlength=n_judge)
+        safe_counts = np.maximum(judge_counts, 1)
+        judge_mean = np.bincount(judge, weights=total, minlength=n_judge) / safe_counts
+        judge_sq = np.bincount(judge, weights=total * total, minlength=n_judge) / safe_counts
+        judge_std = np.sqrt(np.maximum(judge_sq - judge_mean ** 2, 0.0))
+        judge_std[judge_std < 1e-9] = np.inf  # a judge who gives everyone the same score adds no signal
+        z = (total - judge_mean[judge]) / judge_std[judge]
+
+        # Trimmed mean of z-scores per submission
+        counts = np.bincount(sub, minlength=n_sub)
+        k = np.floor(counts * trim).astype(np.int64)
+        if k.any():
+            # Sort rows by submission, then z (one float key sorts faster than lexsort)
+            z_range = z.max() - z.min()
+            key = sub + (z - z.min()) / (z_range + 1e-9) * 0.999 if z_range > 0 else sub.astype(np.float64)
+            order = np.argsort(key)
+            sub_sorted = sub[order]
+            z_sorted = z[order]
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            pos = np.arange(n) - starts[sub_sorted]
+            keep = (pos >= k[sub_sorted]) & (pos < (counts - k)[sub_sorted])
+            kept = np.bincount(sub_sorted[keep], minlength=n_sub)
+            z_mean = np.bincount(sub_sorted[keep], weights=z_sorted[keep], minlength=n_sub) / np.maximum(kept, 1)
+        else:
+            z_mean = np.bincount(sub, weights=z, minlength=n_sub) / np.maximum(counts, 1)
+        raw_mean = np.bincount(sub, weights=total, minlength=n_sub) / np.maximum(counts, 1)
+
+        # Map normalized scores back onto the rubric scale for display
+        score = np.clip(total.mean() + z_mean * total.std(), SCORE_MIN, SCORE_MAX)
+
+        scored = np.flatnonzero(counts)
+        scored = scored[np.argsort(-z_mean[scored], kind="stable")]
+        info = [self.submissions[i] for i in scored]
+        return pd.DataFrame({
+            "rank": np.arange(1, len(scored) + 1),
+            "submission_id": [s["id"] for s in info],
+            "title": [s.get("title") for s in info],
+            "submitter": [s.get("submitter") for s in info],
+            "email": [s.get("email") for s in info],
+            "judges": counts[scored],
+            "raw_score": raw_mean[scored].round(2),
+            "z_score": z_mean[scored].round(3),
+            "score": score[scored].round(2)
+        }, columns=columns)
+
+
+class MentorScoring:
+    # Scores are appended to a per-competition log in the shared store, so all
+    # server processes see them; each process replays only new log entries
+    # into its local columnar ScoreBoard.
+    def __init__(self, store, criteria=RUBRIC, trim=TRIM):
+        self.store = store
+        self.criteria = list(criteria)
+        self.trim = trim
+        self._boards = {}  # {competition: ScoreBoard}
+        self._offsets = {}  # {competition: log entries already replayed}
+        self._lock = threading.Lock()
+
+    def submit(self, competition, submission, judge, scores, feedback=""):
+        self.store.add_score(competition, {
+            "submission": {
+                "id": submission_id(submission),
+                "title": submission.get("title"),
+                "submitter": submission.get("submitter_name") or submission.get("submitter"),
+                "email": submission.get("submitter_email")
+            },
+            "judge": judge,
+            "scores": [float(scores[c]) for c in self.criteria],
+            "feedback": feedback,
+            "timestamp": datetime.datetime.now().isoformat()
+        })
+
+    def board(self, competition):
+        with self._lock:
+            board = self._boards.get(competition)
+            if board is None:
+                board = self._boards[competition] = ScoreBoard(self.criteria)
+                self._offsets[competition] = 0
+            records = self.store.scores(competition, start=self._offsets[competition])
+            for r in records:
+                board.add(r["submission"], r["judge"], r["scores"], r.get("feedback", ""), r.get("timestamp"))
+            self._offsets[competition] += len(records)
+            return board
+
+    def rankings(self, competition):
+        board = self.board(competition)
+        with self._lock:
+            return board.rankings(self.trim)
@@ -0,0 +1,52 @@
+# fusionx/search.py
+# Prefix search over account names and emails for typeahead pickers.
+#
+# Every account is indexed under its email, its full name and each word of
+# either (so "smi" finds "Ann Smith" and "ann.smith@fusion.edu"), lowercased,
+# in one sorted list. A search is a binary search to the first term with the
+# prefix and a walk over the following terms until `limit` accounts were
+# found, so it costs O(log n + limit) however many accounts there are, and
+# only those few matches are sent to the browser.
+import bisect
+import re
+
+_WORD = re.compile(r"[\s._@+-]+")
+
+
+def terms(texts):
+    found = set()
+    for text in texts:
+        text = (text or "").strip().lower()
+        if text:
+            found.add(text)
+            found.update(word for word in _WORD.split(text) if word)
+    return found
+
+
+class PrefixIndex:
+    def __init__(self, items=()):
+        # items: [(value, [texts])]
+        entries = sorted((term, value) for value, texts in items for term in terms(texts))
+        self._terms = [term for term, _ in entries]
+        self._values = [value for _, value in entries]
+
+    def add(self, value, texts):
+        for term in terms(texts):
+            # Same (term, value) order as a fresh build, so both give the same results
+            lo, hi = bisect.bisect_left(self._terms, term), bisect.bisect_right(self._terms, term)
+            i = bisect.bisect_left(self._values, value, lo, hi)
+            self._terms.insert(i, term)
+            self._values.insert(i, value)
+
+    def search(self, prefix, limit=20):
+        # Up to `limit` distinct values with a term starting with prefix, in term order
+        prefix = prefix.strip().lower()
+        found = {}
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and len(found) < limit and self._terms[i].startswith(prefix):
+            found.setdefault(self._values[i], None)
+            i += 1
+        return list(found)
+
+    def __len__(self):
+        return len(self._terms)
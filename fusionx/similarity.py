@@ -0,0 +1,124 @@
+# fusionx/similarity.py
+# Near-duplicate detection for submissions and portfolio projects.
+#
+# Every description is cut into overlapping 5-character shingles and reduced
+# to a MinHash signature of 128 values: for each of 128 hash functions, the
+# smallest hash of any shingle. Two signatures agree in a position with
+# probability equal to the Jaccard similarity of the shingle sets.
+#
+# Signatures are split into 32 bands of 4 values (LSH). Documents sharing any
+# band land in the same bucket, so a new description is only compared with
+# the few documents it collides with instead of every earlier one. With these
+# settings a pair at 70% similarity collides with >99.9% probability and one
+# at 20% (typical for unrelated texts) about 5% of the time; candidates are
+# then checked against the full signatures.
+#
+# Signatures are appended to a log in the shared store and replayed into each
+# process's in-memory LSH index; likely duplicates are stored as flags that
+# mentors review in the Special Features tab.
+import base64
+import re
+import threading
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32
+THRESHOLD = 0.7  # estimated Jaccard similarity that counts as a duplicate
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 10  # very short descriptions ("tbd") are not compared
+
+_rng = np.random.default_rng(20240501)  # fixed so every process hashes alike
+_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text):
+    # uint32 signature, or None when the text is too short to compare
+    grams = shingles(text)
+    if len(grams) < MIN_SHINGLES:
+        return None
+    x = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    # Multiply-shift hashing: (a * x + b) mod 2^64, keep the high 32 bits
+    hashed = (np.multiply.outer(x, _A) + _B) >> np.uint64(32)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def encode_signature(sig):
+    return base64.b64encode(sig.tobytes()).decode("ascii")
+
+
+def decode_signature(text):
+    return np.frombuffer(base64.b64decode(text), dtype=np.uint32)
+
+
+class LSHIndex:
+    def __init__(self, bands=BANDS, threshold=THRESHOLD):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]  # per band: {band bytes: [doc ids]}
+        self.signatures = {}  # doc id -> signature
+        self.info = {}  # doc id -> display info
+
+    def _band_keys(self, sig):
+        return [sig[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(self.bands)]
+
+    def add(self, doc_id, sig, info=None):
+        self.signatures[doc_id] = sig
+        self.info[doc_id] = info
+        for band, key in zip(self.buckets, self._band_keys(sig)):
+            band.setdefault(key, []).append(doc_id)
+
+    def query(self, sig, exclude=None):
+        # [(doc id, estimated similarity)] above the threshold, most similar first
+        candidates = set()
+        for band, key in zip(self.buckets, self._band_keys(sig)):
+            candidates.update(band.get(key, ()))
+        candidates.discard(exclude)
+        matches = [(doc_id, similarity(sig, self.signatures[doc_id])) for doc_id in candidates]
+        return sorted([m for m in matches if m[1] >= self.threshold], key=lambda m: m[1], reverse=True)
+
+
+class DuplicateDetector:
+    def __init__(self, store, threshold=THRESHOLD):
+        self.store = store
+        self.index = LSHIndex(threshold=threshold)
+        self._offset = 0  # signature log entries already replayed
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        records = self.store.signatures(start=self._offset)
+        for r in records:
+            self.index.add(r["doc_id"], decode_signature(r["signature"]), r["info"])
+        self._offset += len(records)
+
+    def sync(self):
+        # Replays signatures indexed by other processes (used to warm the index at boot)
+        with self._lock:
+            self._sync()
+            return len(self.index.info)
+
+    def check(self, doc_id, text, info):
+        # Index a new or edited description; returns and flags its likely duplicates
+        sig = minhash(text or "")
+        if sig is None:
+            return []
+        with self._lock:
+            self._sync()
+            # Includes the same student reusing a description in another competition
+            matches = [(self.index.info[d], score) for d, score in self.index.query(sig, exclude=doc_id)]
+            self.store.add_signature({"doc_id": doc_id, "signature": encode_signature(sig), "info": info})
+        for other, score in matches:
+            self.store.add_duplicate_flag({"document": info, "duplicate_of": other, "similarity": round(score, 2)})
+        return matches
@@ -0,0 +1,202 @@
+# fusionx/site.py
+# Static pre-rendered pages for anonymous browsing: one page per public
+# portfolio, the leaderboards and the competition winners, each as HTML plus
+# a JSON twin. The output directory can be served by any static file server
+# (or Streamlit's own static serving under app/static/site/).
+#
+# Reruns hand the exporter a plain-data snapshot (at most every interval
+# seconds); a background thread renders it. Every page has a digest of the
+# data it is built from, kept in .digests.json, and a page is only rewritten
+# (atomically, via a temp file) when its digest changes, so a snapshot where
+# one student's portfolio changed rewrites that page and nothing else.
+#
+# Portfolios live in each session's state, so a snapshot only contains the
+# portfolios that session knows about; pages are added and updated, never
+# removed because one session did not see them.
+#
+# Everything written here is public, so student emails never are: leaderboard
+# rows are keyed by portfolio slug and winners carry display names only.
+import datetime
+import hashlib
+import html
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from fusionx.bundles import slugify
+
+logger = logging.getLogger(__name__)
+
+DIGESTS = ".digests.json"
+STYLE = (
+    "body{font-family:system-ui,sans-serif;max-width:860px;margin:2rem auto;padding:0 1rem;color:#222}"
+    "a{color:#0b5cad}table{border-collapse:collapse;width:100%}td,th{padding:.3rem .5rem;border-bottom:1px solid #ddd;text-align:left}"
+    ".badge{display:inline-block;background:#eef;border-radius:1rem;padding:.1rem .6rem;margin:.1rem}"
+)
+
+
+def digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def page(title, body):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)} · FusionX</title>"
+            f"<style>{STYLE}</style></head><body><p><a href='index.html'>FusionX</a></p>"
+            f"<h1>{html.escape(title)}</h1>{body}</body></html>")
+
+
+def table(headers, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def portfolio_slug(email):
+    # Readable and unique: the name part of the email plus a short hash
+    return f"portfolio-{slugify(email.split('@')[0])}-{hashlib.sha256(email.encode('utf-8')).hexdigest()[:6]}"
+
+
+def public_results(results):
+    # Competition results without the students' emails
+    return [{k: v for k, v in r.items() if k != "email"} for r in results]
+
+
+# -----------------------------
+# Page Rendering
+# -----------------------------
+def render_portfolio(p):
+    badges = "".join(f"<span class='badge'>{html.escape(b)}</span>" for b in p["badges"]) or "None yet"
+    rows = [(html.escape(proj["title"]), html.escape(proj["field"] or ""), html.escape(proj["description"]),
+             proj["versions"], proj["votes"], proj["comments"]) for proj in p["projects"]]
+    body = (f"<p><b>Fields of interest:</b> {html.escape(', '.join(p['fields']) or 'None')}</p>"
+            f"<p><b>XP:</b> {p['xp']}</p><p><b>Badges:</b> {badges}</p><h2>Projects</h2>"
+            + table(["Title", "Field", "Description", "Versions", "Votes", "Comments"], rows))
+    return page(f"{p['name']}'s Portfolio", body)
+
+
+def render_leaderboards(data, published):
+    def who(slug):
+        label = html.escape(data["names"].get(slug, "Student"))
+        return f"<a href='{slug}.html'>{label}</a>" if slug in published else label
+    body = "<h2>🌟 Top 3 Portfolios</h2>" + table(["#", "Student", "Votes"], [
+        (i, who(s), v) for i, (s, v) in enumerate(data["top3"], start=1)])
+    body += "<h2>🔥 Trending this week</h2>" + table(["Student", "Score"], [
+        (who(s), f"{score:.1f}") for s, score in data["trending"]])
+    body += "<h2>XP this week</h2>" + table(["#", "Student", "XP"], [
+        (i, who(s), xp) for i, (s, xp) in enumerate(data["xp_week"], start=1)])
+    return page("Leaderboards", body)
+
+
+def render_winners(data):
+    body = ""
+    for competition, results in data["winners"].items():
+        body += f"<h2>🏆 {html.escape(competition)}</h2>" + (table(["Rank", "Project", "Student", "Score"], [
+            (w["rank"], html.escape(w["title"]), html.escape(w["name"]), f"{w['score']:.2f}") for w in results
+        ]) if results else "<p>No scored submissions.</p>")
+    return page("Competition Winners", body or "<p>No competitions have closed yet.</p>")
+
+
+def render_index(portfolios, generated_at):
+    links = "".join(f"<li><a href='{slug}.html'>{html.escape(name)}</a></li>" for slug, name in sorted(portfolios.items(), key=lambda x: x[1]))
+    body = ("<ul><li><a href='leaderboards.html'>Leaderboards</a></li><li><a href='winners.html'>Competition Winners</a></li></ul>"
+            f"<h2>Portfolios</h2><ul>{links}</ul><p><small>Updated {html.escape(generated_at)}</small></p>")
+    return page("FusionX Portfolios & Winners", body)
+
+
+# -----------------------------
+# Exporter
+# -----------------------------
+class SiteExporter:
+    def __init__(self, out_dir, interval=60.0):
+        self.out_dir = out_dir
+        self.interval = interval  # minimum seconds between snapshots
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._snapshot = None  # latest snapshot not yet rendered
+        self._last_submit = 0.0
+        self._thread = None
+        self._stats = {"exports": 0, "written": 0, "skipped": 0}
+        os.makedirs(out_dir, exist_ok=True)
+        self._digests = self._load_digests()
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="fusionx-site", daemon=True)
+        self._thread.start()
+
+    def due(self):
+        # True when a rerun should build and submit a new snapshot
+        return time.monotonic() - self._last_submit >= self.interval
+
+    def submit(self, snapshot):
+        with self._pending:
+            self._snapshot = snapshot  # a newer snapshot replaces one not yet rendered
+            self._last_submit = time.monotonic()
+            self._pending.notify()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(self):
+        while True:
+            with self._pending:
+                while self._snapshot is None:
+                    self._pending.wait()
+                snapshot, self._snapshot = self._snapshot, None
+            try:
+                self.export(snapshot)
+            except Exception:
+                logger.exception("Static site export failed")
+
+    # --- Writing ---
+    def _load_digests(self):
+        try:
+            with open(os.path.join(self.out_dir, DIGESTS), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, name, content):
+        fd, tmp_path = tempfile.mkstemp(dir=self.out_dir, prefix=".page-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, os.path.join(self.out_dir, name))
+
+    def _publish(self, slug, data, render):
+        # Writes slug.html and slug.json if data changed since the last export
+        key = digest(data)
+        if self._digests.get(slug, {}).get("digest") == key and os.path.exists(os.path.join(self.out_dir, slug + ".html")):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return False
+        self._write(slug + ".json", json.dumps(data, indent=1, default=str))
+        self._write(slug + ".html", render())
+        self._digests[slug] = {"digest": key, "title": data.get("name") if isinstance(data, dict) else None}
+        with self._lock:
+            self._stats["written"] += 1
+        return True
+
+    def export(self, snapshot):
+        # snapshot: {"portfolios": {email: {...}}, "names", "top3", "trending", "xp_week", "winners"}
+        changed = False
+        for email, portfolio in snapshot["portfolios"].items():
+            changed |= self._publish(portfolio_slug(email), portfolio, lambda p=portfolio: render_portfolio(p))
+        boards = {k: [(portfolio_slug(email), value) for email, value in snapshot[k]] for k in ("top3", "trending", "xp_week")}
+        boards["names"] = {portfolio_slug(email): name for email, name in snapshot["names"].items()}
+        published = {slug for slug in boards["names"] if slug in self._digests}
+        changed |= self._publish("leaderboards", boards, lambda: render_leaderboards(boards, published))
+        winners = {"winners": {title: public_results(results) for title, results in snapshot["winners"].items()}}
+        changed |= self._publish("winners", winners, lambda: render_winners(winners))
+        if changed or not os.path.exists(os.path.join(self.out_dir, "index.html")):
+            portfolios = {slug: info["title"] for slug, info in self._digests.items() if slug.startswith("portfolio-")}
+            self._write("index.html", render_index(portfolios, datetime.datetime.now().strftime("%Y-%m-%d %H:%M")))
+            self._write(DIGESTS, json.dumps(self._digests))
+        with self._lock:
+            self._stats["exports"] += 1
+        return changed
@@ -0,0 +1,613 @@
+# fusionx/state.py
+# Shared state for FusionXapp: competitions, votes, chat and notifications live
+# in a backend that several Streamlit server processes can share, instead of
+# in each browser session's st.session_state.
+#
+# A backend only has to provide a small set of Redis-style primitives
+# (strings, hashes, lists and sets). MemoryBackend keeps everything in this
+# process; RedisBackend talks to Redis (or a stand-in such as fakeredis) so
+# FusionXapp can run as many processes behind a load balancer.
+import datetime
+import json
+import threading
+
+
+# -----------------------------
+# Backend Interface
+# -----------------------------
+class StateBackend:
+    # Strings / counters
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def incr(self, key, amount=1):
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        raise NotImplementedError
+
+    # Hashes
+    def hget(self, key, field):
+        raise NotImplementedError
+
+    def hset(self, key, field, value):
+        raise NotImplementedError
+
+    def hsetnx(self, key, field, value):
+        raise NotImplementedError
+
+    def hdel(self, key, field):
+        raise NotImplementedError
+
+    def hgetall(self, key):
+        raise NotImplementedError
+
+    def hincrby(self, key, field, amount=1):
+        raise NotImplementedError
+
+    def hincrby_many(self, key, amounts):
+        for field, amount in amounts.items():
+            self.hincrby(key, field, amount)
+
+    # Lists
+    def rpush(self, key, value):
+        raise NotImplementedError
+
+    def lrange(self, key, start, end):
+        raise NotImplementedError
+
+    def lrange_many(self, keys, start=0, end=-1):
+        return [self.lrange(k, start, end) for k in keys]
+
+    def llen(self, key):
+        raise NotImplementedError
+
+    def lrem(self, key, value):
+        raise NotImplementedError
+
+    # Sets
+    def sadd(self, key, member):
+        raise NotImplementedError
+
+    def srem(self, key, member):
+        raise NotImplementedError
+
+    def smembers(self, key):
+        raise NotImplementedError
+
+
+def _redis_slice(items, start, end):
+    # LRANGE semantics: inclusive end, negative indexes count from the tail
+    n = len(items)
+    if start < 0:
+        start = max(n + start, 0)
+    if end < 0:
+        end = n + end
+    return items[start:end + 1]
+
+
+class MemoryBackend(StateBackend):
+    # Single-process backend; shared by every session in this server process
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.RLock()
+
+    def _container(self, key, kind):
+        value = self._data.get(key)
+        if value is None:
+            value = kind()
+            self._data[key] = value
+        return value
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = str(value)
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._data.get(key, 0)) + amount
+            self._data[key] = str(value)
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def hget(self, key, field):
+        with self._lock:
+            return self._data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        with self._lock:
+            self._container(key, dict)[field] = str(value)
+
+    def hsetnx(self, key, field, value):
+        with self._lock:
+            h = self._container(key, dict)
+            if field in h:
+                return False
+            h[field] = str(value)
+            return True
+
+    def hdel(self, key, field):
+        with self._lock:
+            self._data.get(key, {}).pop(field, None)
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {}))
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            h = self._container(key, dict)
+            value = int(h.get(field, 0)) + amount
+            h[field] = str(value)
+            return value
+
+    def rpush(self, key, value):
+        with self._lock:
+            items = self._container(key, list)
+            items.append(str(value))
+            return len(items)
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            return _redis_slice(self._data.get(key, []), start, end)
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._data.get(key, []))
+
+    def lrem(self, key, value):
+        with self._lock:
+            items = self._data.get(key, [])
+            self._data[key] = [v for v in items if v != value]
+
+    def sadd(self, key, member):
+        with self._lock:
+            members = self._container(key, set)
+            if member in members:
+                return 0
+            members.add(str(member))
+            return 1
+
+    def srem(self, key, member):
+        with self._lock:
+            self._data.get(key, set()).discard(member)
+
+    def smembers(self, key):
+        with self._lock:
+            return set(self._data.get(key, set()))
+
+
+class RedisBackend(StateBackend):
+    # Works with redis-py clients and drop-in stand-ins like fakeredis
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis  # optional dependency, only needed for redis:// URLs
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value):
+        self.client.set(key, value)
+
+    def incr(self, key, amount=1):
+        return self.client.incrby(key, amount)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    def hget(self, key, field):
+        return self.client.hget(key, field)
+
+    def hset(self, key, field, value):
+        self.client.hset(key, field, value)
+
+    def hsetnx(self, key, field, value):
+        return bool(self.client.hsetnx(key, field, value))
+
+    def hdel(self, key, field):
+        self.client.hdel(key, field)
+
+    def hgetall(self, key):
+        return self.client.hgetall(key)
+
+    def hincrby(self, key, field, amount=1):
+        return self.client.hincrby(key, field, amount)
+
+    def hincrby_many(self, key, amounts):
+        # One round trip for all counters
+        pipe = self.client.pipeline(transaction=False)
+        for field, amount in amounts.items():
+            pipe.hincrby(key, field, amount)
+        pipe.execute()
+
+    def rpush(self, key, value):
+        return self.client.rpush(key, value)
+
+    def lrange(self, key, start, end):
+        return self.client.lrange(key, start, end)
+
+    def lrange_many(self, keys, start=0, end=-1):
+        # One round trip for all keys
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.lrange(key, start, end)
+        return pipe.execute()
+
+    def llen(self, key):
+        return self.client.llen(key)
+
+    def lrem(self, key, value):
+        self.client.lrem(key, 0, value)
+
+    def sadd(self, key, member):
+        return self.client.sadd(key, member)
+
+    def srem(self, key, member):
+        self.client.srem(key, member)
+
+    def smembers(self, key):
+        return self.client.smembers(key)
+
+
+def backend_from_url(url=None):
+    # None / "memory://" -> in-process backend, "redis://..." -> Redis
+    if not url or url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url)
+    raise ValueError(f"Unsupported state backend URL: {url}")
+
+
+# -----------------------------
+# Shared Store (domain operations)
+# -----------------------------
+class SharedStore:
+    def __init__(self, backend, namespace="fusionx"):
+        self.backend = backend
+        self.namespace = namespace
+
+    def key(self, *parts):
+        return ":".join((self.namespace,) + tuple(str(p) for p in parts))
+
+    # --- Version counters (bumped on every write a JSON API resource depends on) ---
+    def touch(self, *resources):
+        self.backend.hincrby_many(self.key("versions"), dict.fromkeys(resources, 1))
+
+    def version(self, resource):
+        return int(self.backend.hget(self.key("versions"), resource) or 0)
+
+    # --- Competitions ---
+    def add_competition(self, comp):
+        # Titles are unique regardless of case, even across processes
+        if not self.backend.hsetnx(self.key("competition_titles"), comp['title'].lower(), comp['title']):
+            return False
+        self.backend.hset(self.key("competitions"), comp['title'], json.dumps(comp))
+        self.backend.rpush(self.key("competition_order"), comp['title'])
+        self.touch("competitions")
+        return True
+
+    def update_competition(self, comp):
+        self.backend.hset(self.key("competitions"), comp['title'], json.dumps(comp))
+        self.touch("competitions")
+
+    def delete_competition(self, title):
+        self.backend.hdel(self.key("competitions"), title)
+        self.backend.hdel(self.key("competition_titles"), title.lower())
+        self.backend.lrem(self.key("competition_order"), title)
+        self.backend.delete(self.key("participants", title), self.key("participant_set", title))
+        self.log_membership("competitions", title, None, "clear")
+        for lifecycle_key in ("competition_activated", "competition_closed", "competition_results"):
+            self.backend.hdel(self.key(lifecycle_key), title)
+        self.touch("competitions")
+
+    def list_competitions(self):
+        order = self.backend.lrange(self.key("competition_order"), 0, -1)
+        data = self.backend.hgetall(self.key("competitions"))
+        return [json.loads(data[t]) for t in order if t in data]
+
+    def join(self, title, user):
+        # New participant count, or None if the user had already joined
+        if not self.backend.sadd(self.key("participant_set", title), user):
+            return None
+        self.log_membership("competitions", title, user, "add")
+        count = self.backend.rpush(self.key("participants", title), user)
+        self.touch("competitions")
+        return count
+
+    def participants(self, titles=None):
+        if titles is None:
+            titles = self.backend.lrange(self.key("competition_order"), 0, -1)
+        lists = self.backend.lrange_many([self.key("participants", t) for t in titles])
+        return dict(zip(titles, lists))
+
+    # --- Membership log (replayed into the bitmap indexes) ---
+    def log_membership(self, index, key, member, op):
+        self.backend.rpush(self.key("membership_log"), json.dumps({"index": index, "key": key, "member": member, "op": op}))
+
+    def membership_log(self, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("membership_log"), start, -1)]
+
+    # --- Portfolio votes (sidebar, with monthly quota per voter) ---
+    # Votes are counted per quota period: field "used:<n>" of the voter's hash,
+    # n being the whole reset_days periods since their first vote ("anchor").
+    # A new period starts at zero by itself, so there is no reset to race on:
+    # every write is an HSETNX or an HINCRBY, atomic across processes.
+    def _quota_field(self, voter, limit, reset_days, today):
+        key = self.key("voter", voter)
+        info = self.backend.hgetall(key)
+        if "anchor" not in info:
+            # First vote, or a voter from before period counters: anchored at their last reset
+            self.backend.hsetnx(key, "anchor", info.get("last_reset") or today.isoformat())
+            info = self.backend.hgetall(key)
+        period = max((today - datetime.date.fromisoformat(info["anchor"])).days // reset_days, 0)
+        field = f"used:{period}"
+        if period == 0 and "votes_left" in info and info.get("last_reset") == info["anchor"]:
+            self.backend.hsetnx(key, field, max(limit - int(info["votes_left"]), 0))
+        for old in [f for f in info if f.startswith("used:") and f != field]:
+            self.backend.hdel(key, old)  # a past period
+        return field
+
+    def votes_left(self, voter, limit, reset_days, today=None):
+        field = self._quota_field(voter, limit, reset_days, today or datetime.date.today())
+        return max(limit - int(self.backend.hget(self.key("voter", voter), field) or 0), 0)
+
+    def cast_portfolio_vote(self, voter, student, choice, limit, reset_days, today=None):
+        # choice is "yes" or "no"; returns False when the voter is out of votes
+        field = self._quota_field(voter, limit, reset_days, today or datetime.date.today())
+        if self.backend.hincrby(self.key("voter", voter), field, 1) > limit:
+            self.backend.hincrby(self.key("voter", voter), field, -1)
+            return False
+        self.backend.hincrby(self.key("portfolio_votes", choice), student, 1)
+        self.touch("leaderboards")
+        return True
+
+    def portfolio_votes(self):
+        # {student_name: {"yes": int, "no": int}} plus {email: total} from project votes
+        votes = {}
+        for choice in ("yes", "no"):
+            for student, count in self.backend.hgetall(self.key("portfolio_votes", choice)).items():
+                votes.setdefault(student, {"yes": 0, "no": 0})[choice] = int(count)
+        for email, count in self.backend.hgetall(self.key("portfolio_vote_totals")).items():
+            votes[email] = int(count)
+        return votes
+
+    def portfolio_vote_count(self, student):
+        # One student's yes votes, as portfolio_votes() reports them
+        total = self.backend.hget(self.key("portfolio_vote_totals"), student)
+        if total is not None:
+            return int(total)
+        return int(self.backend.hget(self.key("portfolio_votes", "yes"), student) or 0)
+
+    # --- Project votes (Enhanced Portfolio System) ---
+    def vote_project(self, email, title):
+        self.backend.hincrby(self.key("portfolio_vote_totals"), email, 1)
+        votes = self.backend.hincrby(self.key("project_votes", email), title, 1)
+        self.touch("leaderboards")
+        return votes
+
+    def project_votes(self, email, title):
+        return int(self.backend.hget(self.key("project_votes", email), title) or 0)
+
+    # --- Chat ---
+    def post_chat(self, field, user, message, timestamp=None):
+        # Returns the message's position in the room
+        timestamp = timestamp or datetime.datetime.now()
+        return self.backend.rpush(self.key("chat", field), json.dumps({
+            "user": user,
+            "message": message,
+            "timestamp": timestamp.isoformat()
+        })) - 1
+
+    def chat_messages(self, field, start=0):
+        # Negative start counts from the end, e.g. -50 for the latest 50
+        messages = [json.loads(m) for m in self.backend.lrange(self.key("chat", field), start, -1)]
+        for msg in messages:
+            msg['timestamp'] = datetime.datetime.fromisoformat(msg['timestamp'])
+        return messages
+
+    def chat_length(self, field):
+        return self.backend.llen(self.key("chat", field))
+
+    # --- Notifications ---
+    def notify(self, email, message, key=None):
+        # With a key, the same notification is only delivered once
+        if key is not None and not self.backend.sadd(self.key("notified", email), key):
+            return False
+        stamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.backend.rpush(self.key("notifications", email), f"{stamp} - {message}")
+        return True
+
+    def notifications(self, email, last=10):
+        return self.backend.lrange(self.key("notifications", email), -last, -1)
+
+    # --- Project comments ---
+    # One append-only list per project, so list position is also time order
+    # and serves as the paging cursor. Counts are kept in a separate hash so
+    # cards never have to read the list to show them.
+    def add_comment(self, project_id, author, text, timestamp=None):
+        timestamp = timestamp or datetime.datetime.now()
+        self.backend.rpush(self.key("comments", project_id), json.dumps({
+            "author": author,
+            "text": text,
+            "timestamp": timestamp.isoformat()
+        }))
+        return self.backend.hincrby(self.key("comment_counts"), project_id, 1)
+
+    def comment_count(self, project_id):
+        return int(self.backend.hget(self.key("comment_counts"), project_id) or 0)
+
+    def comment_page(self, project_id, cursor=None, limit=20):
+        # Newest first. cursor=None starts at the newest comment; returns
+        # (comments, cursor for the next older page or None)
+        if cursor is None:
+            raw = self.backend.lrange(self.key("comments", project_id), -limit, -1)
+            start = self.comment_count(project_id) - len(raw) if len(raw) == limit else 0
+        else:
+            start = max(cursor - limit, 0)
+            raw = self.backend.lrange(self.key("comments", project_id), start, cursor - 1) if cursor > 0 else []
+        comments = [json.loads(c) for c in reversed(raw)]
+        for c in comments:
+            c['timestamp'] = datetime.datetime.fromisoformat(c['timestamp'])
+        return comments, (start if start > 0 else None)
+
+    def latest_comments(self, project_id, n=3):
+        return self.comment_page(project_id, limit=n)[0]
+
+    # --- Webhook endpoints (Integration tab) ---
+    def add_webhook(self, endpoint):
+        self.backend.hset(self.key("webhooks"), endpoint['url'], json.dumps(endpoint))
+
+    def remove_webhook(self, url):
+        self.backend.hdel(self.key("webhooks"), url)
+
+    def webhooks(self):
+        return [json.loads(v) for v in self.backend.hgetall(self.key("webhooks")).values()]
+
+    # --- Mentor scores (append-only log per competition) ---
+    def add_score(self, competition, record):
+        return self.backend.rpush(self.key("scores", competition), json.dumps(record))
+
+    def scores(self, competition, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("scores", competition), start, -1)]
+
+    # --- Judge roster and review assignments (append-only log, fusionx/judging.py) ---
+    def add_judge_record(self, record):
+        return self.backend.rpush(self.key("judge_log"), json.dumps(record))
+
+    def judge_records(self, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("judge_log"), start, -1)]
+
+    # --- Competition lifecycle ---
+    def mark_activated(self, title):
+        # True only for the first caller, so activation is announced once
+        if not self.backend.hsetnx(self.key("competition_activated"), title, datetime.datetime.now().isoformat()):
+            return False
+        self.touch("competitions")
+        return True
+
+    def close_competition(self, title):
+        if self.backend.hsetnx(self.key("competition_closed"), title, datetime.datetime.now().isoformat()):
+            self.touch("competitions")
+
+    def closed_competitions(self):
+        return set(self.backend.hgetall(self.key("competition_closed")))
+
+    def finalize_competition(self, title, results):
+        # Winners are persisted once; later calls (other processes) return False
+        return self.backend.hsetnx(self.key("competition_results"), title, json.dumps(results))
+
+    def competition_results(self):
+        return {t: json.loads(r) for t, r in self.backend.hgetall(self.key("competition_results")).items()}
+
+    def closed_times(self):
+        return self.backend.hgetall(self.key("competition_closed"))
+
+    # --- Archived competitions (cold tier, see fusionx/archive.py) ---
+    def archive_competition(self, title, record):
+        # Moves a closed competition out of the hot keys; False if it was already archived.
+        # The title stays reserved so a new competition cannot reuse it.
+        if not self.backend.hsetnx(self.key("archived"), title, json.dumps(record, default=str)):
+            return False
+        self.backend.hdel(self.key("competitions"), title)
+        self.backend.lrem(self.key("competition_order"), title)
+        self.backend.delete(self.key("participants", title), self.key("participant_set", title), self.key("scores", title))
+        self.log_membership("competitions", title, None, "clear")
+        for lifecycle_key in ("competition_activated", "competition_closed", "competition_results"):
+            self.backend.hdel(self.key(lifecycle_key), title)
+        self.touch("competitions")
+        return True
+
+    def is_archived(self, title):
+        return self.backend.hget(self.key("archived"), title) is not None
+
+    def archived_titles(self):
+        return sorted(self.backend.hgetall(self.key("archived")))
+
+    def archived_competitions(self):
+        return {t: json.loads(r) for t, r in self.backend.hgetall(self.key("archived")).items()}
+
+    def add_archive_segment(self, title, path):
+        self.backend.sadd(self.key("archive_segments", title), path)
+
+    def archive_segments(self, title):
+        return sorted(self.backend.smembers(self.key("archive_segments", title)))
+
+    # --- Badges awarded by background services ---
+    def award_badge(self, email, badge):
+        return self.backend.hsetnx(self.key("badges", email), badge['name'], json.dumps(badge))
+
+    def badges(self, email):
+        return [json.loads(b) for b in self.backend.hgetall(self.key("badges", email)).values()]
+
+    # --- Trending signals (append-only log replayed by every process) ---
+    def add_trend_signal(self, record):
+        index = self.backend.rpush(self.key("trending"), json.dumps(record))
+        self.touch("leaderboards")
+        return index
+
+    def trend_signals(self, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("trending"), start, -1)]
+
+    # --- XP ledger (append-only, replayed by every process) ---
+    def add_xp_entry(self, record):
+        index = self.backend.rpush(self.key("xp_ledger"), json.dumps(record))
+        self.touch("leaderboards")
+        return index
+
+    def xp_entries(self, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("xp_ledger"), start, -1)]
+
+    # --- Near-duplicate detection ---
+    def add_signature(self, record):
+        return self.backend.rpush(self.key("signatures"), json.dumps(record))
+
+    def signatures(self, start=0):
+        return [json.loads(r) for r in self.backend.lrange(self.key("signatures"), start, -1)]
+
+    def add_duplicate_flag(self, record):
+        self.backend.rpush(self.key("duplicate_flags"), json.dumps(record))
+
+    def duplicate_flags(self, last=50):
+        return [json.loads(r) for r in self.backend.lrange(self.key("duplicate_flags"), -last, -1)]
+
+    # --- Suspicious votes (fusionx/abuse.py) ---
+    def add_vote_flag(self, record):
+        self.backend.rpush(self.key("vote_flags"), json.dumps(record))
+
+    def vote_flags(self, last=50):
+        return [json.loads(r) for r in self.backend.lrange(self.key("vote_flags"), -last, -1)]
+
+    # --- Weekly rollups ---
+    def add_rollup(self, week, counters):
+        self.backend.sadd(self.key("rollup_weeks"), week)
+        self.backend.hincrby_many(self.key("rollup", week), counters)
+
+    def rollup(self, week):
+        return {name: int(v) for name, v in self.backend.hgetall(self.key("rollup", week)).items()}
+
+    def add_rollup_record(self, week, kind, record):
+        self.backend.sadd(self.key("rollup_weeks"), week)
+        self.backend.rpush(self.key("rollup", week, kind), json.dumps(record))
+        self.touch("winners")
+
+    def rollup_records(self, week, kind):
+        return [json.loads(r) for r in self.backend.lrange(self.key("rollup", week, kind), 0, -1)]
+
+    def rollup_weeks(self):
+        return set(self.backend.smembers(self.key("rollup_weeks")))
@@ -0,0 +1,142 @@
+# fusionx/trending.py
+# "Trending this week" rankings for competitions, portfolio projects and
+# portfolios.
+#
+# A trending score is a sum of event weights decayed exponentially with age:
+#     score(now) = sum(w * exp(-rate * (now - t)))
+# Since exp(-rate * now) is shared by every item, ranking by score(now) is the
+# same as ranking by sum(w * exp(rate * t)), which never needs re-decaying. We
+# keep its logarithm (log-sum-exp, so it cannot overflow): each event is an
+# O(1) update of one item, and an item's score only ever goes up.
+#
+# Because scores only increase, an item can only enter the top k through its
+# own update, so a min-heap of the current top k stays exact with O(log k)
+# work per event and no scans.
+#
+# Signals are appended to a log in the shared store (like mentor scores) and
+# every server process replays new entries into its local indexes on read.
+import datetime
+import heapq
+import math
+import threading
+
+from fusionx import events as ev
+
+HALF_LIFE_DAYS = 3.0  # a vote from a week ago counts about a fifth of one today
+EPOCH = datetime.datetime(2025, 1, 1)
+TRENDING_EVENTS = [ev.VOTE, ev.COMMENT, ev.JOIN, ev.SUBMISSION]
+# Weight of one event of each type
+WEIGHTS = {
+    ev.VOTE: 1.0,
+    ev.COMMENT: 0.5,
+    ev.JOIN: 1.0,
+    ev.SUBMISSION: 2.0
+}
+
+
+def signals_for(event):
+    # [(index, item, weight, info)] for one event
+    kind = event["type"]
+    weight = WEIGHTS[kind]
+    if kind in (ev.JOIN, ev.SUBMISSION):
+        return [("competitions", event["competition"], weight, None)]
+    if kind == ev.VOTE and event.get("choice", "yes") != "yes":
+        return []
+    signals = [("portfolios", event["email"], weight, None)]
+    if event.get("project_id"):
+        info = {"email": event["email"], "title": event.get("project")}
+        signals.append(("projects", event["project_id"], weight, info))
+    return signals
+
+
+class TopK:
+    # Exact top k for keys that only ever increase
+    def __init__(self, k):
+        self.k = k
+        self._scores = {}  # item -> score, for items in the top k
+        self._heap = []  # [(score, item)]; entries not matching _scores are stale
+
+    def _min(self):
+        while self._heap and self._scores.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def update(self, item, score):
+        if item not in self._scores and len(self._scores) >= self.k:
+            low_score, low_item = self._min()
+            if score <= low_score:
+                return
+            heapq.heappop(self._heap)
+            del self._scores[low_item]
+        self._scores[item] = score
+        heapq.heappush(self._heap, (score, item))
+        if len(self._heap) > 4 * self.k:  # drop stale entries now and then
+            self._heap = [(s, i) for i, s in self._scores.items()]
+            heapq.heapify(self._heap)
+
+    def items(self):
+        return sorted(self._scores.items(), key=lambda x: x[1], reverse=True)
+
+
+class TrendingIndex:
+    def __init__(self, half_life_days=HALF_LIFE_DAYS, k=50):
+        self.rate = math.log(2) / (half_life_days * 86400)
+        self.log_scores = {}  # item -> log(sum(w * exp(rate * t)))
+        self.info = {}  # item -> display info from its latest signal
+        self.top = TopK(k)
+
+    def _elapsed(self, when):
+        return (when - EPOCH).total_seconds()
+
+    def add(self, item, weight, when, info=None):
+        x = math.log(weight) + self.rate * self._elapsed(when)
+        old = self.log_scores.get(item)
+        new = x if old is None else max(old, x) + math.log1p(math.exp(-abs(old - x)))
+        self.log_scores[item] = new
+        if info is not None:
+            self.info[item] = info
+        self.top.update(item, new)
+
+    def score(self, item, now=None):
+        log_score = self.log_scores.get(item)
+        if log_score is None:
+            return 0.0
+        return math.exp(log_score - self.rate * self._elapsed(now or datetime.datetime.now()))
+
+    def trending(self, n=5, now=None):
+        now = now or datetime.datetime.now()
+        decay = self.rate * self._elapsed(now)
+        return [(item, math.exp(log_score - decay), self.info.get(item)) for item, log_score in self.top.items()[:n]]
+
+
+class Trending:
+    def __init__(self, store, half_life_days=HALF_LIFE_DAYS, k=50):
+        self.store = store
+        self.indexes = {name: TrendingIndex(half_life_days, k) for name in ("competitions", "projects", "portfolios")}
+        self._offset = 0  # signal log entries already replayed
+        self._lock = threading.Lock()
+
+    # --- Event subscriber ---
+    def handle(self, event):
+        signals = signals_for(event)
+        if signals:
+            self.store.add_trend_signal({"timestamp": event["timestamp"], "signals": signals})
+
+    # --- Reading ---
+    def _sync(self):
+        records = self.store.trend_signals(start=self._offset)
+        for record in records:
+            when = datetime.datetime.fromisoformat(record["timestamp"])
+            for name, item, weight, info in record["signals"]:
+                self.indexes[name].add(item, weight, when, info)
+        self._offset += len(records)
+
+    def top(self, name, n=5):
+        with self._lock:
+            self._sync()
+            return self.indexes[name].trending(n)
+
+    def score(self, name, item):
+        with self._lock:
+            self._sync()
+            return self.indexes[name].score(item)
@@ -0,0 +1,262 @@
+# fusionx/uploads.py
+# Upload inspection off the rerun thread.
+#
+# attach() only records the file name and size on the submission (or project)
+# and hands the upload to a small worker pool, so a large or hostile file
+# never blocks a rerun. A worker then
+#   1. streams the upload into the blob store in chunks,
+#   2. sniffs the real type from the first bytes (PNG, JPEG, PDF, ZIP) and
+#      rejects files whose content does not match their extension,
+#   3. reads metadata without loading or unpacking the file: ZIP entries
+#      from the central directory (once the end-of-central-directory record
+#      says there are not too many), PDF page counts from a chunked scan,
+#      image dimensions from the PNG header / JPEG frame marker,
+#   4. enforces the limits below (upload size, unpacked ZIP size, entries,
+#      compression ratio, image pixels) against zip and image bombs,
+# and writes the result to item["upload"]: {"status": "checking" | "ok" |
+# "rejected", "mime", "reason", "meta"}. The upload is staged next to the
+# blob store and only moved into it once it passes; a rejected file is
+# deleted and never attached (file_ref stays None).
+#
+# Verdicts are cached by content hash and extension (the most recent
+# MAX_VERDICTS), so the same file uploaded again is not inspected twice.
+import collections
+import concurrent.futures
+import logging
+import os
+import re
+import struct
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # as uploaded (compressed for ZIPs)
+MAX_UNPACKED_BYTES = 500 * 1024 * 1024  # total declared size of a ZIP's entries
+MAX_ZIP_ENTRIES = 10_000
+MAX_RATIO = 100  # uncompressed / compressed, per entry and overall
+MAX_IMAGE_PIXELS = 50_000_000
+MAX_VERDICTS = 10_000
+MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "pdf": "application/pdf", "zip": "application/zip"}
+
+_PDF_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_PDF_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b", re.S)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class Rejected(Exception):
+    pass
+
+
+def sniff(head):
+    # MIME type from the first bytes of a file, or None
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "application/zip"
+    return None
+
+
+def png_size(f):
+    f.seek(16)
+    width, height = struct.unpack(">II", f.read(8))
+    return width, height
+
+
+def jpeg_size(f):
+    # Walks the segment markers up to the first frame header
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise Rejected("corrupt JPEG")
+        kind = marker[1]
+        if kind in (0xD8, 0x01) or 0xD0 <= kind <= 0xD7:
+            continue  # markers without a length
+        length = struct.unpack(">H", f.read(2))[0]
+        if kind in _JPEG_SOF:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def pdf_pages(f, chunk_size=CHUNK_SIZE):
+    # Page objects counted chunk by chunk; the last bytes of each window are
+    # carried over so a token split across chunks still matches exactly once.
+    # PDFs that keep their objects in compressed streams fall back to the page
+    # tree's /Count.
+    f.seek(0)
+    pages = count = counted = 0  # matches ending at or before `counted` in the window were seen
+    tail = b""
+    chunk = f.read(chunk_size)
+    while chunk:
+        following = f.read(chunk_size)
+        window = tail + chunk
+        limit = len(window) - 1 if following else len(window)  # "/Page" at the very end may be "/Pages"
+        pages += sum(1 for m in _PDF_PAGE.finditer(window) if counted < m.end() <= limit)
+        count = max([count] + [int(a or b) for a, b in _PDF_COUNT.findall(window)])
+        keep = max(len(window) - 64, 0)
+        tail = window[keep:]
+        counted = limit - keep
+        chunk = following
+    return pages or count or None
+
+
+def zip_entry_count(f, size):
+    # Entry count from the end-of-central-directory record (ZIP64 when it says 0xFFFF),
+    # so a huge central directory is refused before it is read
+    tail_size = min(size, 22 + 0xFFFF)  # the record plus the longest comment
+    f.seek(size - tail_size)
+    tail = f.read(tail_size)
+    end = tail.rfind(b"PK\x05\x06")
+    if end < 0 or len(tail) - end < 22:
+        raise Rejected("corrupt ZIP")
+    count = struct.unpack("<H", tail[end + 10:end + 12])[0]
+    if count == 0xFFFF and end >= 20 and tail[end - 20:end - 16] == b"PK\x06\x07":
+        offset = struct.unpack("<Q", tail[end - 12:end - 4])[0]
+        f.seek(offset)
+        record = f.read(40)
+        if len(record) < 40 or not record.startswith(b"PK\x06\x06"):
+            raise Rejected("corrupt ZIP")
+        count = struct.unpack("<Q", record[32:40])[0]
+    return count
+
+
+def zip_listing(f, size):
+    # Reads only the central directory; nothing is decompressed
+    count = zip_entry_count(f, size)
+    if count > MAX_ZIP_ENTRIES:
+        raise Rejected(f"ZIP has {count:,} entries (limit {MAX_ZIP_ENTRIES:,})")
+    try:
+        with zipfile.ZipFile(f) as archive:
+            entries = archive.infolist()
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError, OSError, EOFError):
+        raise Rejected("corrupt ZIP")
+    if len(entries) > MAX_ZIP_ENTRIES:
+        raise Rejected(f"ZIP has {len(entries):,} entries (limit {MAX_ZIP_ENTRIES:,})")
+    unpacked = 0
+    for entry in entries:
+        name = entry.filename.replace("\\", "/")
+        if name.startswith("/") or ".." in name.split("/") or re.match(r"^[A-Za-z]:", name):
+            raise Rejected(f"unsafe path in ZIP: {entry.filename}")
+        if entry.compress_size and entry.file_size / entry.compress_size > MAX_RATIO:
+            raise Rejected(f"{entry.filename} expands {entry.file_size // entry.compress_size}x (limit {MAX_RATIO}x)")
+        unpacked += entry.file_size
+    if unpacked > MAX_UNPACKED_BYTES:
+        raise Rejected(f"ZIP unpacks to {unpacked / 1e6:,.0f} MB (limit {MAX_UNPACKED_BYTES / 1e6:,.0f} MB)")
+    if size and unpacked / size > MAX_RATIO:
+        raise Rejected(f"ZIP expands {unpacked // size}x (limit {MAX_RATIO}x)")
+    files = [e for e in entries if not e.is_dir()]
+    return {"entries": len(files), "unpacked_bytes": unpacked,
+            "encrypted": any(e.flag_bits & 0x1 for e in entries),
+            "nested_archives": sum(1 for e in files if e.filename.lower().endswith((".zip", ".7z", ".rar", ".gz", ".tar")))}
+
+
+def inspect_file(f, size, extension):
+    # {"mime", "meta"} for an acceptable file, else raises Rejected
+    if size > MAX_UPLOAD_BYTES:
+        raise Rejected(f"{size / 1e6:,.1f} MB is over the {MAX_UPLOAD_BYTES / 1e6:,.0f} MB limit")
+    f.seek(0)
+    mime = sniff(f.read(16))
+    expected = MIME_TYPES.get(extension)
+    if mime is None or (expected and mime != expected):
+        raise Rejected(f"content is {mime or 'not a supported type'}, not .{extension}")
+    if mime == "application/zip":
+        meta = zip_listing(f, size)
+    elif mime == "application/pdf":
+        meta = {"pages": pdf_pages(f)}
+    else:
+        try:
+            width, height = png_size(f) if mime == "image/png" else jpeg_size(f)
+        except struct.error:
+            raise Rejected("corrupt image")
+        if width * height > MAX_IMAGE_PIXELS:
+            raise Rejected(f"{width}x{height} image is over {MAX_IMAGE_PIXELS / 1e6:.0f} megapixels")
+        meta = {"width": width, "height": height}
+    return {"mime": mime, "meta": meta}
+
+
+def describe(upload):
+    # Short status line for an item["upload"]
+    if not upload:
+        return ""
+    if upload["status"] == "checking":
+        return "⏳ checking…"
+    if upload["status"] == "rejected":
+        return f"⛔ rejected: {upload['reason']}"
+    meta = upload["meta"]
+    if "pages" in meta:
+        return f"✅ PDF, {meta['pages']} pages" if meta["pages"] else "✅ PDF"
+    if "width" in meta:
+        return f"✅ {upload['mime'].split('/')[1].upper()} {meta['width']}×{meta['height']}"
+    return f"✅ ZIP, {meta['entries']} files, {meta['unpacked_bytes'] / 1e6:.1f} MB unpacked"
+
+
+class UploadInspector:
+    def __init__(self, blobs, workers=2):
+        self.blobs = blobs
+        self._pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="fusionx-upload")
+        self._verdicts = collections.OrderedDict()  # (file_ref, extension) -> upload status, least recent first
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "rejected": 0, "reused": 0, "bytes": 0}
+
+    def attach(self, item, upload):
+        # Sets item's file fields now; a worker fills in file_ref and item["upload"].
+        # Returns the worker's future, or None when there is nothing to inspect.
+        if upload is None:
+            item.update({"file": None, "file_ref": None, "file_size": 0})
+            return None
+        item.update({"file": upload.name, "file_ref": None, "file_size": upload.size, "upload": {"status": "checking"}})
+        if upload.size > MAX_UPLOAD_BYTES:  # rejected without copying it anywhere
+            with self._lock:
+                self._stats["rejected"] += 1
+            item["upload"] = {"status": "rejected", "reason": f"{upload.size / 1e6:,.1f} MB is over the {MAX_UPLOAD_BYTES / 1e6:,.0f} MB limit"}
+            return None
+        return self._pool.submit(self._process, item, upload)
+
+    def _process(self, item, upload):
+        staged = None
+        try:
+            upload.seek(0)
+            ref, staged = self.blobs.stage(upload)  # streamed in chunks while hashing
+            extension = os.path.splitext(upload.name)[1].lstrip(".").lower()
+            with self._lock:
+                verdict = self._verdicts.get((ref, extension))
+                if verdict is not None:
+                    self._verdicts.move_to_end((ref, extension))
+                self._stats["reused" if verdict else "checked"] += 1
+            if verdict is None:
+                size = os.path.getsize(staged)
+                try:
+                    with open(staged, "rb") as f:
+                        verdict = {"status": "ok", **inspect_file(f, size, extension)}
+                    with self._lock:
+                        self._stats["bytes"] += size
+                except Rejected as e:
+                    verdict = {"status": "rejected", "reason": str(e)}
+                with self._lock:
+                    self._verdicts[(ref, extension)] = verdict
+                    while len(self._verdicts) > MAX_VERDICTS:
+                        self._verdicts.popitem(last=False)
+            if verdict["status"] == "ok":
+                self.blobs.keep(ref, staged)
+                item.update({"file_ref": ref, "file_size": self.blobs.size(ref)})
+            else:
+                self.blobs.discard(staged)
+                with self._lock:
+                    self._stats["rejected"] += 1
+            item["upload"] = verdict
+        except Exception:
+            logger.exception("Inspecting upload %s failed", upload.name)
+            if staged is not None:
+                self.blobs.discard(staged)
+            item["upload"] = {"status": "rejected", "reason": "could not be read"}
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
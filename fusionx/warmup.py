@@ -0,0 +1,227 @@
+# fusionx/warmup.py
+# Boot-time warm-up of the read models and a readiness signal for the load
+# balancer.
+#
+# Most read paths (participant counts, score rankings, trending, XP
+# leaderboards, the duplicate index, judge queues, newsletter rollups) replay
+# logs from the shared store into in-memory models the first time they are
+# read, so right after a deploy the first visitors pay for every replay.
+# Warmup runs those replays for every served campus on a thread pool as soon
+# as the app script first runs, then keeps timing rounds of the same reads
+# until their p99 latency stops moving (steady state) and only then reports
+# ready. Progress goes to a small JSON status file per app process.
+#
+# Streamlit has no startup hook and only runs the app script for a session, so
+# the side-car in this module opens one headless session over Streamlit's
+# websocket right after boot (which starts the warm-up) and answers GET
+# /readyz with 503 until the status file says ready, 200 after:
+#
+#   FUSIONX_APP_URL=http://127.0.0.1:8501 python -m fusionx.warmup
+#
+# Point the load balancer's health check at /readyz on FUSIONX_READY_PORT
+# (default 8502).
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROBE_CALLS = 5  # calls of every read per probe round
+PROBE_ROUNDS = 10  # give up waiting for steady state after this many rounds
+STEADY = 0.25  # p99 within 25% of the previous round counts as steady
+STEADY_MS = 1.0  # ... as does a change below a millisecond
+
+
+def status_path(data_dir, port):
+    return os.path.join(data_dir, f"warmup-{port}.json")
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Warmup:
+    # tasks: [(name, fn)]; each fn performs one hot read and builds its model on first call
+    def __init__(self, tasks, workers=4, status_file=None):
+        self.tasks = list(tasks)
+        self.workers = workers
+        self.status_file = status_file
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._status = {"state": "idle", "pid": os.getpid(), "tasks": {}, "failed": [], "p99_ms": [], "seconds": None}
+
+    def start(self):
+        with self._lock:
+            if self._status["state"] != "idle":
+                return
+            self._status.update(state="warming", started_at=datetime.datetime.now().isoformat())
+        self._write()
+        threading.Thread(target=self._run, name="fusionx-warmup", daemon=True).start()
+
+    def _timed(self, name, fn):
+        start = time.perf_counter()
+        fn()
+        return name, time.perf_counter() - start
+
+    def _run(self):
+        began = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix="fusionx-warmup") as pool:
+            futures = {pool.submit(self._timed, name, fn): name for name, fn in self.tasks}
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future]
+                try:
+                    _, seconds = future.result()
+                    with self._lock:
+                        self._status["tasks"][name] = round(seconds, 3)
+                except Exception:
+                    # The model is simply built on first use instead
+                    logger.exception("Warm-up task %s failed", name)
+                    with self._lock:
+                        self._status["failed"].append(name)
+                self._write()
+        with self._lock:
+            self._status["state"] = "probing"
+        self._write()
+
+        previous = None
+        for _ in range(PROBE_ROUNDS):
+            p99 = self._probe_round()
+            with self._lock:
+                self._status["p99_ms"].append(round(p99, 2))
+            self._write()
+            if previous is not None and abs(p99 - previous) <= max(STEADY * previous, STEADY_MS):
+                break
+            previous = p99
+        with self._lock:
+            self._status.update(state="ready", seconds=round(time.perf_counter() - began, 2),
+                                ready_at=datetime.datetime.now().isoformat())
+        self._write()
+        self.ready.set()
+
+    def _probe_round(self):
+        # p99 in milliseconds of every read, PROBE_CALLS times each
+        latencies = []
+        with self._lock:
+            failed = set(self._status["failed"])
+        for name, fn in self.tasks:
+            if name in failed:
+                continue
+            for _ in range(PROBE_CALLS):
+                latencies.append(self._timed(name, fn)[1] * 1000)
+        return percentile(latencies, 0.99) if latencies else 0.0
+
+    def _write(self):
+        if not self.status_file:
+            return
+        status = self.status()
+        os.makedirs(os.path.dirname(self.status_file) or ".", exist_ok=True)
+        tmp = f"{self.status_file}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(status, f)
+        os.replace(tmp, self.status_file)
+
+    def status(self):
+        with self._lock:
+            return json.loads(json.dumps(self._status))
+
+
+# --- Side-car: primes the app after boot and serves /readyz ---
+def read_status(path):
+    # The status file of a running app process, or None (missing, or left by a process that exited)
+    try:
+        with open(path, encoding="utf-8") as f:
+            status = json.load(f)
+        os.kill(status["pid"], 0)
+    except (OSError, ValueError, KeyError):
+        return None
+    return status
+
+
+def prime(app_url, timeout=300):
+    # Runs the app script once in a headless session, like a browser opening the page.
+    # Returns True once the script finished.
+    import asyncio
+    import urllib.parse
+
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.asyncio.client import connect  # installed with Streamlit
+
+    parts = urllib.parse.urlsplit(app_url)
+    stream_url = f"{'wss' if parts.scheme == 'https' else 'ws'}://{parts.netloc}{parts.path.rstrip('/')}/_stcore/stream"
+
+    async def run():
+        async with connect(stream_url, subprotocols=["streamlit"], max_size=None) as ws:
+            message = BackMsg()
+            message.rerun_script.query_string = parts.query
+            await ws.send(message.SerializeToString())
+            while True:
+                reply = ForwardMsg()
+                reply.ParseFromString(await ws.recv())
+                if reply.WhichOneof("type") == "script_finished":
+                    return True
+
+    try:
+        return asyncio.run(asyncio.wait_for(run(), timeout))
+    except Exception:
+        logger.exception("Could not prime %s", app_url)
+        return False
+
+
+def app_healthy(app_url):
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(f"{app_url.rstrip('/')}/_stcore/health", timeout=5) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def keep_primed(app_url, path, interval=5.0):
+    # Primes the app whenever it is up without a live warm-up (first boot or a restart)
+    while True:
+        if read_status(path) is None and app_healthy(app_url):
+            prime(app_url)
+        time.sleep(interval)
+
+
+def serve(app_url, path, host="127.0.0.1", port=8502):
+    import http.server
+
+    class ReadinessHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/readyz":
+                self.send_error(404)
+                return
+            status = read_status(path) or {"state": "down"}
+            body = json.dumps(status).encode("utf-8")
+            self.send_response(200 if status["state"] == "ready" else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            if self.command == "GET":
+                self.wfile.write(body)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass  # load balancer probes would flood the log
+
+    threading.Thread(target=keep_primed, args=(app_url, path), name="fusionx-prime", daemon=True).start()
+    http.server.ThreadingHTTPServer((host, port), ReadinessHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    import urllib.parse
+
+    app_url = os.environ.get("FUSIONX_APP_URL", "http://127.0.0.1:8501")
+    app_port = urllib.parse.urlsplit(app_url).port or 8501
+    serve(app_url, status_path(os.environ.get("FUSIONX_DATA_DIR", "fusionx_data"), app_port),
+          host=os.environ.get("FUSIONX_READY_HOST", "127.0.0.1"), port=int(os.environ.get("FUSIONX_READY_PORT", "8502")))
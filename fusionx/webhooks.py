@@ -0,0 +1,383 @@
+# fusionx/webhooks.py
+# Outbound Slack / Discord / Teams notifications for the Integration tab.
+#
+# Events are handed to WebhookDispatcher.submit() from a Streamlit rerun; the
+# call only bumps a counter and schedules the event on a background asyncio
+# loop, so sending never blocks the page. The loop routes each event to
+# per-endpoint queues, batches them, retries failed batches with exponential
+# backoff and writes batches that still fail to a dead-letter JSONL file.
+#
+# Backpressure: the main queue and every endpoint queue are bounded. When a
+# queue is full the event is dead-lettered instead of growing memory, and a
+# slow endpoint only fills its own queue without delaying the others. A
+# Retry-After header is honoured up to backoff_max, and an endpoint removed
+# from the list has its sender cancelled and its backlog dead-lettered.
+#
+# Dead letters are appended to the file by a writer thread, so neither the
+# loop nor submit() waits on disk, and dead_letters() only reads the end of
+# the file.
+import asyncio
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+from fusionx import events as ev
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_KINDS = ["slack", "discord", "teams", "generic"]
+WEBHOOK_EVENTS = [ev.SUBMISSION, ev.COMPETITION_ACTIVATED, ev.WINNER]
+
+
+# -----------------------------
+# Message Formatting
+# -----------------------------
+def format_event(event):
+    kind = event.get("type")
+    if kind == ev.SUBMISSION:
+        return f"📥 New submission '{event.get('title')}' for '{event.get('competition')}' by {event.get('submitter', 'Unknown')}"
+    if kind == ev.COMPETITION_ACTIVATED:
+        return f"🚀 '{event.get('competition')}' is now active ({event.get('participants')}/{event.get('threshold')} participants)"
+    if kind == ev.WINNER:
+        rank = event.get("rank", 0)
+        place = f"{rank}{['st', 'nd', 'rd'][rank - 1] if 1 <= rank <= 3 else 'th'} Place"
+        return f"🏆 {place} in '{event.get('competition')}': {event.get('name', 'Unknown')}"
+    return f"FusionX event: {kind}"
+
+
+def build_payload(kind, batch):
+    text = "\n".join(format_event(e) for e in batch)
+    if kind == "slack":
+        return {"text": text}
+    if kind == "discord":
+        return {"content": text[:2000]}  # Discord message limit
+    if kind == "teams":
+        return {"text": text}
+    return {"events": batch}
+
+
+# -----------------------------
+# Minimal asyncio HTTP client
+# -----------------------------
+async def post_json(url, payload, timeout):
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    body = json.dumps(payload, default=str).encode("utf-8")
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, port, ssl=ssl.create_default_context() if secure else None),
+        timeout
+    )
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc.rpartition('@')[2]}\r\n"
+            "User-Agent: FusionX-Webhooks\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        if not status_line:
+            raise ConnectionError("empty response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+# -----------------------------
+# Dispatcher
+# -----------------------------
+class WebhookDispatcher:
+    def __init__(self, get_endpoints, dead_letter_path=None, queue_size=10000, endpoint_queue_size=5000,
+                 batch_size=50, batch_interval=0.5, max_retries=5, backoff_base=0.5, backoff_max=30.0,
+                 timeout=10.0, refresh_interval=5.0, sender=post_json):
+        self.get_endpoints = get_endpoints  # callable returning [{"url", "kind", "events"}]
+        self.dead_letter_path = dead_letter_path
+        self.queue_size = queue_size
+        self.endpoint_queue_size = endpoint_queue_size
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.sender = sender
+
+        self._lock = threading.Lock()
+        self._dead_letter_queue = queue.Queue()
+        self._dead_letter_writer = None
+        self._stats = {"queued": 0, "sent": 0, "batches": 0, "retries": 0, "failed": 0, "dropped": 0}
+        self._pending = 0  # events submitted but not yet routed
+        self._in_flight = 0  # events taken off an endpoint queue but not yet delivered
+        self._loop = None
+        self._thread = None
+        self._queue = None
+        self._endpoints = {}  # {url: endpoint}
+        self._endpoint_queues = {}  # {url: asyncio.Queue}
+        self._senders = {}  # {url: asyncio.Task}
+        self._endpoints_loaded_at = 0.0
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="fusionx-webhooks", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()  # bounded by self._pending in submit()
+        self._loop.create_task(self._route())
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+        self._loop = None
+
+    def wait_idle(self, timeout=30.0):
+        # Block until every submitted event is delivered or dead-lettered
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                busy = self._pending or self._in_flight
+            if not busy and not any(q.qsize() for q in list(self._endpoint_queues.values())) \
+                    and not self._dead_letter_queue.unfinished_tasks:
+                return True
+            time.sleep(0.01)
+        return False
+
+    # --- Producer side (called from Streamlit reruns) ---
+    def submit(self, event):
+        with self._lock:
+            if self._loop is None or self._pending >= self.queue_size:
+                self._stats["dropped"] += 1
+                full = True
+            else:
+                self._pending += 1
+                self._stats["queued"] += 1
+                full = False
+        if full:
+            self._dead_letter(None, [event], "queue_full")
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:  # loop stopped between the check and the call
+            with self._lock:
+                self._pending -= 1
+            return False
+        return True
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["pending"] = self._pending + self._in_flight
+        snapshot["backlog"] = sum(q.qsize() for q in list(self._endpoint_queues.values()))
+        return snapshot
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    # --- Routing ---
+    async def _refresh_endpoints(self):
+        if time.monotonic() - self._endpoints_loaded_at < self.refresh_interval:
+            return
+        self._endpoints_loaded_at = time.monotonic()
+        try:
+            # The endpoint list may come from Redis, so keep it off the loop thread
+            endpoints = await asyncio.get_running_loop().run_in_executor(None, self.get_endpoints)
+        except Exception:
+            logger.exception("Could not load webhook endpoints")
+            return
+        self._endpoints = {e['url']: e for e in endpoints}
+        for url in self._endpoints:
+            if url not in self._endpoint_queues:
+                self._endpoint_queues[url] = asyncio.Queue(maxsize=self.endpoint_queue_size)
+                self._senders[url] = asyncio.get_running_loop().create_task(self._send_loop(url))
+        for url in [u for u in self._endpoint_queues if u not in self._endpoints]:
+            await self._remove_endpoint(url)
+
+    async def _remove_endpoint(self, url):
+        # Stops the sender (its batch in flight is dead-lettered by _send_loop) and dead-letters the backlog
+        sender = self._senders.pop(url)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        endpoint_queue = self._endpoint_queues.pop(url)
+        backlog = []
+        while not endpoint_queue.empty():
+            backlog.append(endpoint_queue.get_nowait())
+        if backlog:
+            self._count("dropped", len(backlog))
+            self._dead_letter(url, backlog, "endpoint_removed")
+
+    async def _route(self):
+        while True:
+            event = await self._queue.get()
+            await self._refresh_endpoints()
+            for url, endpoint in self._endpoints.items():
+                if endpoint.get("events") and event.get("type") not in endpoint["events"]:
+                    continue
+                try:
+                    self._endpoint_queues[url].put_nowait(event)
+                except asyncio.QueueFull:
+                    self._count("dropped")
+                    self._dead_letter(url, [event], "endpoint_backlog")
+            with self._lock:
+                self._pending -= 1
+
+    # --- Sending ---
+    async def _send_loop(self, url):
+        queue = self._endpoint_queues[url]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            self._count_in_flight(1)
+            deadline = loop.time() + self.batch_interval
+            while len(batch) < self.batch_size:
+                if queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+                self._count_in_flight(1)
+            try:
+                await self._deliver(url, batch)
+            except asyncio.CancelledError:
+                self._count("dropped", len(batch))
+                self._dead_letter(url, batch, "endpoint_removed")
+                raise
+            finally:
+                self._count_in_flight(-len(batch))
+
+    def _count_in_flight(self, amount):
+        with self._lock:
+            self._in_flight += amount
+
+    async def _deliver(self, url, batch):
+        endpoint = self._endpoints.get(url, {"url": url})
+        payload = build_payload(endpoint.get("kind", "generic"), batch)
+        error = "unknown error"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, headers = await self.sender(url, payload, self.timeout)
+            except (OSError, asyncio.TimeoutError, ValueError) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if 200 <= status < 300:
+                    self._count("sent", len(batch))
+                    self._count("batches")
+                    return True
+                error = f"HTTP {status}"
+                if status != 429 and status < 500:
+                    break  # client errors will not succeed on retry
+                if headers.get("retry-after", "").isdigit():
+                    retry_after = min(int(headers["retry-after"]), self.backoff_max)
+            if attempt == self.max_retries:
+                break
+            self._count("retries")
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            await asyncio.sleep(retry_after if retry_after is not None else delay / 2 + random.uniform(0, delay / 2))
+        self._count("failed", len(batch))
+        self._dead_letter(url, batch, error)
+        return False
+
+    # --- Dead letters ---
+    def _dead_letter(self, url, batch, reason):
+        if not self.dead_letter_path:
+            return
+        record = {
+            "endpoint": url,
+            "reason": reason,
+            "failed_at": datetime.datetime.now().isoformat(),
+            "events": batch
+        }
+        with self._lock:
+            if self._dead_letter_writer is None:
+                self._dead_letter_writer = threading.Thread(target=self._write_dead_letters, name="fusionx-dead-letters", daemon=True)
+                self._dead_letter_writer.start()
+        self._dead_letter_queue.put(json.dumps(record, default=str) + "\n")
+
+    def _write_dead_letters(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.dead_letter_path)), exist_ok=True)
+        while True:
+            lines = [self._dead_letter_queue.get()]
+            while True:
+                try:
+                    lines.append(self._dead_letter_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            except OSError:
+                logger.exception("Could not write %d webhook dead letters", len(lines))
+            for _ in lines:
+                self._dead_letter_queue.task_done()
+
+    def dead_letters(self, last=10):
+        if not self.dead_letter_path:
+            return []
+        return [json.loads(line) for line in tail_lines(self.dead_letter_path, last)]
+
+
+def tail_lines(path, n, block_size=64 * 1024):
+    # The last n lines of a text file, reading backwards from its end in blocks
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        data = b""
+        while end > 0 and data.count(b"\n") <= n:
+            start = max(end - block_size, 0)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    lines = data.decode("utf-8").splitlines()
+    return [line for line in lines[-n:] if line.strip()] if n > 0 else []
@@ -0,0 +1,250 @@
+# fusionx/widgets.py
+import datetime
+import itertools
+import os
+
+import streamlit as st
+
+from fusionx import events as ev
+from fusionx.search import PrefixIndex
+from fusionx.uploads import describe
+
+
+# -----------------------------
+# Fragment: Portfolio Voting & Comment Card
+# -----------------------------
+# Each card is its own fragment, so clicking "Submit Vote" or "Submit Comment"
+# re-executes only this card instead of the whole FusionXapp.py script.
+# The card only receives keys and looks the project up itself.
+def find_project(email, title):
+    for proj in st.session_state.portfolios.get(email, []):
+        if proj['title'] == title:
+            return proj
+    return None
+
+
+def project_id(email, proj):
+    # Projects created before ids existed fall back to owner + title
+    return proj.get('id') or f"{email}/{proj['title']}"
+
+
+def show_comments(comments):
+    for c in comments:
+        st.markdown(f"- **{c['author']}** ({c['timestamp']:%Y-%m-%d %H:%M}): {c['text']}")
+
+
+def comment_summary(store, email, proj):
+    # Count and latest three comments: one counter read and one short range read
+    count = store.comment_count(project_id(email, proj))
+    if count:
+        st.markdown(f"**Comments ({count}):**")
+        show_comments(store.latest_comments(project_id(email, proj)))
+
+
+@st.fragment
+def portfolio_card(store, events, email, title):
+    proj = find_project(email, title)
+    if proj is None:
+        return
+    student_name = st.session_state.student_accounts.get(email, {}).get('name', 'Unknown')
+
+    st.markdown(f"**{proj['title']}** by {student_name} ({proj['field']})")
+    st.markdown(f"{proj['description']}")
+
+    if proj.get('verified'):
+        st.markdown("✅ Verified")
+
+    # Voting
+    vote = st.radio(f"Vote for {proj['title']}", ["No", "Yes"], key=f"vote_{email}_{proj['title']}")
+    if st.button(f"Submit Vote for {proj['title']}", key=f"vote_btn_{email}_{proj['title']}"):
+        if vote == "Yes":
+            # Also increments the account's total portfolio votes in the store
+            proj['votes'] = store.vote_project(email, proj['title'])
+            events.publish(ev.VOTE, email=email, project=proj['title'], project_id=project_id(email, proj),
+                           field=proj.get('field'), choice="yes", session=st.session_state.get('guest_id'))
+            st.success(f"You voted for {proj['title']}")
+
+    # Commenting
+    pid = project_id(email, proj)
+    comment_author = st.text_input("Your name", key=f"comment_author_{email}_{proj['title']}")
+    comment_text = st.text_input(f"Leave a comment for {proj['title']}", key=f"comment_{email}_{proj['title']}")
+    if st.button(f"Submit Comment for {proj['title']}", key=f"comment_btn_{email}_{proj['title']}"):
+        if comment_text:
+            store.add_comment(pid, comment_author or "Anonymous", comment_text)
+            events.publish(ev.COMMENT, email=email, project=proj['title'], project_id=pid, author=comment_author or "Anonymous")
+            st.success("Comment submitted.")
+
+    # Latest comments first; older pages are loaded 20 at a time on request
+    proj['comment_count'] = store.comment_count(pid)
+    pages_key = f"comment_pages_{pid}"
+    if st.session_state.get(f"{pages_key}_count") != proj['comment_count']:
+        st.session_state[pages_key] = []  # cursors of the older pages opened so far
+        st.session_state[f"{pages_key}_count"] = proj['comment_count']  # new comments reset paging
+    comments, cursor = store.comment_page(pid, limit=3)
+    if comments:
+        st.markdown(f"**Comments ({proj['comment_count']}):**")
+        show_comments(comments)
+        for page_cursor in st.session_state[pages_key]:
+            older, cursor = store.comment_page(pid, cursor=page_cursor)
+            show_comments(older)
+        if cursor is not None and st.button("Show older comments", key=f"comment_more_{pid}"):
+            st.session_state[pages_key].append(cursor)
+            older, cursor = store.comment_page(pid, cursor=cursor)
+            show_comments(older)
+
+    proj['votes'] = store.project_votes(email, proj['title'])
+    st.markdown(f"⭐ Votes: {proj.get('votes',0)}")
+
+
+# -----------------------------
+# Fragment: Field Chat Room
+# -----------------------------
+# Sending a message reruns only the chat room, not the rest of the page, and
+# the room refreshes itself every CHAT_REFRESH_SECONDS. New messages are
+# pushed to this session's broker subscription; besides an O(1) length check,
+# the store (shared by every server process) is only read when joining the
+# room, after the session was dropped as a slow consumer, or when another
+# process posted in the room.
+CHAT_REFRESH_SECONDS = 1
+CHAT_HISTORY = 200  # messages kept and shown per room
+
+
+def sync_chat_log(store, field, subscription):
+    # The latest CHAT_HISTORY messages of the room, kept in session state
+    log_key = f"chat_log_{field}"
+    log = st.session_state.get(log_key)  # {"offset": messages in the room so far, "messages": [...]}
+    if log is None:
+        length = store.chat_length(field)
+        log = {"offset": length, "messages": store.chat_messages(field, start=max(0, length - CHAT_HISTORY))}
+    else:
+        for msg in subscription.drain():
+            if msg['index'] < log['offset']:
+                continue  # already read from the store
+            if msg['index'] > log['offset']:
+                break  # gap: posted by another server process, read below
+            log['messages'].append(msg)
+            log['offset'] += 1
+        # Messages from other processes, or missed while this session was dropped
+        length = store.chat_length(field)
+        if length > log['offset']:
+            log['messages'].extend(store.chat_messages(field, start=max(log['offset'], length - CHAT_HISTORY)))
+            log['offset'] = length
+        log['messages'] = log['messages'][-CHAT_HISTORY:]
+    st.session_state[log_key] = log
+    return log['messages']
+
+
+def chat_line(msg):
+    return f"**{msg['user']}** ({msg['timestamp'].strftime('%Y-%m-%d %H:%M')}): {msg['message']}"
+
+
+@st.fragment(run_every=CHAT_REFRESH_SECONDS)
+def chat_room(store, events, broker, field, user_name):
+    st.markdown(f"### Chat Room: {field}")
+    messages_box = st.container()  # messages render above the input box
+    subscription = broker.subscribe(field, st.session_state.guest_id)
+
+    # Input for new message
+    new_message = st.text_input("Type your message here", key="new_chat_msg")
+    if st.button("Send Message"):
+        if new_message and user_name:
+            sent_at = datetime.datetime.now()
+            index = store.post_chat(field, user_name, new_message, timestamp=sent_at)
+            events.publish(ev.CHAT, field=field, user=user_name, message=new_message, index=index,
+                           sent_at=sent_at.isoformat())
+        else:
+            st.warning("Please enter your name and a message to send.")
+
+    messages = sync_chat_log(store, field, subscription)
+    with messages_box:
+        if messages:
+            for msg in messages:
+                st.markdown(chat_line(msg))
+        else:
+            st.info("No messages yet. Start the conversation!")
+
+
+# -----------------------------
+# Uploaded File Line
+# -----------------------------
+# Uploads are checked in the background (fusionx/uploads.py). While a check is
+# running the line is a fragment that re-renders itself until the verdict is in.
+UPLOAD_REFRESH_SECONDS = 1
+
+
+def upload_line(item):
+    status = describe(item.get("upload"))
+    return f"**Uploaded File:** {item['file']}" + (f" — {status}" if status else "")
+
+
+@st.fragment(run_every=UPLOAD_REFRESH_SECONDS)
+def checking_upload(item):
+    st.markdown(upload_line(item))
+
+
+def uploaded_file(item):
+    if item.get("upload", {}).get("status") == "checking":
+        checking_upload(item)
+    else:
+        st.markdown(upload_line(item))
+
+
+# -----------------------------
+# Bundle Download Link
+# -----------------------------
+def bundle_download(bundles, path):
+    bundle_mb = os.path.getsize(path) / 1e6
+    url = bundles.url(path)
+    if url:
+        st.link_button(f"⬇️ Download all submissions ({bundle_mb:.1f} MB)", url)
+    else:
+        st.warning(f"The ZIP of all submissions is {bundle_mb:,.0f} MB, too big for Streamlit to serve. "
+                   "Run the bundle server and set FUSIONX_BUNDLE_URL to download it.")
+
+
+# -----------------------------
+# Account Picker
+# -----------------------------
+# A search box plus a selectbox of at most PICKER_LIMIT matches, instead of a
+# selectbox of every account: the options sent to the browser and the work
+# per rerun stay the same however many accounts there are. The prefix index
+# is built once per session. A new account is inserted into it in place
+# (account_added); it is only rebuilt after accounts_changed(), which an
+# account rename calls.
+PICKER_LIMIT = 20
+
+
+def accounts_changed():
+    st.session_state['accounts_version'] = st.session_state.get('accounts_version', 0) + 1
+
+
+def account_added(accounts, email):
+    # Indexes one new account without rebuilding; the next build includes it anyway
+    cached = st.session_state.get('account_index')
+    if cached is not None and cached[0] == (id(accounts), st.session_state.get('accounts_version', 0)):
+        cached[1].add(email, [email, accounts[email]['name']])
+
+
+def account_index(accounts):
+    version = (id(accounts), st.session_state.get('accounts_version', 0))
+    cached = st.session_state.get('account_index')
+    if cached is None or cached[0] != version:
+        cached = (version, PrefixIndex((email, [email, account['name']]) for email, account in accounts.items()))
+        st.session_state['account_index'] = cached
+    return cached[1]
+
+
+def account_picker(label, key, accounts, extra=None, limit=PICKER_LIMIT):
+    # Email of the picked account (or a value from extra: {label: value}); None without accounts or a match
+    query = st.text_input(f"Search accounts by name or email ({len(accounts):,})", key=f"{key}_search")
+    if query:
+        emails = account_index(accounts).search(query, limit)
+        if not emails:
+            st.caption(f"No account matches '{query}'.")
+    else:
+        emails = list(itertools.islice(accounts, limit))
+    options = dict(extra or {})
+    options.update({f"{accounts[email]['name']} ({email})": email for email in emails})
+    if not options:
+        return None
+    return options[st.selectbox(label, list(options), key=key)]
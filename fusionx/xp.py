@@ -0,0 +1,149 @@
+# fusionx/xp.py
+# Append-only XP ledger with daily buckets and prefix sums.
+#
+# XP is earned from events (a yes vote on your portfolio or project, a
+# submission, a competition join; points as in rollups.XP_POINTS), so it is
+# recorded exactly once when the event happens instead of being re-added on
+# every rerun. Ledger entries go to a log in the shared store and are replayed
+# into each process's matrix, like trending signals and mentor scores.
+#
+# The matrix holds one row per student and one column per day since EPOCH,
+# each cell being that student's cumulative XP up to and including the day.
+# XP earned in any window [start, end] is then cum[end] - cum[start - 1]: O(1)
+# per student, and one vectorized subtraction over all rows for a windowed
+# leaderboard, whose top k comes from an O(n) partition plus an O(k log k)
+# sort. (A heap cannot be kept per window, since any window can be asked for,
+# and a vectorized partition over all students is faster than pushing them
+# through a Python heap.)
+#
+# A large replay only touches the rows of the students in it: their daily XP
+# is summed into a small block of REPLAY_ROWS rows at a time, turned into
+# prefix sums and added to those rows, so memory beyond the matrix itself
+# stays bounded however many students there are.
+import datetime
+import threading
+
+import numpy as np
+
+from fusionx import events as ev
+from fusionx.rollups import XP_POINTS
+
+EPOCH = datetime.date(2025, 1, 1)
+XP_EVENTS = [ev.VOTE, ev.SUBMISSION, ev.JOIN]
+BATCH_REPLAY = 64  # replays larger than this add prefix sums block by block
+REPLAY_ROWS = 4096  # rows per block: 4096 x 1024 days of int32 is 16 MB
+
+
+def xp_for(event):
+    # Points earned by event["email"] for one event, or 0
+    if not event.get("email") or event["type"] not in XP_POINTS:
+        return 0
+    if event["type"] == ev.VOTE and event.get("choice", "yes") != "yes":
+        return 0
+    return XP_POINTS[event["type"]]
+
+
+def day_index(day):
+    return max(0, (day - EPOCH).days)
+
+
+class XPLedger:
+    def __init__(self, store, students=256, days=512):
+        self.store = store
+        self.cum = np.zeros((students, days), dtype=np.int32)  # cumulative XP per student per day
+        self.students = []  # row -> email
+        self._rows = {}  # email -> row
+        self._offset = 0  # ledger entries already replayed
+        self._lock = threading.Lock()
+
+    # --- Event subscriber ---
+    def handle(self, event):
+        points = xp_for(event)
+        if points:
+            self.store.add_xp_entry({
+                "email": event["email"],
+                "points": points,
+                "day": event["timestamp"][:10],
+                "reason": event["type"]
+            })
+
+    # --- Replay ---
+    def _grow(self, students, days):
+        rows, cols = self.cum.shape
+        if students <= rows and days <= cols:
+            return
+        while rows < students:
+            rows *= 2
+        while cols < days:
+            cols *= 2
+        grown = np.zeros((rows, cols), dtype=np.int32)
+        grown[:self.cum.shape[0], :self.cum.shape[1]] = self.cum
+        grown[:self.cum.shape[0], self.cum.shape[1]:] = self.cum[:, -1:]  # totals carry forward
+        self.cum = grown
+
+    def _row(self, email):
+        row = self._rows.get(email)
+        if row is None:
+            row = self._rows[email] = len(self.students)
+            self.students.append(email)
+        return row
+
+    def _sync(self):
+        records = self.store.xp_entries(start=self._offset)
+        if not records:
+            return
+        rows = np.array([self._row(r["email"]) for r in records])
+        days = np.array([day_index(datetime.date.fromisoformat(r["day"])) for r in records])
+        points = np.array([r["points"] for r in records], dtype=np.int32)
+        self._grow(len(self.students), int(days.max()) + 1)
+        if len(records) > BATCH_REPLAY:
+            self._add_blocks(rows, days, points)
+        else:
+            for row, day, p in zip(rows, days, points):
+                self.cum[row, day:] += p
+        self._offset += len(records)
+
+    def _add_blocks(self, rows, days, points):
+        touched, block_rows = np.unique(rows, return_inverse=True)
+        order = np.argsort(block_rows, kind="stable")
+        block_rows, days, points = block_rows[order], days[order], points[order]
+        for first in range(0, len(touched), REPLAY_ROWS):
+            lo, hi = np.searchsorted(block_rows, [first, first + REPLAY_ROWS])
+            daily = np.zeros((min(REPLAY_ROWS, len(touched) - first), self.cum.shape[1]), dtype=np.int32)
+            np.add.at(daily, (block_rows[lo:hi] - first, days[lo:hi]), points[lo:hi])
+            np.cumsum(daily, axis=1, out=daily)
+            self.cum[touched[first:first + REPLAY_ROWS]] += daily
+
+    # --- Reading ---
+    def _window(self, start, end):
+        # Column range for dates start..end (inclusive; None = open), or None if empty
+        first = day_index(start) if start else 0
+        last = min(day_index(end) if end else self.cum.shape[1] - 1, self.cum.shape[1] - 1)
+        if end and end < EPOCH or first > last:
+            return None
+        return first, last
+
+    def total(self, email, start=None, end=None):
+        with self._lock:
+            self._sync()
+            row = self._rows.get(email)
+            window = self._window(start, end)
+            if row is None or window is None:
+                return 0
+            first, last = window
+            return int(self.cum[row, last] - (self.cum[row, first - 1] if first else 0))
+
+    def leaderboard(self, start=None, end=None, k=10):
+        # [(email, xp)] with the most XP earned between start and end
+        with self._lock:
+            self._sync()
+            window = self._window(start, end)
+            n = len(self.students)
+            if window is None or not n:
+                return []
+            first, last = window
+            earned = self.cum[:n, last] - (self.cum[:n, first - 1] if first else 0)
+            k = min(k, n)
+            top = np.argpartition(-earned, k - 1)[:k]
+            top = top[np.argsort(-earned[top], kind="stable")]
+            return [(self.students[i], int(earned[i])) for i in top if earned[i] > 0]
@@ -0,0 +1,30 @@
+# tests/conftest.py
+# Shared fixtures. Tests import the app's modules from the repository root,
+# like the scripts in benchmarks/.
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def redis_url():
+    # A fakeredis server on a TCP port, so several processes can share it like a real Redis
+    fakeredis = pytest.importorskip("fakeredis")
+    port = free_port()
+    server = fakeredis.TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, name="fusionx-test-redis", daemon=True).start()
+    yield f"redis://127.0.0.1:{port}/0"
+    server.shutdown()
+    server.server_close()
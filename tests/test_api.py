@@ -0,0 +1,65 @@
+# tests/test_api.py
+import asyncio
+import json
+import threading
+
+from fusionx.api import ApiApp
+from fusionx.site import SiteExporter, portfolio_slug
+from fusionx.state import MemoryBackend, SharedStore
+
+
+def get(app, path, query=b""):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_winners_week_is_validated(tmp_path):
+    store = SharedStore(MemoryBackend())
+    store.add_rollup_record("2026-W42", "closed", {"competition": "Robotics Cup", "results": []})
+    app = ApiApp(store, site_dir=str(tmp_path))
+    status, body = get(app, "/api/winners", b"week=2026-W42")
+    assert status == 200 and body["items"][0]["competition"] == "Robotics Cup"
+    assert get(app, "/api/winners", b"week=2026-W99")[0] == 404
+    assert get(app, "/api/winners", b"week=2026-W00")[0] == 404
+    assert get(app, "/api/winners", b"week=2026-W53")[0] == 200  # 2026 has 53 ISO weeks
+    assert get(app, "/api/winners", b"week=2025-W53")[0] == 404
+    assert get(app, "/api/winners", b"week=latest")[0] == 400
+
+
+def test_store_reads_run_off_the_event_loop(tmp_path):
+    store = SharedStore(MemoryBackend())
+    loop_thread = threading.get_ident()
+    read_threads = []
+    version = store.version
+
+    def tracked(resource):
+        read_threads.append(threading.get_ident())
+        return version(resource)
+
+    store.version = tracked
+    app = ApiApp(store, site_dir=str(tmp_path))
+    assert get(app, "/api/competitions")[0] == 200
+    assert read_threads and loop_thread not in read_threads
+
+
+def test_students_appear_by_slug_not_email(tmp_path):
+    ann = "ann@school.edu"
+    store = SharedStore(MemoryBackend())
+    store.cast_portfolio_vote("bob", ann, "yes", limit=5, reset_days=7)
+    store.add_rollup_record("2026-W42", "closed", {"competition": "Robotics Cup", "results": [
+        {"rank": 1, "email": ann, "name": "Ann", "title": "Rover", "score": 9.5}]})
+    SiteExporter(str(tmp_path)).export({"portfolios": {}, "names": {ann: "Ann"}, "top3": [(ann, 1)],
+                                        "trending": [], "xp_week": [], "winners": {}})
+    app = ApiApp(store, site_dir=str(tmp_path))
+    status, body = get(app, "/api/leaderboards/votes")
+    assert status == 200 and body["items"] == [{"student": portfolio_slug(ann), "name": "Ann", "votes": 1}]
+    status, body = get(app, "/api/winners", b"week=2026-W42")
+    assert body["items"][0]["results"] == [{"rank": 1, "name": "Ann", "title": "Rover", "score": 9.5}]
@@ -0,0 +1,63 @@
+# tests/test_archive.py
+import sys
+
+from fusionx.archive import CompetitionArchive
+from fusionx.state import MemoryBackend, SharedStore
+
+TITLE = "Robotics Cup"
+WINNERS = [{"rank": 1, "email": "ann@school.edu", "name": "Ann", "title": "Rover", "score": 9.5}]
+
+
+def closed_competition():
+    store = SharedStore(MemoryBackend())
+    store.add_competition({"title": TITLE, "description": "Build a rover", "field": "Robotics", "threshold": 2})
+    store.join(TITLE, "Ann")
+    store.join(TITLE, "Bob")
+    store.close_competition(TITLE)
+    store.finalize_competition(TITLE, WINNERS)
+    return store
+
+
+def submission(sid, name):
+    return {"id": sid, "title": f"{name}'s rover", "submitter": name, "submitter_email": f"{name.lower()}@school.edu",
+            "description": "", "file": f"{name}.zip", "file_size": 100, "file_ref": f"ref-{sid}",
+            "timestamp": "2026-10-01T12:00:00"}
+
+
+def test_archiving_moves_a_competition_out_of_the_hot_structures(tmp_path):
+    store = closed_competition()
+    archive = CompetitionArchive(store, str(tmp_path))
+    assert archive.archive(TITLE)
+    assert TITLE not in [c["title"] for c in store.list_competitions()]
+    assert store.participants([TITLE])[TITLE] == []
+    assert TITLE not in store.closed_times() and TITLE not in store.competition_results()
+    assert store.membership_log()[-1] == {"index": "competitions", "key": TITLE, "member": None, "op": "clear"}
+    assert archive.titles() == [TITLE] and archive.results() == {TITLE: WINNERS}
+    assert not store.add_competition({"title": TITLE.lower()})  # the title stays reserved
+    assert not archive.archive(TITLE)  # already archived
+    assert archive.stats()["archived"] == 1
+
+
+def test_segments_from_two_sessions_merge_by_submission_id(tmp_path):
+    store = closed_competition()
+    first = CompetitionArchive(store, str(tmp_path))
+    second = CompetitionArchive(store, str(tmp_path))
+    assert first.archive(TITLE) and not second.archive(TITLE)
+    first.write_segment(TITLE, [submission("s1", "Ann")])
+    second.write_segment(TITLE, [submission("s1", "Ann"), submission("s2", "Bob")])
+    assert len(store.archive_segments(TITLE)) == 2
+    loaded = CompetitionArchive(store, str(tmp_path)).load(TITLE)
+    assert sorted(s["id"] for s in loaded["submissions"]) == ["s1", "s2"]
+    assert loaded["participants"] == ["Ann", "Bob"] and loaded["results"] == WINNERS
+    assert loaded["submissions"][0]["submitter_email"] == "ann@school.edu"
+
+
+def test_jsonl_segments_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # import pyarrow raises ImportError
+    store = closed_competition()
+    archive = CompetitionArchive(store, str(tmp_path))
+    assert archive.fmt == "jsonl"
+    archive.archive(TITLE)
+    assert archive.write_segment(TITLE, [submission("s1", "Ann")]).endswith(".jsonl.gz")
+    assert [s["id"] for s in archive.load(TITLE)["submissions"]] == ["s1"]
+    assert archive.load(TITLE) is archive.load(TITLE)  # kept in memory until segments change
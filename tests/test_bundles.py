@@ -0,0 +1,80 @@
+# tests/test_bundles.py
+import asyncio
+import io
+import os
+import time
+import zipfile
+
+from fusionx.blobs import BlobStore
+from fusionx.bundles import BundleExporter, BundleServer, parse_range
+
+
+def submissions(blobs, *names):
+    return [{"title": n, "submitter": n, "description": "", "file": f"{n}.txt",
+             "file_ref": blobs.put(io.BytesIO(n.encode() * 1000)), "file_size": 1000 * len(n)} for n in names]
+
+
+def test_sessions_with_different_submissions_keep_their_bundles(tmp_path):
+    blobs = BlobStore(str(tmp_path / "blobs"))
+    bundles = BundleExporter(blobs, str(tmp_path / "bundles"))
+    first = bundles.bundle("Robotics Cup", submissions(blobs, "ann"))
+    second = bundles.bundle("Robotics Cup", submissions(blobs, "ann", "bob"))
+    assert first != second and os.path.exists(first) and os.path.exists(second)
+    assert bundles.bundle("Robotics Cup", submissions(blobs, "ann")) == first  # same submissions, same bundle
+
+
+def test_unused_bundles_expire(tmp_path):
+    blobs = BlobStore(str(tmp_path / "blobs"))
+    bundles = BundleExporter(blobs, str(tmp_path / "bundles"), max_age=3600)
+    old = bundles.bundle("Robotics Cup", submissions(blobs, "ann"))
+    kept = bundles.bundle("Robotics Cup", submissions(blobs, "bob"))
+    os.utime(old, (time.time() - 7200,) * 2)
+    os.utime(kept, (time.time() - 7200,) * 2)
+    assert bundles.cached("Robotics Cup", submissions(blobs, "bob")) == kept  # a reused bundle is touched
+    assert bundles.expire(now=time.time() + 600) == 1
+    assert not os.path.exists(old) and os.path.exists(kept)
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=100-", 100) == "unsatisfiable"
+    assert parse_range("bytes=0-1,5-6", 100) is None
+
+
+def request(app, path, headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [(n.encode(), v.encode()) for n, v in headers]}
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    return start["status"], {n.decode(): v.decode() for n, v in start["headers"]}, b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_bundle_server_streams_ranges(tmp_path):
+    blobs = BlobStore(str(tmp_path / "blobs"))
+    bundles = BundleExporter(blobs, str(tmp_path / "bundles"), base_url="https://files.example")
+    path = bundles.bundle("Robotics Cup", submissions(blobs, "ann", "bob"))
+    name = os.path.basename(path)
+    assert bundles.url(path) == f"https://files.example/bundles/{name}"
+    data = open(path, "rb").read()
+    server = BundleServer(str(tmp_path / "bundles"))
+
+    status, headers, body = request(server, f"/bundles/{name}")
+    assert status == 200 and body == data and headers["content-length"] == str(len(data))
+    assert zipfile.ZipFile(io.BytesIO(body)).read("files/0001-ann-ann.txt") == b"ann" * 1000
+
+    status, headers, body = request(server, f"/bundles/{name}", [("range", "bytes=10-")])
+    assert status == 206 and body == data[10:] and headers["content-range"] == f"bytes 10-{len(data) - 1}/{len(data)}"
+    assert request(server, f"/bundles/{name}", [("range", f"bytes={len(data)}-")])[0] == 416
+    assert request(server, "/bundles/../blobs")[0] == 404
+    assert request(server, "/bundles/missing-0123456789abcdef.zip")[0] == 404
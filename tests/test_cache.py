@@ -0,0 +1,75 @@
+# tests/test_cache.py
+import os
+
+from fusionx.cache import SHARED, ByteBudgetCache
+
+KB = 1024
+
+
+def spill_files(cache):
+    return os.listdir(cache.spill_dir)
+
+
+def test_put_again_replaces_a_spilled_value(tmp_path):
+    cache = ByteBudgetCache(spill_dir=str(tmp_path), spill_threshold=KB)
+    cache.put(SHARED, "avatar", b"a" * (2 * KB))
+    cache.put(SHARED, "avatar", b"b" * (3 * KB))
+    assert cache.get(SHARED, "avatar") == b"b" * (3 * KB)
+    assert len(spill_files(cache)) == 1
+    stats = cache.stats()
+    assert (stats["entries"], stats["disk_bytes"], stats["memory_bytes"], stats["spills"]) == (1, 3 * KB, 0, 2)
+
+    cache.put(SHARED, "avatar", b"small")  # back in memory; the spill file goes
+    assert cache.get(SHARED, "avatar") == b"small"
+    assert spill_files(cache) == [] and cache.stats()["disk_bytes"] == 0
+
+
+def test_put_again_replaces_an_in_memory_value():
+    cache = ByteBudgetCache()
+    cache.put("s1", "pdf", b"old")
+    cache.put("s1", "pdf", b"newer")
+    assert cache.get("s1", "pdf") == b"newer"
+    stats = cache.stats()
+    assert (stats["entries"], stats["memory_bytes"], stats["evictions"]) == (1, 5, 0)
+
+
+def test_session_budget_evicts_only_that_sessions_oldest_entries():
+    cache = ByteBudgetCache(budget_bytes=100 * KB, session_budget_bytes=3 * KB)
+    cache.put("other", "x", b"o" * KB)
+    for key in ("a", "b", "c"):
+        cache.put("s1", key, b"v" * KB)
+    cache.get("s1", "a")  # most recently used now
+    cache.put("s1", "d", b"v" * KB)
+    assert cache.get("s1", "b") is None
+    assert all(cache.get("s1", key) for key in ("a", "c", "d"))
+    assert cache.get("other", "x")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_global_budget_evicts_least_recently_used_across_sessions(tmp_path):
+    cache = ByteBudgetCache(budget_bytes=3 * KB, session_budget_bytes=10 * KB)
+    for session in ("s1", "s2", "s3"):
+        cache.put(session, "pdf", b"v" * KB)
+    cache.get("s1", "pdf")
+    cache.put("s4", "pdf", b"v" * KB)
+    assert cache.get("s2", "pdf") is None
+    assert cache.get("s1", "pdf") and cache.get("s3", "pdf") and cache.get("s4", "pdf")
+
+    disk = ByteBudgetCache(spill_dir=str(tmp_path), spill_threshold=KB, disk_budget_bytes=4 * KB)
+    disk.put("s1", "a", b"v" * (2 * KB))
+    disk.put("s2", "b", b"v" * (2 * KB))
+    disk.put("s3", "c", b"v" * (2 * KB))
+    assert disk.get("s1", "a") is None and len(spill_files(disk)) == 2
+
+
+def test_counters():
+    cache = ByteBudgetCache(budget_bytes=2 * KB, session_budget_bytes=KB)
+    assert cache.get("s1", "missing") is None
+    assert cache.put("s1", "a", b"v" * KB)
+    assert cache.get("s1", "a")
+    assert not cache.put("s1", "big", b"v" * (2 * KB))  # over the session budget on its own
+    cache.put("s1", "b", b"v" * KB)  # pushes "a" out
+    assert cache.get_or_create("s1", "c", lambda: b"built") == b"built"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["rejected"]) == (1, 2, 2, 1)
+    assert stats["hit_rate"] == 1 / 3 and stats["sessions"] == 1
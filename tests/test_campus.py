@@ -0,0 +1,59 @@
+# tests/test_campus.py
+# A global competition closes on the global partition's scheduler and bus;
+# each campus's webhooks, CDC export and newsletter rollups must hear it.
+import os
+
+from fusionx import events as ev
+from fusionx.campus import GLOBAL_CAMPUS, CampusRouter, integration_buses
+from fusionx.cdc import CDCExporter, read_events
+from fusionx.lifecycle import CompetitionScheduler
+from fusionx.rollups import ROLLUP_EVENTS, WeeklyRollups
+from fusionx.scoring import RUBRIC, MentorScoring
+from fusionx.webhooks import WEBHOOK_EVENTS, WebhookDispatcher
+
+
+def test_global_winner_reaches_campus_integrations(tmp_path):
+    router = CampusRouter()
+    buses = {}
+
+    def event_bus(campus):
+        return buses.setdefault(campus, ev.EventBus())
+
+    posted = []
+
+    async def sender(url, payload, timeout):
+        posted.extend(payload["events"])
+        return 200, {}
+
+    rollups = WeeklyRollups(router.store("north"))
+    webhooks = WebhookDispatcher(lambda: [{"url": "http://north", "kind": "generic"}],
+                                 dead_letter_path=str(tmp_path / "dead.jsonl"), batch_interval=0.01, sender=sender)
+    cdc = CDCExporter(str(tmp_path / "cdc"), poll_interval=0.05)
+    webhooks.start()
+    cdc.start()
+    for bus in integration_buses(event_bus, "north"):
+        bus.subscribe(webhooks.submit, types=WEBHOOK_EVENTS)
+        bus.subscribe(rollups.handle, types=ROLLUP_EVENTS)
+        bus.subscribe(cdc.submit)
+
+    global_store = router.store(GLOBAL_CAMPUS)
+    comp = {"title": "World Hack", "threshold": 1, "field": "AI"}
+    global_store.add_competition(comp)
+    scoring = MentorScoring(global_store)
+    scoring.submit("World Hack", {"id": "s1", "title": "Robot", "submitter_name": "Ann", "submitter_email": "ann@north.edu"},
+                   "mentor@north.edu", dict.fromkeys(RUBRIC, 9))
+    try:
+        results = CompetitionScheduler(global_store, scoring, event_bus(GLOBAL_CAMPUS)).close(comp)
+        assert results[0]["email"] == "ann@north.edu"
+        assert webhooks.wait_idle(timeout=5)
+    finally:
+        webhooks.stop()
+        cdc.stop()
+
+    assert [(e["type"], e["email"]) for e in posted] == [(ev.WINNER, "ann@north.edu")]
+    closed = rollups.week()["closed"]
+    assert closed[0]["competition"] == "World Hack" and closed[0]["results"] == results
+    exported = [e for name in cdc.segments() for e in read_events(os.path.join(tmp_path, "cdc", name))]
+    assert {e["type"] for e in exported} == {ev.WINNER, ev.COMPETITION_CLOSED}
+    # Integrations of the global partition itself follow only its own bus
+    assert integration_buses(event_bus, GLOBAL_CAMPUS) == [event_bus(GLOBAL_CAMPUS)]
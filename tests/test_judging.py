@@ -0,0 +1,95 @@
+# tests/test_judging.py
+# Several processes assign judges to the same submissions at once; replaying
+# the log must give every process the same assignment, with no submission
+# over its reviews and no judge over capacity.
+import multiprocessing
+
+from fusionx.judging import JudgePool, ReviewAssigner
+from fusionx.state import MemoryBackend, SharedStore, backend_from_url
+
+WORKERS = 4
+SUBMISSIONS = 40
+JUDGES = 8
+CAPACITY = 16  # 8 judges x 16 = 128 reviews for 40 x 3 = 120
+
+
+def pool_for(store):
+    return JudgePool(store, reviews=3)
+
+
+def check(pool):
+    loads = {row["judge"]: row["assigned"] for row in pool.loads()}
+    counts = dict.fromkeys(loads, 0)
+    for i in range(SUBMISSIONS):
+        judges = pool.judges_of("Robotics Cup", f"s{i}")
+        assert len(judges) == len(set(judges)) == 3
+        for judge in judges:
+            counts[judge] += 1
+    assert counts == loads
+    assert max(loads.values()) <= CAPACITY
+
+
+def test_replay_ignores_assigns_past_reviews_or_capacity():
+    assigner = ReviewAssigner(reviews=2)
+    for name in ("ann", "bob", "cy"):
+        assigner.apply({"op": "judge", "profile": {"name": name, "capacity": 1}})
+    for sid in ("s0", "s1"):
+        assigner.apply({"op": "submission", "competition": "Cup", "submission": sid, "info": {}})
+    for sid, judge in [("s0", "ann"), ("s0", "bob"), ("s0", "cy"), ("s1", "ann"), ("s1", "cy")]:
+        assigner.apply({"op": "assign", "competition": "Cup", "submission": sid, "judge": judge})
+    assert assigner.judges_of(("Cup", "s0")) == ["ann", "bob"]
+    assert assigner.judges_of(("Cup", "s1")) == ["cy"]
+    assert [row["assigned"] for row in assigner.loads()] == [1, 1, 1]
+
+
+class RacingStore:
+    # b's view of the store: just before b's first assign lands, `race` runs in another pool
+    def __init__(self, store, race):
+        self.store = store
+        self.race = race
+
+    def judge_records(self, start=0):
+        return self.store.judge_records(start)
+
+    def add_judge_record(self, record):
+        if record["op"] == "assign" and self.race:
+            self.race, race = None, self.race
+            race()
+        return self.store.add_judge_record(record)
+
+
+def test_losing_a_race_fills_from_the_replayed_state():
+    store = SharedStore(MemoryBackend())
+    a = pool_for(store)
+    for j in range(6):
+        a.set_judge(f"judge{j}", capacity=1)
+    b = pool_for(RacingStore(store, lambda: a.assign("Robotics Cup", "s0")))
+    added = b.assign("Robotics Cup", "s1")
+    assert added == ["judge3", "judge4", "judge5"]
+    for pool in (a, b, pool_for(store)):
+        assert pool.judges_of("Robotics Cup", "s0") == ["judge0", "judge1", "judge2"]
+        assert pool.judges_of("Robotics Cup", "s1") == added
+        assert all(row["assigned"] == 1 for row in pool.loads())
+
+
+def assign_all(url, worker_id):
+    pool = pool_for(SharedStore(backend_from_url(url), namespace="test"))
+    order = range(SUBMISSIONS) if worker_id % 2 else reversed(range(SUBMISSIONS))
+    for i in order:
+        pool.assign("Robotics Cup", f"s{i}", title=f"Project {i}", submitter=f"student{i}", field="Robotics")
+
+
+def test_concurrent_processes_agree_on_assignments(redis_url):
+    store = SharedStore(backend_from_url(redis_url), namespace="test")
+    pool = pool_for(store)
+    for j in range(JUDGES):
+        pool.set_judge(f"judge{j}", fields=["Robotics"], capacity=CAPACITY)
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=assign_all, args=(redis_url, w)) for w in range(WORKERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(120)
+    assert [p.exitcode for p in procs] == [0] * WORKERS
+    check(pool)
+    check(pool_for(SharedStore(backend_from_url(redis_url), namespace="test")))
@@ -0,0 +1,38 @@
+# tests/test_notifications.py
+from fusionx import events as ev
+from fusionx.notifications import NOTIFY_EVENTS, Notifier
+from fusionx.state import MemoryBackend, SharedStore
+
+
+def messages(store, email):
+    return [n.split(" - ", 1)[1] for n in store.notifications(email)]
+
+
+def test_events_notify_once_when_they_happen():
+    store = SharedStore(MemoryBackend())
+    bus = ev.EventBus()
+    bus.subscribe(Notifier(store).handle, types=NOTIFY_EVENTS)
+
+    store.cast_portfolio_vote("bob", "ann@x.edu", "yes", 5, 30)
+    bus.publish(ev.VOTE, email="ann@x.edu", choice="yes", voter="bob")
+    store.cast_portfolio_vote("cy", "ann@x.edu", "no", 5, 30)
+    bus.publish(ev.VOTE, email="ann@x.edu", choice="no", voter="cy")
+    for _ in range(2):  # e.g. two processes handling the same join
+        bus.publish(ev.JOIN, competition="Math Cup", user="ann@x.edu", email="ann@x.edu")
+    bus.publish(ev.SUBMISSION, competition="Math Cup", title="Proof", email="ann@x.edu", submission_id="s1")
+    bus.publish(ev.SUBMISSION, competition="Math Cup", title="Guest work", submitter="Guest", submission_id="s2")
+
+    assert messages(store, "ann@x.edu") == [
+        "Your portfolio has 1 votes.",
+        "You joined the competition 'Math Cup'.",
+        "You submitted 'Proof' to 'Math Cup'."
+    ]
+
+
+def test_project_votes_count_the_portfolio_total():
+    store = SharedStore(MemoryBackend())
+    notifier = Notifier(store)
+    store.vote_project("ann@x.edu", "Robot")
+    store.vote_project("ann@x.edu", "Poem")
+    notifier.handle({"type": ev.VOTE, "email": "ann@x.edu", "project": "Poem", "choice": "yes"})
+    assert messages(store, "ann@x.edu") == ["Your portfolio has 2 votes."]
@@ -0,0 +1,15 @@
+# tests/test_search.py
+from fusionx.search import PrefixIndex
+
+ACCOUNTS = {"ann.smith@fusion.edu": "Ann Smith", "bob@fusion.edu": "Bob Jones", "sam@fusion.edu": "Sam Smithers"}
+
+
+def test_added_accounts_are_found_like_rebuilt_ones():
+    built = PrefixIndex((email, [email, name]) for email, name in ACCOUNTS.items())
+    added = PrefixIndex()
+    for email, name in ACCOUNTS.items():
+        added.add(email, [email, name])
+    assert len(added) == len(built)
+    for query in ["", "smi", "Ann", "jones", "fusion", "zzz"]:
+        assert added.search(query) == built.search(query), query
+    assert built.search("smi", limit=1) == ["ann.smith@fusion.edu"]
@@ -0,0 +1,40 @@
+# tests/test_site.py
+import json
+import os
+
+from fusionx.site import SiteExporter, portfolio_slug
+
+ANN = "ann@school.edu"
+BOB = "bob@school.edu"
+
+
+def snapshot():
+    return {
+        "portfolios": {ANN: {"name": "Ann", "fields": ["Robotics"], "badges": [], "xp": 30, "projects": []}},
+        "names": {ANN: "Ann", BOB: "Bob"},
+        "top3": [(ANN, 4), (BOB, 2)],
+        "trending": [(BOB, 3.5)],
+        "xp_week": [(ANN, 30), (BOB, 10)],
+        "winners": {"Robotics Cup": [{"rank": 1, "email": ANN, "name": "Ann", "title": "Rover", "score": 9.5}]}
+    }
+
+
+def test_public_pages_leave_out_emails(tmp_path):
+    SiteExporter(str(tmp_path)).export(snapshot())
+    for name in os.listdir(tmp_path):
+        with open(os.path.join(tmp_path, name), encoding="utf-8") as f:
+            content = f.read()
+        assert "@school.edu" not in content, name
+
+
+def test_leaderboards_are_keyed_by_portfolio_slug(tmp_path):
+    SiteExporter(str(tmp_path)).export(snapshot())
+    with open(tmp_path / "leaderboards.json", encoding="utf-8") as f:
+        boards = json.load(f)
+    assert boards["top3"] == [[portfolio_slug(ANN), 4], [portfolio_slug(BOB), 2]]
+    assert boards["names"] == {portfolio_slug(ANN): "Ann", portfolio_slug(BOB): "Bob"}
+    html = (tmp_path / "leaderboards.html").read_text(encoding="utf-8")
+    assert f"<a href='{portfolio_slug(ANN)}.html'>Ann</a>" in html
+    assert f"{portfolio_slug(BOB)}.html" not in html  # Bob has no published portfolio
+    with open(tmp_path / "winners.json", encoding="utf-8") as f:
+        assert json.load(f)["winners"]["Robotics Cup"] == [{"rank": 1, "name": "Ann", "title": "Rover", "score": 9.5}]
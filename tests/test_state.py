@@ -0,0 +1,92 @@
+# tests/test_state.py
+# State written by one server process is seen by every other process sharing
+# the backend.
+import datetime
+import multiprocessing
+
+from fusionx.state import MemoryBackend, SharedStore, backend_from_url
+
+WORKERS = 4
+ROUNDS = 25
+
+
+def store_for(url):
+    return SharedStore(backend_from_url(url), namespace="test")
+
+
+def page_views(url, worker_id):
+    store = store_for(url)
+    for i in range(ROUNDS):
+        store.join("Robotics Cup", f"w{worker_id}-{i}@fusion.edu")
+        assert store.cast_portfolio_vote(f"voter-{worker_id}-{i}", "Ann", "yes", 5, 30)
+        store.post_chat("AI", f"worker-{worker_id}", f"message {i}")
+        store.notify("ann@fusion.edu", f"vote from worker {worker_id}")
+
+
+def run(target, *args_list):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=target, args=args) for args in args_list]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0] * len(procs)
+
+
+def test_writes_from_all_processes_are_shared(redis_url):
+    store_for(redis_url).add_competition({"title": "Robotics Cup", "description": "", "threshold": 5, "field": "Robotics"})
+    run(page_views, *[(redis_url, w) for w in range(WORKERS)])
+
+    store = store_for(redis_url)  # a fresh process-local view, like another app process
+    assert [c["title"] for c in store.list_competitions()] == ["Robotics Cup"]
+    assert len(set(store.participants(["Robotics Cup"])["Robotics Cup"])) == WORKERS * ROUNDS
+    assert store.portfolio_votes()["Ann"] == {"yes": WORKERS * ROUNDS, "no": 0}
+    assert store.chat_length("AI") == WORKERS * ROUNDS
+    assert len(store.notifications("ann@fusion.edu", last=1000)) == WORKERS * ROUNDS
+
+
+def join_twice(url, user):
+    store = store_for(url)
+    store.join("Robotics Cup", user)
+    store.join("Robotics Cup", user)
+
+
+def test_concurrent_joins_count_each_user_once(redis_url):
+    store_for(redis_url).add_competition({"title": "Robotics Cup", "description": "", "threshold": 5, "field": "Robotics"})
+    run(join_twice, *[(redis_url, "ann@fusion.edu")] * WORKERS)
+    assert store_for(redis_url).participants(["Robotics Cup"])["Robotics Cup"] == ["ann@fusion.edu"]
+
+
+def cast_votes(url, today):
+    store = store_for(url)
+    for _ in range(5):
+        store.cast_portfolio_vote("shared-voter", "Ann", "yes", 5, 30, today=datetime.date.fromisoformat(today))
+
+
+def test_vote_quota_holds_across_processes(redis_url):
+    # Every process races on the voter's very first vote
+    run(cast_votes, *[(redis_url, "2026-10-01")] * WORKERS)
+    store = store_for(redis_url)
+    assert store.portfolio_votes()["Ann"]["yes"] == 5
+    assert not store.cast_portfolio_vote("shared-voter", "Ann", "yes", 5, 30, today=datetime.date(2026, 10, 1))
+
+
+def test_vote_quota_resets_once_across_processes(redis_url):
+    store = store_for(redis_url)
+    for _ in range(5):
+        store.cast_portfolio_vote("shared-voter", "Ann", "yes", 5, 30, today=datetime.date(2026, 10, 1))
+    # Every process races on the first vote after the reset
+    run(cast_votes, *[(redis_url, "2026-11-02")] * WORKERS)
+    assert store.portfolio_votes()["Ann"]["yes"] == 10
+    assert store.votes_left("shared-voter", 5, 30, today=datetime.date(2026, 11, 2)) == 0
+    assert store.votes_left("shared-voter", 5, 30, today=datetime.date(2026, 12, 2)) == 5
+
+
+def test_quota_rows_from_before_period_counters_keep_their_votes():
+    store = SharedStore(MemoryBackend())
+    store.backend.hset(store.key("voter", "old-voter"), "votes_left", 2)
+    store.backend.hset(store.key("voter", "old-voter"), "last_reset", "2026-10-01")
+    assert store.votes_left("old-voter", 5, 30, today=datetime.date(2026, 10, 10)) == 2
+    assert store.cast_portfolio_vote("old-voter", "Ann", "yes", 5, 30, today=datetime.date(2026, 10, 10))
+    assert store.votes_left("old-voter", 5, 30, today=datetime.date(2026, 10, 10)) == 1
+    assert store.votes_left("old-voter", 5, 30, today=datetime.date(2026, 10, 31)) == 5
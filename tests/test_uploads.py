@@ -0,0 +1,89 @@
+# tests/test_uploads.py
+import io
+import os
+import struct
+import zipfile
+
+import pytest
+
+from fusionx import uploads
+from fusionx.blobs import BlobStore
+from fusionx.uploads import Rejected, UploadInspector, zip_entry_count, zip_listing
+
+
+class Upload(io.BytesIO):
+    # Stand-in for Streamlit's UploadedFile
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+
+
+def zip_of(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for i in range(entries):
+            z.writestr(f"{i}", b"")
+    return buffer.getvalue()
+
+
+def stored(blobs):
+    return sorted(name for _, _, names in os.walk(blobs.root) for name in names)
+
+
+def check(inspector, name, data):
+    item = {}
+    future = inspector.attach(item, Upload(name, data))
+    if future:
+        future.result()
+    return item
+
+
+def test_rejected_files_are_not_kept(tmp_path):
+    blobs = BlobStore(str(tmp_path))
+    inspector = UploadInspector(blobs)
+    item = check(inspector, "avatar.png", b"#!/bin/sh\nrm -rf /\n")
+    assert item["upload"]["status"] == "rejected" and item["file_ref"] is None
+    assert stored(blobs) == []
+    assert check(inspector, "avatar.png", b"#!/bin/sh\nrm -rf /\n")["upload"]["status"] == "rejected"  # cached verdict
+    assert stored(blobs) == []
+
+    item = check(inspector, "avatar.png", png(64, 64))
+    assert item["upload"]["status"] == "ok" and blobs.exists(item["file_ref"])
+    assert len(stored(blobs)) == 1
+
+
+def test_verdict_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_VERDICTS", 2)
+    inspector = UploadInspector(BlobStore(str(tmp_path)))
+    for size in (10, 20, 30, 10):
+        check(inspector, "picture.png", png(size, size))
+    assert len(inspector._verdicts) == 2
+    assert inspector.stats()["checked"] == 4  # the first picture had been evicted
+
+
+def test_entry_count_is_checked_before_the_central_directory_is_read(monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_ZIP_ENTRIES", 10)
+    data = zip_of(11)
+
+    def no_listing(*args, **kwargs):
+        raise AssertionError("central directory read")
+
+    monkeypatch.setattr(zipfile, "ZipFile", no_listing)
+    with pytest.raises(Rejected, match="11 entries"):
+        zip_listing(io.BytesIO(data), len(data))
+
+
+def test_entry_count_from_the_end_records():
+    data = zip_of(3)
+    assert zip_entry_count(io.BytesIO(data), len(data)) == 3
+    commented = data[:-2] + struct.pack("<H", 5) + b"hello"  # archive comment after the record
+    assert zip_entry_count(io.BytesIO(commented), len(commented)) == 3
+    data = zip_of(0x10000)  # more than the record's 16 bits hold: counted from the ZIP64 record
+    assert zip_entry_count(io.BytesIO(data), len(data)) == 0x10000
+    with pytest.raises(Rejected, match="corrupt ZIP"):
+        zip_entry_count(io.BytesIO(data[:-30]), len(data) - 30)
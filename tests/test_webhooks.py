@@ -0,0 +1,71 @@
+# tests/test_webhooks.py
+import asyncio
+import time
+
+from fusionx import events as ev
+from fusionx.webhooks import WebhookDispatcher, tail_lines
+
+
+def submission(i):
+    return {"type": ev.SUBMISSION, "title": f"Project {i}", "competition": "Robotics Cup"}
+
+
+def test_retry_after_is_capped_by_backoff_max(tmp_path):
+    calls = []
+
+    async def rate_limited(url, payload, timeout):
+        calls.append(time.monotonic())
+        return (429, {"retry-after": "3600"}) if len(calls) == 1 else (200, {})
+
+    dispatcher = WebhookDispatcher(lambda: [{"url": "http://a", "kind": "generic"}], dead_letter_path=str(tmp_path / "dead.jsonl"),
+                                   batch_interval=0.01, backoff_max=0.2, sender=rate_limited)
+    dispatcher.start()
+    try:
+        dispatcher.submit(submission(1))
+        assert dispatcher.wait_idle(timeout=5)
+    finally:
+        dispatcher.stop()
+    assert dispatcher.stats()["sent"] == 1
+    assert calls[1] - calls[0] < 1
+
+
+def test_removed_endpoint_backlog_is_dead_lettered(tmp_path):
+    endpoints = [{"url": "http://slow", "kind": "generic"}]
+    release = asyncio.Event()
+
+    async def stuck(url, payload, timeout):
+        await release.wait()
+        return 200, {}
+
+    dead_letter_path = tmp_path / "dead.jsonl"
+    dispatcher = WebhookDispatcher(lambda: list(endpoints), dead_letter_path=str(dead_letter_path), batch_size=5,
+                                   batch_interval=0.01, refresh_interval=0, sender=stuck)
+    dispatcher.start()
+    try:
+        for i in range(20):
+            dispatcher.submit(submission(i))
+        time.sleep(0.2)
+        endpoints.clear()  # the endpoint is deleted while its sender is blocked
+        dispatcher.submit(submission(20))  # routing reloads the endpoint list
+        assert dispatcher.wait_idle(timeout=5)
+    finally:
+        dispatcher.stop()
+    records = dispatcher.dead_letters(last=100)
+    assert {r["reason"] for r in records} == {"endpoint_removed"}
+    assert sorted(e["title"] for r in records for e in r["events"]) == sorted(f"Project {i}" for i in range(20))
+    assert dispatcher.stats()["backlog"] == 0
+
+
+def test_dead_letters_without_a_loop_are_written(tmp_path):
+    dispatcher = WebhookDispatcher(lambda: [], dead_letter_path=str(tmp_path / "dead.jsonl"))
+    assert not dispatcher.submit(submission(1))  # not started: dead-lettered from submit()
+    assert dispatcher.wait_idle(timeout=5)
+    assert dispatcher.dead_letters()[0]["reason"] == "queue_full"
+
+
+def test_tail_lines_reads_only_the_end(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text("".join(f"line {i}\n" for i in range(10_000)))
+    assert tail_lines(str(path), 3, block_size=16) == ["line 9997", "line 9998", "line 9999"]
+    assert tail_lines(str(path), 0) == []
+    assert tail_lines(str(tmp_path / "missing"), 3) == []
@@ -0,0 +1,32 @@
+# tests/test_xp.py
+import datetime
+import random
+
+from fusionx import xp
+from fusionx.state import MemoryBackend, SharedStore
+from fusionx.xp import EPOCH, XPLedger
+
+
+def test_batch_and_single_replays_match_raw_sums(monkeypatch):
+    monkeypatch.setattr(xp, "REPLAY_ROWS", 7)  # several blocks
+    rng = random.Random(3)
+    store = SharedStore(MemoryBackend())
+    entries = [(f"s{rng.randrange(50)}@fusion.edu", EPOCH + datetime.timedelta(days=rng.randrange(700)), rng.choice([1, 2, 5]))
+               for _ in range(2000)]
+    for email, day, points in entries[:1500]:
+        store.add_xp_entry({"email": email, "points": points, "day": day.isoformat(), "reason": "vote"})
+    ledger = XPLedger(store, students=4, days=16)  # grows while replaying
+    ledger.total("s0@fusion.edu")  # batch replay
+    for email, day, points in entries[1500:]:
+        store.add_xp_entry({"email": email, "points": points, "day": day.isoformat(), "reason": "vote"})
+        ledger.total(email)  # one entry at a time
+
+    start, end = EPOCH + datetime.timedelta(days=100), EPOCH + datetime.timedelta(days=400)
+    expected = {}
+    for email, day, points in entries:
+        if start <= day <= end:
+            expected[email] = expected.get(email, 0) + points
+    for email in {e for e, _, _ in entries}:
+        assert ledger.total(email, start, end) == expected.get(email, 0)
+    board = ledger.leaderboard(start, end, k=5)
+    assert [xp for _, xp in board] == sorted(expected.values(), reverse=True)[:5]